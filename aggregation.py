@@ -0,0 +1,196 @@
+"""Incremental aggregation of CCDebugger analyzer results for dashboards."""
+
+import hashlib
+from array import array
+from collections import Counter
+from operator import add
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Low-cardinality result fields counted exactly
+EXACT_FIELDS = ('language', 'error_type', 'severity', 'sql_dialect', 'config_type', 'instruction')
+
+# High-cardinality fields counted in a sketch -> result fields that hold them
+SKETCH_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'file_path': ('file_path', 'dockerfile_path', 'script_path'),
+}
+
+# Sketch counters per row and number of rows; estimates exceed true counts by
+# at most 2 / width of the total with probability 1 - 2 ** -depth
+DEFAULT_WIDTH = 2048
+DEFAULT_DEPTH = 4
+
+# Most frequent keys of a sketched field remembered for top-N queries
+DEFAULT_HEAVY_HITTERS = 64
+
+_MASK = (1 << 64) - 1
+
+
+class CountMinSketch:
+    """Approximate counts of arbitrary string keys in fixed memory.
+    
+    Estimates never fall below the true count. Keys are hashed with BLAKE2b,
+    not ``hash()``, so sketches built in different processes agree and can be
+    merged. The sketch also tracks the ``heavy_hitters`` keys with the
+    highest estimates, since it cannot list keys by itself.
+    """
+    
+    def __init__(self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH,
+                 heavy_hitters: int = DEFAULT_HEAVY_HITTERS):
+        """Create an empty sketch of ``depth`` rows of ``width`` counters."""
+        if width < 1 or depth < 1:
+            raise ValueError("width and depth must be at least 1")
+        
+        self.width = width
+        self.depth = depth
+        self.heavy_hitters = heavy_hitters
+        self.total = 0
+        self._rows = [array('Q', bytes(8 * width)) for _ in range(depth)]
+        self._top: Dict[str, int] = {}
+        # Smallest estimate in _top, refreshed when a key is evicted
+        self._floor = 0
+    
+    def _indexes(self, key: str) -> List[int]:
+        """Return the counter index of a key in every row."""
+        digest = hashlib.blake2b(key.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        width = self.width
+        return [((first + row * second) & _MASK) % width for row in range(self.depth)]
+    
+    def add(self, key: str, count: int = 1) -> None:
+        """Count ``count`` more occurrences of a key."""
+        estimate = None
+        for row, index in zip(self._rows, self._indexes(key)):
+            value = row[index] + count
+            row[index] = value
+            if estimate is None or value < estimate:
+                estimate = value
+        self.total += count
+        self._offer(key, estimate)
+    
+    def estimate(self, key: str) -> int:
+        """Return an upper bound of the number of times a key was added."""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+    
+    def top(self, n: int = 10) -> List[Tuple[str, int]]:
+        """Return up to ``n`` heavy hitters with their estimated counts, most frequent first."""
+        # Estimates kept for ranking may since have grown from colliding keys
+        counts = [(key, self.estimate(key)) for key in self._top]
+        return sorted(counts, key=lambda item: (-item[1], item[0]))[:n]
+    
+    def merge(self, other: 'CountMinSketch') -> 'CountMinSketch':
+        """Add the counts of a sketch of the same shape into this one and return it."""
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge sketches of different width or depth")
+        
+        for row, other_row in zip(self._rows, other._rows):
+            row[:] = array('Q', map(add, row, other_row))
+        self.total += other.total
+        
+        candidates = set(self._top) | set(other._top)
+        self._top = {}
+        self._floor = 0
+        for key in candidates:
+            self._offer(key, self.estimate(key))
+        return self
+    
+    def _offer(self, key: str, estimate: int) -> None:
+        """Remember a key among the heavy hitters if its estimate ranks high enough."""
+        top = self._top
+        if key in top or len(top) < self.heavy_hitters:
+            top[key] = estimate
+            if len(top) == self.heavy_hitters:
+                self._floor = min(top.values())
+        elif estimate > self._floor:
+            del top[min(top, key=top.get)]
+            top[key] = estimate
+            self._floor = min(top.values())
+
+
+class ResultAggregate:
+    """Streaming counts of analyzer results by field.
+    
+    Accepts result dataclasses (``SQLError``, ``DockerError`` and the others)
+    or their dictionary form from ``ParallelRunner``. Fields in
+    ``EXACT_FIELDS`` are counted exactly; ``file_path`` and the other
+    ``SKETCH_FIELDS`` go to a ``CountMinSketch`` so memory stays fixed however
+    many distinct values there are. Aggregates built separately, e.g. by
+    worker processes, combine with ``merge`` in time proportional to their
+    keys, not to the results they saw.
+    """
+    
+    def __init__(self, width: int = DEFAULT_WIDTH, depth: int = DEFAULT_DEPTH,
+                 heavy_hitters: int = DEFAULT_HEAVY_HITTERS):
+        """Create an empty aggregate whose sketches have the given shape."""
+        self.results = 0
+        self.counts: Dict[str, Counter] = {field: Counter() for field in EXACT_FIELDS}
+        self.sketches: Dict[str, CountMinSketch] = {
+            field: CountMinSketch(width, depth, heavy_hitters) for field in SKETCH_FIELDS
+        }
+    
+    def add(self, result: Any, language: Optional[str] = None) -> None:
+        """Count one result; None (text no pattern matched) is ignored."""
+        if result is None:
+            return
+        
+        if isinstance(result, dict):
+            get = result.get
+        else:
+            def get(name, default=None):
+                return getattr(result, name, default)
+        
+        self.results += 1
+        for field, counter in self.counts.items():
+            value = language if field == 'language' else get(field)
+            if value is not None:
+                counter[value] += 1
+        for field, sources in SKETCH_FIELDS.items():
+            for source in sources:
+                value = get(source)
+                if value is not None:
+                    self.sketches[field].add(value)
+                    break
+    
+    def update(self, results: Iterable[Any], language: Optional[str] = None) -> 'ResultAggregate':
+        """Count every result of an iterable, e.g. ``analyze_stream`` output, and return self."""
+        for result in results:
+            self.add(result, language)
+        return self
+    
+    def merge(self, other: 'ResultAggregate') -> 'ResultAggregate':
+        """Add the counts of another aggregate into this one and return it."""
+        self.results += other.results
+        for field, counter in other.counts.items():
+            self.counts[field].update(counter)
+        for field, sketch in other.sketches.items():
+            self.sketches[field].merge(sketch)
+        return self
+    
+    def count(self, field: str, value: str) -> int:
+        """Return how many results had a value in a field (an upper bound for sketched fields)."""
+        if field in self.sketches:
+            return self.sketches[field].estimate(value)
+        return self._counter(field)[value]
+    
+    def top(self, field: str, n: int = 10) -> List[Tuple[str, int]]:
+        """Return the ``n`` most frequent values of a field with their counts."""
+        if field in self.sketches:
+            return self.sketches[field].top(n)
+        return sorted(self._counter(field).items(), key=lambda item: (-item[1], item[0]))[:n]
+    
+    def to_dict(self, n: int = 10) -> Dict[str, Any]:
+        """Return the result count and top-N histogram of every field as plain data."""
+        return {
+            'results': self.results,
+            'top': {
+                field: [{'value': value, 'count': count} for value, count in self.top(field, n)]
+                for field in (*EXACT_FIELDS, *SKETCH_FIELDS)
+            },
+        }
+    
+    def _counter(self, field: str) -> Counter:
+        """Return the exact counter of a field, rejecting unknown fields."""
+        try:
+            return self.counts[field]
+        except KeyError:
+            raise ValueError(f"Unknown aggregate field: {field}") from None
@@ -0,0 +1,991 @@
+"""Local asyncio HTTP server for the CCDebugger analyzers.
+
+Serves the routes of API-DOCUMENTATION.md that the analyzers can back:
+
+    POST /analyze                 analyze one error
+    POST /analyze/batch           analyze a JSON array or NDJSON stream of errors
+    GET  /stream                  WebSocket analyzing a live log as it is tailed
+    GET  /patterns/{language}     list the error patterns of a language
+    GET  /languages               list the supported languages
+    GET  /health                  report service status
+
+With ``--rate-limit`` every route but ``/health`` counts against the
+documented hourly quotas, per API key (``Authorization: Bearer <key>``) or per
+client address, and responses carry the ``X-RateLimit-*`` headers.
+
+Run from the repository root:
+
+    python -m analysis_server [--host 127.0.0.1] [--port 8000] [--workers N]
+                              [--rate-limit [--api-keys FILE]]
+"""
+
+import argparse
+import asyncio
+import codecs
+import json
+import logging
+import re
+import signal
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from log_stream import MAX_RECORD_CHARS, RecordSegmenter
+from parallel_runner import ParallelRunner
+from rate_limit import RateLimiter
+from registry import get_analyzer
+from websocket_protocol import (
+    CLOSE_INTERNAL_ERROR, CLOSE_INVALID_DATA, CLOSE_NORMAL, CLOSE_POLICY_VIOLATION,
+    OP_TEXT, WebSocket, WebSocketError, handshake_headers
+)
+
+logger = logging.getLogger(__name__)
+
+# Largest request body accepted, in bytes, and largest JSON array and NDJSON batches.
+# NDJSON is decoded as it arrives, so only one line at a time is held in memory.
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_BODY_BYTES = 16 * 1024 * 1024
+MAX_NDJSON_BODY_BYTES = 64 * 1024 * 1024
+
+# Most errors in one batch request
+MAX_BATCH_ITEMS = 10000
+
+# Errors sent to a worker per task, and tasks in flight per worker, for batches
+BATCH_CHUNKSIZE = 64
+BATCH_TASKS_PER_WORKER = 2
+
+# Size of the pieces a Content-Length body is read in
+READ_SIZE = 64 * 1024
+
+# Routes that do not count against rate limits
+RATE_LIMIT_EXEMPT = frozenset({'/health'})
+
+# Closed log records waiting for analysis per WebSocket stream; a full queue
+# stops reading from the socket, so a slow client slows its own upload
+MAX_PENDING_RECORDS = 32
+
+# Content types read as one JSON document per line
+NDJSON_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+# Longest request or header line, and most header lines, accepted
+MAX_LINE_BYTES = 8192
+
+# Chunk sizes are bare hex digits; int(..., 16) would also take signs, "_" and "0x"
+CHUNK_SIZE = re.compile(rb'[0-9A-Fa-f]+')
+MAX_HEADERS = 100
+
+# Seconds an idle keep-alive connection is kept open
+KEEP_ALIVE_TIMEOUT = 15.0
+
+# Result fields returned at the top level of an analysis; the rest go under "context"
+ANALYSIS_FIELDS = ('error_type', 'severity', 'explanation', 'suggestions')
+
+# Result fields the documented response leaves out
+OMITTED_FIELDS = ('message', 'score')
+
+
+class HTTPError(Exception):
+    """Request failure answered with the documented ``{"error": {...}}`` body."""
+    
+    def __init__(self, status: int, code: str, message: str,
+                 details: Optional[Dict[str, Any]] = None,
+                 headers: Optional[Dict[str, str]] = None):
+        """Initialize the error with its HTTP status and API error code."""
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.details = details
+        self.headers = headers or {}
+    
+    def to_payload(self) -> Dict[str, Any]:
+        """Return the JSON error body."""
+        error = {'code': self.code, 'message': str(self)}
+        if self.details:
+            error['details'] = self.details
+        return {'error': error}
+
+
+@dataclass
+class Request:
+    """One parsed HTTP/1.x request whose body is read on demand.
+    
+    Handlers read the body with ``read_body``/``json``, or piece by piece with
+    ``iter_body`` to start work before a long upload has finished. Plain
+    Content-Length and chunked bodies are both supported.
+    """
+    method: str
+    path: str
+    version: str
+    headers: Dict[str, str]
+    query: Dict[str, List[str]] = field(default_factory=dict)
+    reader: Optional[asyncio.StreamReader] = field(default=None, repr=False)
+    content_length: int = 0
+    chunked: bool = False
+    body_started: bool = False
+    body_complete: bool = False
+    
+    @property
+    def keep_alive(self) -> bool:
+        """Return whether the client wants the connection kept open."""
+        connection = self.headers.get('connection', '').lower()
+        if self.version == 'HTTP/1.0':
+            return connection == 'keep-alive'
+        return connection != 'close'
+    
+    @property
+    def content_type(self) -> str:
+        """Return the media type of the body, without parameters."""
+        return self.headers.get('content-type', '').split(';')[0].strip().lower()
+    
+    async def iter_body(self, limit: int = MAX_BODY_BYTES) -> AsyncIterator[bytes]:
+        """Yield the body in pieces as it arrives, rejecting more than ``limit`` bytes."""
+        if self.body_started:
+            raise RuntimeError("The request body was already read")
+        self.body_started = True
+        
+        if not self.chunked:
+            if self.content_length > limit:
+                raise HTTPError(413, 'INVALID_REQUEST', f"Request body exceeds {limit} bytes")
+            remaining = self.content_length
+            while remaining:
+                data = await self.reader.read(min(remaining, READ_SIZE))
+                if not data:
+                    raise asyncio.IncompleteReadError(b'', remaining)
+                remaining -= len(data)
+                if not remaining:
+                    self.body_complete = True
+                yield data
+            self.body_complete = True
+            return
+        
+        total = 0
+        while True:
+            size_line = await _read_line(self.reader)
+            size_field = size_line.split(b';')[0].strip()
+            if not CHUNK_SIZE.fullmatch(size_field):
+                raise HTTPError(400, 'INVALID_REQUEST', "Malformed chunk size")
+            size = int(size_field, 16)
+            if size == 0:
+                # Skip any trailer fields up to the blank line
+                while await _read_line(self.reader) != b'\r\n':
+                    pass
+                self.body_complete = True
+                return
+            
+            total += size
+            if total > limit:
+                raise HTTPError(413, 'INVALID_REQUEST', f"Request body exceeds {limit} bytes")
+            data = await self.reader.readexactly(size)
+            if await self.reader.readexactly(2) != b'\r\n':
+                raise HTTPError(400, 'INVALID_REQUEST', "Malformed chunk")
+            yield data
+    
+    async def read_body(self, limit: int = MAX_BODY_BYTES) -> bytes:
+        """Read the whole body."""
+        return b''.join([data async for data in self.iter_body(limit)])
+    
+    async def json(self, limit: int = MAX_BODY_BYTES) -> Any:
+        """Read the body and decode it as JSON."""
+        body = await self.read_body(limit)
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise HTTPError(400, 'INVALID_REQUEST', f"Request body is not valid JSON: {e}")
+    
+    async def discard_body(self) -> None:
+        """Read and drop a body no handler read, so the connection can be reused."""
+        if not self.body_started:
+            async for _ in self.iter_body(MAX_BODY_BYTES):
+                pass
+
+
+async def _read_line(reader: asyncio.StreamReader) -> bytes:
+    """Read one CRLF-terminated line, rejecting overlong lines."""
+    try:
+        return await reader.readuntil(b'\r\n')
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, 'INVALID_REQUEST', "Request line or header too long")
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Read one request, or return None when the client closed the connection."""
+    try:
+        line = await _read_line(reader)
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HTTPError(400, 'INVALID_REQUEST', "Incomplete request line")
+    
+    parts = line.decode('latin-1').split()
+    if len(parts) != 3 or not parts[2].startswith('HTTP/1.'):
+        raise HTTPError(400, 'INVALID_REQUEST', "Malformed request line")
+    method, target, version = parts
+    
+    headers = {}
+    while True:
+        line = await _read_line(reader)
+        if line == b'\r\n':
+            break
+        if len(headers) >= MAX_HEADERS:
+            raise HTTPError(431, 'INVALID_REQUEST', "Too many headers")
+        name, sep, value = line.decode('latin-1').partition(':')
+        if not sep:
+            raise HTTPError(400, 'INVALID_REQUEST', "Malformed header line")
+        headers[name.strip().lower()] = value.strip()
+    
+    chunked = False
+    length = 0
+    transfer_encoding = headers.get('transfer-encoding', '').lower()
+    if transfer_encoding:
+        if transfer_encoding != 'chunked':
+            raise HTTPError(501, 'INVALID_REQUEST', f"Unsupported Transfer-Encoding: {transfer_encoding}")
+        chunked = True
+    else:
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise HTTPError(400, 'INVALID_REQUEST', "Invalid Content-Length")
+        if length < 0:
+            raise HTTPError(400, 'INVALID_REQUEST', "Invalid Content-Length")
+    
+    url = urlsplit(target)
+    return Request(
+        method=method.upper(),
+        path=unquote(url.path),
+        version=version,
+        headers=headers,
+        query=parse_qs(url.query),
+        reader=reader,
+        content_length=length,
+        chunked=chunked,
+        body_complete=not chunked and not length
+    )
+
+
+def _encode_head(status: int, headers: Dict[str, str]) -> bytes:
+    """Encode a status line and headers."""
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+def encode_response(status: int, payload: Any, headers: Optional[Dict[str, str]] = None,
+                    keep_alive: bool = True) -> bytes:
+    """Encode a JSON response with its status line and headers."""
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    return _encode_head(status, {
+        'Content-Type': 'application/json; charset=utf-8',
+        'Content-Length': str(len(body)),
+        'Connection': 'keep-alive' if keep_alive else 'close',
+        **(headers or {}),
+    }) + body
+
+
+def encode_chunk(data: bytes) -> bytes:
+    """Encode one piece of a chunked response body; empty data ends the body."""
+    return b'%x\r\n%s\r\n' % (len(data), data)
+
+
+class NDJSONStream:
+    """Response body streamed as newline-delimited JSON, one chunk per object."""
+    
+    def __init__(self, objects: AsyncIterator[Any]):
+        """Wrap the objects to send, produced while the response is written."""
+        self.objects = objects
+
+
+class Upgrade:
+    """Response that switches the connection to another protocol after a 101."""
+    
+    def __init__(self, headers: Dict[str, str],
+                 run: Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]):
+        """Keep the 101 headers and the coroutine function that takes the streams over."""
+        self.headers = headers
+        self.run = run
+
+
+def error_text(payload: Any) -> str:
+    """Return the text to analyze from an error payload, validating it.
+    
+    The documented payload carries ``message`` and an optional ``stack_trace``;
+    the trace is appended unless it already repeats the message.
+    """
+    if not isinstance(payload, dict):
+        raise HTTPError(400, 'INVALID_REQUEST', "Request body must be a JSON object")
+    
+    message = payload.get('message')
+    if not isinstance(message, str) or not message.strip():
+        raise HTTPError(400, 'INVALID_REQUEST', "Missing required field: message",
+                        {'field': 'message', 'requirement': 'non-empty string'})
+    
+    stack_trace = payload.get('stack_trace')
+    if isinstance(stack_trace, str) and stack_trace.strip():
+        return stack_trace if message in stack_trace else f"{message}\n{stack_trace}"
+    return message
+
+
+def analysis_response(language: Optional[str], result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Shape an analyzer result dict like the documented analysis response."""
+    if result is None:
+        raise HTTPError(500, 'ANALYSIS_FAILED', "The analyzer returned no result")
+    
+    suggestions = [
+        {
+            'id': f"sugg_{index:03d}",
+            'title': suggestion['title'],
+            'code_example': suggestion.get('code'),
+            'confidence': suggestion.get('confidence'),
+        }
+        for index, suggestion in enumerate(result.get('suggestions') or (), 1)
+    ]
+    context = {
+        name: value for name, value in result.items()
+        if name not in ANALYSIS_FIELDS and name not in OMITTED_FIELDS and value is not None
+    }
+    return {
+        'analysis_id': str(uuid.uuid4()),
+        'language': language,
+        'error_type': result['error_type'],
+        'severity': result['severity'],
+        'explanation': result['explanation'],
+        'suggestions': suggestions,
+        'context': context,
+    }
+
+
+def pattern_listing(language: str, analyzer) -> Dict[str, Any]:
+    """List the patterns of an analyzer like the documented patterns response."""
+    patterns = [
+        {
+            'name': error_type,
+            'regex': config['pattern'],
+            'severity': config.get('severity'),
+            'description': config.get('explanation'),
+            'suggested_fixes': [suggestion.title for suggestion in config.get('suggestions') or ()],
+        }
+        for error_type, config in analyzer.pattern_table().patterns.items()
+    ]
+    return {'language': language, 'patterns': patterns, 'total': len(patterns)}
+
+
+async def iter_ndjson(request: Request, limit: int) -> AsyncIterator[Tuple[Optional[Any], Optional[HTTPError]]]:
+    """Yield (object, None) or (None, error) for each non-blank NDJSON line of a body.
+    
+    A malformed line gives an error for that line only; lines are limited to
+    ``MAX_BODY_BYTES`` like a single request body.
+    """
+    def decode(line: bytes) -> Tuple[Optional[Any], Optional[HTTPError]]:
+        try:
+            return json.loads(line), None
+        except ValueError as e:
+            return None, HTTPError(400, 'INVALID_REQUEST', f"Line is not valid JSON: {e}")
+    
+    buffer = b''
+    async for data in request.iter_body(limit):
+        buffer += data
+        *lines, buffer = buffer.split(b'\n')
+        if len(buffer) > MAX_BODY_BYTES:
+            raise HTTPError(413, 'INVALID_REQUEST', f"NDJSON line exceeds {MAX_BODY_BYTES} bytes")
+        for line in lines:
+            if line.strip():
+                yield decode(line)
+    if buffer.strip():
+        yield decode(buffer)
+
+
+async def _array_items(payloads: List[Any]) -> AsyncIterator[Tuple[Any, None]]:
+    """Yield the payloads of a JSON array batch like decoded NDJSON lines."""
+    for payload in payloads:
+        yield payload, None
+
+
+Handler = Callable[[Request], Awaitable[Tuple[int, Any]]]
+
+
+class LogStreamSession:
+    """Segment and analyze the live log of one WebSocket connection.
+    
+    Messages carry log text split anywhere, even inside lines or UTF-8
+    sequences for binary messages. A ``RecordSegmenter`` cuts the text into
+    error records, and each record is analyzed and pushed as soon as the line
+    after it closes it. A JSON text message ``{"action": "subscribe",
+    "language": ..., "filters": {"severity": [...]}}`` picks the language and
+    filters; ``?language=`` on the URL does the same.
+    
+    Memory per connection is bounded by one message, one partial line and
+    ``MAX_PENDING_RECORDS`` records of at most ``MAX_RECORD_CHARS``. When the
+    client reads results slowly, sends block, the record queue fills and the
+    session stops reading the socket until it drains.
+    """
+    
+    def __init__(self, server: 'AnalysisServer', websocket: WebSocket, language: Optional[str]):
+        """Initialize the session, subscribed to a language when one is given."""
+        self.server = server
+        self.websocket = websocket
+        self.language: Optional[str] = None
+        self.severities: Optional[set] = None
+        self.segmenter: Optional[RecordSegmenter] = None
+        self.records: asyncio.Queue = asyncio.Queue(MAX_PENDING_RECORDS)
+        self._partial = ''
+        self._decoder = codecs.getincrementaldecoder('utf-8')('replace')
+        if language is not None:
+            self._subscribe(language)
+    
+    async def run(self) -> None:
+        """Read the stream until the client closes it, then flush and close."""
+        sender = asyncio.create_task(self._send_results())
+        code, reason = CLOSE_NORMAL, ''
+        try:
+            if self.language is not None:
+                await self._send({'type': 'subscribed', 'language': self.language})
+            
+            while True:
+                message = await self.websocket.receive()
+                if message is None:
+                    break
+                opcode, data = message
+                if opcode == OP_TEXT:
+                    try:
+                        text = data.decode('utf-8')
+                    except UnicodeDecodeError:
+                        raise WebSocketError(CLOSE_INVALID_DATA, "Text message is not valid UTF-8")
+                    if await self._control(text):
+                        continue
+                else:
+                    text = self._decoder.decode(data)
+                await self._feed(text)
+            
+            await self._flush()
+        except WebSocketError as e:
+            code, reason = e.code, str(e)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            sender.cancel()
+            raise
+        
+        await self.records.put(None)
+        try:
+            await sender
+        except Exception:
+            logger.exception("Stream result sender failed")
+            code, reason = CLOSE_INTERNAL_ERROR, "Internal server error"
+        await self.websocket.close(code, reason)
+    
+    def _subscribe(self, language: Any) -> None:
+        """Start segmenting for a language, validated like ``POST /analyze``."""
+        self.language = self.server._language(language)
+        if self.language is None:
+            raise HTTPError(400, 'INVALID_REQUEST', "Missing required field: language")
+        self.segmenter = RecordSegmenter(self.language)
+    
+    async def _control(self, text: str) -> bool:
+        """Handle a subscribe message; return False for ordinary log text."""
+        if not text.startswith('{') or '"subscribe"' not in text:
+            return False
+        try:
+            message = json.loads(text)
+        except ValueError:
+            return False
+        if not isinstance(message, dict) or message.get('action') != 'subscribe':
+            return False
+        
+        try:
+            await self._flush()
+            self._subscribe(message.get('language'))
+            severities = (message.get('filters') or {}).get('severity')
+            self.severities = set(severities) if severities else None
+        except HTTPError as error:
+            await self._send({'type': 'error', **error.to_payload()})
+            return True
+        await self._send({'type': 'subscribed', 'language': self.language})
+        return True
+    
+    async def _feed(self, text: str) -> None:
+        """Feed whole lines to the segmenter, holding back a bounded partial line."""
+        if self.segmenter is None:
+            raise WebSocketError(CLOSE_POLICY_VIOLATION, "Subscribe with a language before sending logs")
+        
+        text = self._partial + text
+        start = 0
+        while True:
+            end = text.find('\n', start)
+            if end < 0:
+                break
+            await self._queue(self.segmenter.feed(text[start:end + 1]))
+            start = end + 1
+        
+        self._partial = text[start:]
+        if len(self._partial) >= MAX_RECORD_CHARS:
+            # Past the record cap the rest of the line cannot be kept anyway
+            await self._queue(self.segmenter.feed(self._partial))
+            self._partial = ''
+    
+    async def _flush(self) -> None:
+        """Close the open record, including any unterminated last line."""
+        if self.segmenter is None:
+            return
+        if self._partial:
+            await self._queue(self.segmenter.feed(self._partial + '\n'))
+            self._partial = ''
+        await self._queue(self.segmenter.close())
+    
+    async def _queue(self, record: Optional[str]) -> None:
+        """Queue a closed record for analysis, waiting while the queue is full."""
+        if record is not None:
+            await self.records.put((self.language, self.severities, record))
+    
+    async def _send_results(self) -> None:
+        """Push results until the end of the stream, draining the queue on failure."""
+        try:
+            await self._analyze_records()
+        except Exception:
+            # Keep emptying the queue so the reader never blocks on a dead sender
+            while await self.records.get() is not None:
+                pass
+            raise
+    
+    async def _analyze_records(self) -> None:
+        """Analyze queued records in order and push each result."""
+        number = 0
+        while True:
+            item = await self.records.get()
+            if item is None:
+                return
+            language, severities, record = item
+            number += 1
+            
+            try:
+                language, result = await asyncio.wrap_future(self.server.runner.submit(language, record))
+                response = analysis_response(language, result)
+            except HTTPError as error:
+                await self._send({'type': 'error', 'record': number, **error.to_payload()})
+                continue
+            except Exception as e:
+                error = HTTPError(500, 'ANALYSIS_FAILED', f"Analysis failed: {e}")
+                await self._send({'type': 'error', 'record': number, **error.to_payload()})
+                continue
+            
+            if severities is None or response['severity'] in severities:
+                await self._send({'type': 'analysis', 'record': number, 'text': record, **response})
+    
+    async def _send(self, message: Dict[str, Any]) -> None:
+        """Send one JSON message."""
+        await self.websocket.send_text(json.dumps(message, ensure_ascii=False))
+
+
+class AnalysisServer:
+    """Asyncio HTTP server that answers analysis requests from a worker pool.
+    
+    Pattern matching runs in the processes of a ``ParallelRunner``, whose
+    workers build their analyzers once and keep them, so the event loop only
+    parses requests and encodes responses. Pattern and language listings come
+    from analyzers built once in the server process.
+    """
+    
+    def __init__(self, host: str = '127.0.0.1', port: int = 8000,
+                 languages: Optional[Iterable[str]] = None, workers: Optional[int] = None,
+                 runner: Optional[ParallelRunner] = None, rate_limiter: Optional[RateLimiter] = None):
+        """Initialize the server; the worker pool is shared when a runner is given."""
+        self.host = host
+        self.port = port
+        self.rate_limiter = rate_limiter
+        self._owns_runner = runner is None
+        self.runner = runner if runner is not None else ParallelRunner(languages, workers)
+        self.languages = self.runner.languages
+        self.analyzers = {language: get_analyzer(language) for language in self.languages}
+        self.started = time.time()
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+        
+        self._patterns = {
+            language: pattern_listing(language, analyzer)
+            for language, analyzer in self.analyzers.items()
+        }
+        
+        # Path -> method -> handler; '/patterns/' matches every language below it
+        self.routes: Dict[str, Dict[str, Handler]] = {
+            '/analyze': {'POST': self.handle_analyze},
+            '/analyze/batch': {'POST': self.handle_batch},
+            '/stream': {'GET': self.handle_stream},
+            '/patterns/': {'GET': self.handle_patterns},
+            '/languages': {'GET': self.handle_languages},
+            '/health': {'GET': self.handle_health},
+        }
+    
+    async def start(self) -> None:
+        """Warm up the worker pool and start listening."""
+        # One concurrent task per worker makes the pool start every process now
+        await asyncio.gather(*(
+            asyncio.wrap_future(self.runner.submit(None, 'warm up'))
+            for _ in range(self.runner.workers)
+        ))
+        self._server = await asyncio.start_server(
+            self._serve_connection, self.host, self.port, limit=MAX_LINE_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+    
+    async def serve_forever(self) -> None:
+        """Start the server if needed and serve until cancelled."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+    
+    async def close(self) -> None:
+        """Stop listening and shut down the worker pool if the server owns it."""
+        if self._server is not None:
+            self._server.close()
+            # Closing the open connections lets their handlers finish on their own
+            for writer in self._connections.values():
+                writer.close()
+            if self._connections:
+                await asyncio.wait(list(self._connections))
+            await self._server.wait_closed()
+            self._server = None
+        if self._owns_runner:
+            self.runner.close()
+    
+    async def handle_analyze(self, request: Request) -> Tuple[int, Any]:
+        """Analyze one error payload."""
+        payload = await request.json()
+        text = error_text(payload)
+        language = self._language(payload.get('language'))
+        
+        try:
+            language, result = await asyncio.wrap_future(self.runner.submit(language, text))
+        except Exception as e:
+            raise HTTPError(500, 'ANALYSIS_FAILED', f"Analysis failed: {e}")
+        return 200, analysis_response(language, result)
+    
+    async def handle_batch(self, request: Request) -> Tuple[int, Any]:
+        """Analyze a JSON array or NDJSON stream of error payloads.
+        
+        Results stream back as NDJSON in the order they complete, each line
+        carrying the ``index`` of its payload. A JSON array is checked before
+        the response starts; an invalid NDJSON line or payload only gets an
+        error line of its own.
+        """
+        if request.content_type in NDJSON_TYPES:
+            items = self._ndjson_items(request)
+        else:
+            payloads = await request.json(MAX_BATCH_BODY_BYTES)
+            if not isinstance(payloads, list):
+                raise HTTPError(400, 'INVALID_REQUEST', "Batch body must be a JSON array")
+            if len(payloads) > MAX_BATCH_ITEMS:
+                raise HTTPError(413, 'INVALID_REQUEST', f"Batch exceeds {MAX_BATCH_ITEMS} errors")
+            items = _array_items(payloads)
+        return 200, NDJSONStream(self._batch_results(items))
+    
+    async def _ndjson_items(self, request: Request) -> AsyncIterator[Tuple[Optional[Any], Optional[HTTPError]]]:
+        """Yield the decoded lines of an NDJSON batch, up to the batch limit."""
+        count = 0
+        async for item in iter_ndjson(request, MAX_NDJSON_BODY_BYTES):
+            count += 1
+            if count > MAX_BATCH_ITEMS:
+                yield None, HTTPError(413, 'INVALID_REQUEST', f"Batch exceeds {MAX_BATCH_ITEMS} errors")
+                return
+            yield item
+    
+    async def _batch_results(self, items) -> AsyncIterator[Dict[str, Any]]:
+        """Analyze batch items in worker chunks and yield result lines as chunks finish."""
+        # Bounded in-flight chunks keep memory flat and pace reading of the upload
+        max_pending = self.runner.workers * BATCH_TASKS_PER_WORKER
+        pending: Dict[asyncio.Future, List[int]] = {}
+        chunk: List[Tuple[int, Optional[str], str]] = []
+        
+        def submit() -> None:
+            future = asyncio.wrap_future(
+                self.runner.submit_many([(language, text) for _, language, text in chunk])
+            )
+            pending[future] = [index for index, _, _ in chunk]
+            chunk.clear()
+        
+        def finished(future: asyncio.Future) -> List[Dict[str, Any]]:
+            indexes = pending.pop(future)
+            try:
+                pairs = future.result()
+            except Exception as e:
+                error = HTTPError(500, 'ANALYSIS_FAILED', f"Analysis failed: {e}")
+                return [{'index': index, **error.to_payload()} for index in indexes]
+            
+            lines = []
+            for index, (language, result) in zip(indexes, pairs):
+                try:
+                    lines.append({'index': index, **analysis_response(language, result)})
+                except HTTPError as error:
+                    lines.append({'index': index, **error.to_payload()})
+            return lines
+        
+        index = -1
+        async for payload, error in items:
+            index += 1
+            try:
+                if error is not None:
+                    raise error
+                text = error_text(payload)
+                language = self._language(payload.get('language'))
+            except HTTPError as error:
+                yield {'index': index, **error.to_payload()}
+                continue
+            
+            chunk.append((index, language, text))
+            if len(chunk) >= BATCH_CHUNKSIZE:
+                submit()
+            
+            # Stream whatever is done, and wait while too many chunks are in flight
+            for future in [future for future in pending if future.done()]:
+                for line in finished(future):
+                    yield line
+            while len(pending) >= max_pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    for line in finished(future):
+                        yield line
+        
+        if chunk:
+            submit()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                for line in finished(future):
+                    yield line
+    
+    async def handle_stream(self, request: Request) -> Tuple[int, Any]:
+        """Upgrade to a WebSocket that analyzes a live log (see ``LogStreamSession``)."""
+        try:
+            headers = handshake_headers(request.headers)
+        except ValueError as e:
+            raise HTTPError(400, 'INVALID_REQUEST', str(e))
+        language = self._language(request.query.get('language', [None])[0])
+        
+        async def run(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            await LogStreamSession(self, WebSocket(reader, writer), language).run()
+        return 101, Upgrade(headers, run)
+    
+    async def handle_patterns(self, request: Request) -> Tuple[int, Any]:
+        """List the patterns of the language named in the path."""
+        language = request.path[len('/patterns/'):].strip('/')
+        return 200, self._patterns[self._language(language)]
+    
+    async def handle_languages(self, request: Request) -> Tuple[int, Any]:
+        """List the languages the server has analyzers for."""
+        languages = [
+            {
+                'code': language,
+                'name': analyzer.DISPLAY_NAMES['en'].rsplit(' Error', 1)[0],
+                'error_pattern_count': self._patterns[language]['total'],
+            }
+            for language, analyzer in self.analyzers.items()
+        ]
+        return 200, {'languages': languages, 'total': len(languages)}
+    
+    async def handle_health(self, request: Request) -> Tuple[int, Any]:
+        """Report that the server is up."""
+        return 200, {
+            'status': 'healthy',
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'workers': self.runner.workers,
+            'services': {'api': 'operational', 'analyzers': 'operational'},
+        }
+    
+    def _language(self, language: Any) -> Optional[str]:
+        """Validate an optional language name against the served languages."""
+        if language is None:
+            return None
+        if not isinstance(language, str) or language.lower() not in self.analyzers:
+            raise HTTPError(400, 'LANGUAGE_NOT_SUPPORTED', f"Unsupported language: {language}",
+                            {'supported': list(self.languages)})
+        return language.lower()
+    
+    def _find_handler(self, request: Request) -> Handler:
+        """Return the handler for a request's path and method."""
+        methods = self.routes.get(request.path)
+        if methods is None and request.path.startswith('/patterns/'):
+            methods = self.routes['/patterns/']
+        if methods is None:
+            raise HTTPError(404, 'NOT_FOUND', f"No route for {request.path}")
+        
+        handler = methods.get(request.method)
+        if handler is None:
+            raise HTTPError(405, 'METHOD_NOT_ALLOWED', f"{request.method} is not allowed here",
+                            headers={'Allow': ', '.join(methods)})
+        return handler
+    
+    def _check_rate_limit(self, request: Request, client: str) -> Dict[str, str]:
+        """Count a request against its quota and return the rate-limit headers."""
+        if self.rate_limiter is None or request.path in RATE_LIMIT_EXEMPT:
+            return {}
+        
+        api_key = None
+        authorization = request.headers.get('authorization')
+        if authorization is not None:
+            scheme, _, api_key = authorization.partition(' ')
+            api_key = api_key.strip()
+            if scheme.lower() != 'bearer' or not api_key or not self.rate_limiter.known_key(api_key):
+                raise HTTPError(401, 'UNAUTHORIZED', "Invalid or missing API key",
+                                headers={'WWW-Authenticate': 'Bearer'})
+        
+        decision = self.rate_limiter.check(client, api_key)
+        if not decision.allowed:
+            raise HTTPError(429, 'RATE_LIMIT_EXCEEDED',
+                            f"Rate limit of {decision.limit} requests exceeded",
+                            {'retry_after': decision.retry_after}, decision.headers())
+        return decision.headers()
+    
+    async def _respond(self, request: Request, client: str) -> Tuple[int, Any, Dict[str, str]]:
+        """Run the handler of a request and turn failures into error responses."""
+        headers: Dict[str, str] = {}
+        try:
+            handler = self._find_handler(request)
+            headers = self._check_rate_limit(request, client)
+            status, payload = await handler(request)
+            return status, payload, headers
+        except HTTPError as error:
+            return error.status, error.to_payload(), {**headers, **error.headers}
+        except (asyncio.IncompleteReadError, ConnectionError):
+            raise
+        except Exception:
+            logger.exception("Unhandled error for %s %s", request.method, request.path)
+            error = HTTPError(500, 'INTERNAL_ERROR', "Internal server error")
+            return error.status, error.to_payload(), headers
+    
+    async def _finish_body(self, request: Request) -> bool:
+        """Drain a body the handler left unread; return whether the connection is reusable."""
+        if request.body_complete:
+            return True
+        if request.body_started or request.content_length > MAX_BODY_BYTES:
+            return False
+        try:
+            await request.discard_body()
+        except HTTPError:
+            return False
+        return True
+    
+    async def _write_stream(self, writer: asyncio.StreamWriter, request: Request, status: int,
+                            stream: NDJSONStream, headers: Dict[str, str]) -> bool:
+        """Write a chunked NDJSON response as its objects are produced.
+        
+        Writes are only awaited for drain once the request body has been read
+        in full: a client that uploads a whole batch before reading responses
+        would otherwise stall both sides when the socket buffers fill. Returns
+        whether the connection is reusable.
+        """
+        writer.write(_encode_head(status, {
+            'Content-Type': 'application/x-ndjson; charset=utf-8',
+            'Transfer-Encoding': 'chunked',
+            'Connection': 'keep-alive' if request.keep_alive else 'close',
+            **headers,
+        }))
+        
+        try:
+            async for obj in stream.objects:
+                writer.write(encode_chunk(json.dumps(obj, ensure_ascii=False).encode('utf-8') + b'\n'))
+                if request.body_complete:
+                    await writer.drain()
+        except HTTPError as error:
+            writer.write(encode_chunk(json.dumps(error.to_payload()).encode('utf-8') + b'\n'))
+        except (asyncio.IncompleteReadError, ConnectionError):
+            raise
+        except Exception:
+            logger.exception("Unhandled error streaming %s %s", request.method, request.path)
+            error = HTTPError(500, 'INTERNAL_ERROR', "Internal server error")
+            writer.write(encode_chunk(json.dumps(error.to_payload()).encode('utf-8') + b'\n'))
+        
+        writer.write(encode_chunk(b''))
+        await writer.drain()
+        return request.keep_alive and request.body_complete
+    
+    async def _serve_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Answer the requests of one keep-alive connection in order."""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        peer = writer.get_extra_info('peername')
+        client = peer[0] if isinstance(peer, tuple) else str(peer)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except HTTPError as error:
+                    writer.write(encode_response(error.status, error.to_payload(),
+                                                 error.headers, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                
+                status, payload, headers = await self._respond(request, client)
+                if isinstance(payload, Upgrade):
+                    writer.write(_encode_head(status, {**payload.headers, **headers}))
+                    await writer.drain()
+                    await payload.run(reader, writer)
+                    break
+                if isinstance(payload, NDJSONStream):
+                    keep_alive = await self._write_stream(writer, request, status, payload, headers)
+                else:
+                    keep_alive = request.keep_alive and await self._finish_body(request)
+                    writer.write(encode_response(status, payload, headers, keep_alive))
+                    await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            del self._connections[task]
+
+
+async def serve(host: str, port: int, workers: Optional[int],
+                rate_limiter: Optional[RateLimiter] = None) -> None:
+    """Run a server until cancelled, printing its address once it listens."""
+    server = AnalysisServer(host, port, workers=workers, rate_limiter=rate_limiter)
+    
+    # Stop cleanly on SIGTERM too, so the worker processes are shut down
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, task.cancel)
+    
+    try:
+        await server.start()
+        print(f"Serving on http://{server.host}:{server.port}", flush=True)
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on')
+    parser.add_argument('--port', type=int, default=8000, help='port to listen on (0 picks a free one)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='analysis worker processes (default: CPU count)')
+    parser.add_argument('--rate-limit', action='store_true',
+                        help='enforce the documented hourly quotas')
+    parser.add_argument('--api-keys', metavar='FILE',
+                        help='accept only the API keys listed in FILE, one per line; '
+                             'without it, keys get the anonymous quota')
+    args = parser.parse_args()
+    
+    rate_limiter = None
+    if args.rate_limit:
+        api_keys = None
+        if args.api_keys:
+            with open(args.api_keys, encoding='utf-8') as f:
+                api_keys = frozenset(line.strip() for line in f if line.strip())
+        rate_limiter = RateLimiter(api_keys=api_keys)
+    
+    asyncio.run(serve(args.host, args.port, args.workers, rate_limiter))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+"""Benchmarks for the CCDebugger language analyzers."""
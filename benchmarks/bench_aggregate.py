@@ -0,0 +1,89 @@
+"""Measure streaming aggregation of analyzer results and merging of partials.
+
+Results of every analyzer's corpus are cycled into a stream of dictionaries,
+the form ``ParallelRunner`` returns, with ``file_path`` drawn from a skewed
+set of ``--paths`` values. The stream is counted by one
+``ResultAggregate``, then split into ``--partials`` aggregates that are
+pickled, as workers send them, and merged. The file path histogram is
+compared with an exact ``Counter`` for size and top-N accuracy.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_aggregate [--results N] [--paths P] [--partials K]
+"""
+
+import argparse
+import pickle
+import random
+import time
+from collections import Counter
+
+from aggregation import ResultAggregate
+from benchmarks.corpus import ANALYZERS, build_batch, load_analyzer
+from pattern_engine import result_to_dict
+
+
+def build_stream(size: int, paths: int, seed: int = 0) -> list:
+    """Return ``size`` (language, result dict) pairs with skewed file paths."""
+    rng = random.Random(seed)
+    templates = []
+    for language in ANALYZERS:
+        analyzer = load_analyzer(language)
+        for result in analyzer.analyze_many(build_batch(language, 200)):
+            if result is not None:
+                templates.append((language, result_to_dict(result)))
+    
+    stream = []
+    for _ in range(size):
+        language, data = rng.choice(templates)
+        # Half the results come from a few hot files, the rest from the long tail
+        module = int(rng.paretovariate(1.1)) if rng.random() < 0.5 else rng.randrange(paths)
+        data = dict(data, file_path=f"src/module{module % paths}/Main.kt")
+        stream.append((language, data))
+    return stream
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--results', type=int, default=500_000, help='results in the stream')
+    parser.add_argument('--paths', type=int, default=100_000, help='distinct file paths')
+    parser.add_argument('--partials', type=int, default=64, help='partial aggregates merged')
+    parser.add_argument('--top', type=int, default=10, help='top-N compared with exact counts')
+    args = parser.parse_args()
+    
+    stream = build_stream(args.results, args.paths)
+    
+    start = time.perf_counter()
+    whole = ResultAggregate()
+    for language, data in stream:
+        whole.add(data, language)
+    elapsed = time.perf_counter() - start
+    print(f"add:   {args.results / elapsed:,.0f} results/s")
+    
+    size = -(-len(stream) // args.partials)
+    partials = [
+        pickle.dumps(ResultAggregate().update(data for _, data in stream[first:first + size]))
+        for first in range(0, len(stream), size)
+    ]
+    start = time.perf_counter()
+    merged = ResultAggregate()
+    for partial in partials:
+        merged.merge(pickle.loads(partial))
+    elapsed = time.perf_counter() - start
+    print(f"merge: {len(partials)} partials of {len(partials[0]) / 1024:.0f} KB "
+          f"in {elapsed * 1e3:.1f} ms ({elapsed / len(partials) * 1e3:.2f} ms each)")
+    
+    exact = Counter(data['file_path'] for _, data in stream)
+    print(f"file_path: {len(exact):,} distinct, exact Counter {len(pickle.dumps(exact)) / 1024:,.0f} KB, "
+          f"aggregate {len(pickle.dumps(whole)) / 1024:,.0f} KB")
+    
+    expected = exact.most_common(args.top)
+    found = merged.top('file_path', args.top)
+    worst = max(estimate - exact[path] for path, estimate in found)
+    overlap = len({path for path, _ in expected} & {path for path, _ in found})
+    print(f"top {args.top}: {overlap}/{args.top} paths match exact, "
+          f"worst overestimate {worst} of {args.results:,} results")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Compare analyze_many() throughput with a per-call analyze() loop.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_analyze_many [--size N] [--repeat R]
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import ANALYZERS, build_batch, load_analyzer
+
+
+def best_time(func, repeat: int) -> float:
+    """Return the fastest wall-clock time of several runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=20000, help='texts per batch')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement')
+    args = parser.parse_args()
+    
+    print(f"{'language':<10} {'batch':<9} {'per-call/s':>12} {'batch/s':>12} {'speedup':>8}")
+    for language in ANALYZERS:
+        analyzer = load_analyzer(language)
+        for label, unique in (('repeated', False), ('unique', True)):
+            texts = build_batch(language, args.size, unique=unique)
+            
+            loop = best_time(lambda: [analyzer.analyze(t) for t in texts], args.repeat)
+            batch = best_time(lambda: analyzer.analyze_many(texts), args.repeat)
+            
+            print(f"{language:<10} {label:<9} {len(texts) / loop:>12,.0f} "
+                  f"{len(texts) / batch:>12,.0f} {loop / batch:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
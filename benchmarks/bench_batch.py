@@ -0,0 +1,101 @@
+"""Compare POST /analyze/batch with the same errors sent as single POST /analyze calls.
+
+Starts ``analysis_server`` on a free localhost port (or targets ``--url``) and
+analyzes ``--size`` errors four ways: single calls over one connection,
+single calls over ``--concurrency`` connections, one JSON array batch and one
+NDJSON batch. Every way must return a result for every error.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_batch [--size N] [--concurrency C] [--workers W]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import List
+from urllib.parse import urlsplit
+
+from benchmarks.bench_server import Connection, build_payloads, local_server
+
+
+async def single_calls(url: str, payloads: List[bytes], concurrency: int) -> int:
+    """Send every payload as its own request; return the number of 200 responses."""
+    address = urlsplit(url)
+    connections = [await Connection.open(address.hostname, address.port)
+                   for _ in range(concurrency)]
+    queue = iter(payloads)
+    ok = 0
+    
+    async def client(connection: Connection) -> None:
+        nonlocal ok
+        for body in queue:
+            status, _ = await connection.request('POST', '/analyze', body)
+            ok += status == 200
+    
+    await asyncio.gather(*(client(connection) for connection in connections))
+    for connection in connections:
+        await connection.close()
+    return ok
+
+
+async def batch_call(url: str, payloads: List[bytes], ndjson: bool) -> int:
+    """Send every payload in one batch request; return the number of result lines."""
+    address = urlsplit(url)
+    connection = await Connection.open(address.hostname, address.port)
+    if ndjson:
+        body = b'\n'.join(payloads)
+        content_type = 'application/x-ndjson'
+    else:
+        body = b'[' + b','.join(payloads) + b']'
+        content_type = 'application/json'
+    
+    status, response = await connection.request('POST', '/analyze/batch', body, content_type)
+    await connection.close()
+    if status != 200:
+        raise RuntimeError(f"Batch request failed with {status}: {response[:200]!r}")
+    return sum('analysis_id' in json.loads(line) for line in response.splitlines())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='target a running server instead of starting one')
+    parser.add_argument('--size', type=int, default=5000, help='errors to analyze')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='connections for the concurrent single calls')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes of the started server (default: CPU count)')
+    args = parser.parse_args()
+    
+    payloads = build_payloads(args.size, with_language=True)
+    runs = [
+        ('single x1', lambda url: single_calls(url, payloads, 1)),
+        (f'single x{args.concurrency}', lambda url: single_calls(url, payloads, args.concurrency)),
+        ('batch json', lambda url: batch_call(url, payloads, ndjson=False)),
+        ('batch ndjson', lambda url: batch_call(url, payloads, ndjson=True)),
+    ]
+    
+    def report(url: str) -> None:
+        print(f"{'mode':<14} {'seconds':>8} {'errors/s':>10} {'speedup':>8}")
+        baseline = None
+        for name, run in runs:
+            start = time.perf_counter()
+            analyzed = asyncio.run(run(url))
+            elapsed = time.perf_counter() - start
+            if analyzed != len(payloads):
+                raise RuntimeError(f"{name}: {analyzed} of {len(payloads)} errors analyzed")
+            
+            baseline = baseline or elapsed
+            print(f"{name:<14} {elapsed:>8.2f} {len(payloads) / elapsed:>10,.0f} "
+                  f"{baseline / elapsed:>7.1f}x")
+    
+    if args.url:
+        report(args.url)
+    else:
+        with local_server(args.workers) as url:
+            report(url)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Compare analyzing every record of a log storm with deduplicating it first.
+
+Three SQL storms of ``--records`` records are built: one line repeated
+verbatim, variants of a few errors differing in users, hosts, ids and
+timestamps, and the analyzer corpus repeated with varying numbers. Each is
+run through ``analyze`` per record, ``analyze_many`` and ``Deduplicator``,
+timing them and measuring the memory their output holds.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_dedup [--records N]
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import load_samples
+from dedup import Deduplicator
+from registry import load_analyzer
+
+TEMPLATES = [
+    "{ts} ERROR 1045 (28000): Access denied for user '{user}'@'10.0.{a}.{b}' (using password: YES)",
+    "{ts} ERROR 1146 (42S02): Table 'shop.orders_{a}' doesn't exist",
+    "{ts} ERROR: duplicate key value violates unique constraint \"orders_pkey\" "
+    "DETAIL: Key (id)=({b}{a}) already exists.",
+]
+
+
+def build_storms(records: int, seed: int = 0) -> Dict[str, List[str]]:
+    """Return the texts of every storm by name."""
+    rng = random.Random(seed)
+    
+    def stamp() -> str:
+        return f"2024-05-{rng.randrange(1, 29):02d}T{rng.randrange(24):02d}:{rng.randrange(60):02d}:00Z"
+    
+    variants = [
+        rng.choice(TEMPLATES).format(ts=stamp(), user=f"svc_{rng.randrange(40)}",
+                                     a=rng.randrange(256), b=rng.randrange(256))
+        for _ in range(records)
+    ]
+    samples = load_samples('sql')
+    corpus = [f"{stamp()} {rng.choice(samples)}" for _ in range(records)]
+    return {'verbatim': [variants[0]] * records, 'variants': variants, 'corpus': corpus}
+
+
+def measure(run: Callable[[], object]) -> tuple:
+    """Return the seconds a run takes and the memory its output holds.
+    
+    Memory is traced in a second run, since tracing slows allocation down.
+    """
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    
+    tracemalloc.start()
+    output = run()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, size, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=50_000, help='records per storm')
+    args = parser.parse_args()
+    
+    analyzer = load_analyzer('sql')
+    print(f"{'storm':<9} {'strategy':<13} {'seconds':>8} {'records/s':>11} {'output MB':>10} {'groups':>7}")
+    for name, texts in build_storms(args.records).items():
+        strategies = {
+            'analyze': lambda: [analyzer.analyze(text) for text in texts],
+            'analyze_many': lambda: analyzer.analyze_many(texts),
+            'dedup': lambda: Deduplicator(analyzer).update(texts),
+        }
+        for strategy, run in strategies.items():
+            elapsed, size, output = measure(run)
+            groups = len(output)
+            print(f"{name:<9} {strategy:<13} {elapsed:>8.3f} {len(texts) / elapsed:>11,.0f} "
+                  f"{size / 1e6:>10.2f} {groups:>7}")
+
+
+if __name__ == '__main__':
+    main()
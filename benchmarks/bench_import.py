@@ -0,0 +1,101 @@
+"""Measure cold-start cost of one-language and all-language analysis hosts.
+
+Every run is a fresh interpreter that imports the host modules (the server,
+worker pool and dispatcher, which load no analyzer by themselves), then gets
+the shared analyzer of each host language from the registry and analyzes one
+sample per language, timing each step and the resident memory it adds.
+Runs are repeated with the pattern cache disabled, then with an empty cache
+directory (first run writes it) and with the cache warm.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_import [--runs N] [--language L]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional, Sequence
+
+from benchmarks.corpus import ANALYZERS, load_samples
+from pattern_cache import CACHE_ENV
+
+CHILD = r"""
+import json, resource, sys, time
+samples = json.load(sys.stdin)
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+rss = rss_mb()
+start = time.perf_counter()
+import analysis_server, registry
+hosted = time.perf_counter()
+host_rss = rss_mb()
+classes = [registry.analyzer_class(language) for language in samples]
+imported = time.perf_counter()
+analyzers = [registry.get_analyzer(language) for language in samples]
+tables = time.perf_counter()
+for language, analyzer in zip(samples, analyzers):
+    analyzer.analyze(samples[language])
+first = time.perf_counter()
+
+print(json.dumps({
+    'host_ms': (hosted - start) * 1e3,
+    'import_ms': (imported - hosted) * 1e3,
+    'tables_ms': (tables - imported) * 1e3,
+    'first_analyze_ms': (first - tables) * 1e3,
+    'host_rss_mb': host_rss - rss,
+    'analyzers_rss_mb': rss_mb() - host_rss,
+}))
+"""
+
+
+def run_child(languages: Sequence[str], cache: Optional[str]) -> Dict[str, float]:
+    """Run one fresh interpreter hosting the given languages and return its timings."""
+    env = dict(os.environ)
+    env.pop(CACHE_ENV, None)
+    if cache is not None:
+        env[CACHE_ENV] = cache
+    # Samples go in on stdin, so the child imports no analyzer before the timer starts
+    samples = {language: load_samples(language)[0] for language in languages}
+    output = subprocess.run([sys.executable, '-c', CHILD], input=json.dumps(samples), env=env,
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+def summarize(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    """Return the median of every measurement."""
+    return {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='interpreters per mode')
+    parser.add_argument('--language', default='sql', choices=list(ANALYZERS),
+                        help='language of the one-language host')
+    args = parser.parse_args()
+    
+    print(f"{'host':<7} {'cache':<6} {'host ms':>8} {'import ms':>10} {'tables ms':>10} "
+          f"{'1st analyze ms':>15} {'host MB':>8} {'analyzers MB':>13}")
+    for host, languages in ((args.language, [args.language]), ('all', list(ANALYZERS))):
+        with tempfile.TemporaryDirectory() as directory:
+            modes = [
+                ('off', [run_child(languages, None) for _ in range(args.runs)]),
+                ('cold', [run_child(languages, directory)]),
+                ('warm', [run_child(languages, directory) for _ in range(args.runs)]),
+            ]
+        
+        for name, runs in modes:
+            stats = summarize(runs)
+            print(f"{host:<7} {name:<6} {stats['host_ms']:>8.2f} {stats['import_ms']:>10.2f} "
+                  f"{stats['tables_ms']:>10.2f} {stats['first_analyze_ms']:>15.2f} "
+                  f"{stats['host_rss_mb']:>8.2f} {stats['analyzers_rss_mb']:>13.2f}")
+
+
+if __name__ == '__main__':
+    main()
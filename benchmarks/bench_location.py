@@ -0,0 +1,114 @@
+"""Compare location extraction strategies over the analyzer corpora.
+
+For every ``LocationExtractor`` of every analyzer, three strategies are timed
+on the same texts and checked to return the same fields:
+
+- ``list``: the ordered ``re.search(pattern, text)`` loop the analyzers used
+  before ``LocationExtractor``
+- ``combined``: one prioritized alternation, ``\\A(?:(?=[\\s\\S]*?(rule1))|...)``,
+  matched once per text
+- ``extractor``: ``LocationExtractor.extract``, precompiled rules in order
+  behind a required-literal prefilter
+
+Run from the repository root:
+
+    python -m benchmarks.bench_location [--lines N] [--repeat R]
+"""
+
+import argparse
+import re
+import time
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import ANALYZERS, iter_corpus, load_analyzer
+from location_extractor import INT_FIELDS, LocationExtractor
+
+
+def _fields(fields, constants, groups) -> Dict:
+    """Build the location dict of a matched rule."""
+    info = dict(constants)
+    for field, value in zip(fields, groups):
+        info[field] = int(value) if field in INT_FIELDS else value
+    return info
+
+
+def list_strategy(extractor: LocationExtractor) -> Callable[[str], Dict]:
+    """Search each rule's pattern string in order, as the analyzers used to."""
+    rules = [(regex.pattern, regex.flags, fields, constants)
+             for regex, _, fields, constants in extractor.rules]
+    
+    def extract(text: str) -> Dict:
+        for pattern, flags, fields, constants in rules:
+            match = re.search(pattern, text, flags)
+            if match:
+                return _fields(fields, constants, match.groups())
+        return {}
+    return extract
+
+
+def combined_strategy(extractor: LocationExtractor) -> Callable[[str], Dict]:
+    """Match every rule in one alternation that keeps their priority."""
+    parts, offsets, group = [], [], 1
+    for index, (regex, _, fields, constants) in enumerate(extractor.rules):
+        # The lookahead finds the rule anywhere; the outer alternation keeps rule order
+        parts.append(f'(?=[\\s\\S]*?(?P<r{index}>{regex.pattern}))')
+        offsets.append((group, regex.groups, fields, constants))
+        group += regex.groups + 1
+    combined = re.compile(r'\A(?:' + '|'.join(parts) + ')', extractor.rules[0][0].flags)
+    
+    def extract(text: str) -> Dict:
+        match = combined.match(text)
+        if match is None:
+            return {}
+        start, count, fields, constants = offsets[int(match.lastgroup[1:])]
+        return _fields(fields, constants, match.groups()[start:start + count])
+    return extract
+
+
+def best_time(func: Callable[[str], Dict], texts: List[str], repeat: int) -> float:
+    """Return the fastest time to run a strategy over every text."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=20000, help='corpus lines per language')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per measurement')
+    args = parser.parse_args()
+    
+    strategies = ('list', 'combined', 'extractor')
+    print(f"{'extractor':<28} {'rules':>5} " + ' '.join(f'{name + " us":>12}' for name in strategies)
+          + f" {'speedup':>8}")
+    for language in ANALYZERS:
+        analyzer_class = type(load_analyzer(language))
+        texts = list(iter_corpus(language, args.lines))
+        
+        for name, extractor in vars(analyzer_class).items():
+            if not isinstance(extractor, LocationExtractor):
+                continue
+            
+            funcs = {
+                'list': list_strategy(extractor),
+                'combined': combined_strategy(extractor),
+                'extractor': extractor.extract,
+            }
+            expected = list(map(funcs['list'], texts))
+            for strategy, func in funcs.items():
+                if list(map(func, texts)) != expected:
+                    raise AssertionError(f"{language}.{name}: {strategy} disagrees with list")
+            
+            per_text = {strategy: best_time(func, texts, args.repeat) / len(texts) * 1e6
+                        for strategy, func in funcs.items()}
+            print(f"{language + '.' + name:<28} {len(extractor.rules):>5} "
+                  + ' '.join(f'{per_text[strategy]:>12.2f}' for strategy in strategies)
+                  + f" {per_text['list'] / per_text['extractor']:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
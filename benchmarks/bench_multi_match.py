@@ -0,0 +1,75 @@
+"""Compare first-match and multi-match analysis over the analyzer corpora.
+
+For every language two inputs are timed:
+
+- ``log``: corpus lines, half of them log noise that matches nothing
+- ``records``: multi-problem records, two corpus error texts joined by a line break
+
+Each is run through ``PatternTable.match`` against ``match_all`` and
+``analyze`` against ``analyze_all``, keeping the best of ``--repeat`` runs,
+with the mean number of error types ``match_all`` reports per text.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_multi_match [--lines N] [--repeat R]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from benchmarks.corpus import ANALYZERS, iter_corpus, load_analyzer
+
+
+def best_time(func: Callable[[str], object], texts: List[str], repeat: int) -> float:
+    """Return the fastest time to run a function over every text."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def build_records(language: str, size: int, seed: int = 0) -> List[str]:
+    """Join pairs of corpus error texts into records holding two problems."""
+    rng = random.Random(seed)
+    errors = list(iter_corpus(language, size * 4, seed, noise=0.0))
+    return [f"{rng.choice(errors)}\n{rng.choice(errors)}" for _ in range(size)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=20_000, help='texts per input')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per measurement')
+    args = parser.parse_args()
+    
+    print(f"{'language':<9} {'input':<8} {'match ms':>9} {'all ms':>8} {'ratio':>6} "
+          f"{'analyze ms':>11} {'all ms':>8} {'ratio':>6} {'types':>6}")
+    for language in ANALYZERS:
+        analyzer = load_analyzer(language)
+        table = analyzer.pattern_table()
+        inputs = {
+            'log': list(iter_corpus(language, args.lines)),
+            'records': build_records(language, args.lines),
+        }
+        
+        for name, texts in inputs.items():
+            # Compile every regex before timing
+            for text in texts:
+                table.match_all(text)
+            
+            first = best_time(table.match, texts, args.repeat)
+            every = best_time(table.match_all, texts, args.repeat)
+            analyze = best_time(analyzer.analyze, texts, args.repeat)
+            analyze_all = best_time(analyzer.analyze_all, texts, args.repeat)
+            types = sum(len(table.match_all(text)) for text in texts) / len(texts)
+            print(f"{language:<9} {name:<8} {first * 1e3:>9.1f} {every * 1e3:>8.1f} "
+                  f"{every / first:>5.2f}x {analyze * 1e3:>11.1f} {analyze_all * 1e3:>8.1f} "
+                  f"{analyze_all / analyze:>5.2f}x {types:>6.2f}")
+
+
+if __name__ == '__main__':
+    main()
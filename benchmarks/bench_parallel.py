@@ -0,0 +1,51 @@
+"""Measure ParallelRunner throughput as the worker count grows from 1 to N.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_parallel [--size N] [--max-workers N] [--chunksize C]
+"""
+
+import argparse
+import os
+import time
+
+from benchmarks.corpus import ANALYZERS, build_batch, load_analyzer
+from parallel_runner import DEFAULT_CHUNKSIZE, ParallelRunner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=100000, help='texts per language')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                        help='largest worker count to measure')
+    parser.add_argument('--chunksize', type=int, action='append',
+                        help=f'texts per task, may be repeated (default {DEFAULT_CHUNKSIZE})')
+    args = parser.parse_args()
+    chunksizes = args.chunksize or [DEFAULT_CHUNKSIZE]
+    
+    batches = {language: build_batch(language, args.size, unique=True) for language in ANALYZERS}
+    total = sum(len(texts) for texts in batches.values())
+    
+    start = time.perf_counter()
+    for language, texts in batches.items():
+        load_analyzer(language).analyze_many(texts)
+    serial = time.perf_counter() - start
+    print(f"in-process: {total / serial:,.0f} texts/s")
+    
+    print(f"{'workers':>7} {'chunksize':>9} {'texts/s':>12} {'speedup':>8}")
+    for workers in range(1, args.max_workers + 1):
+        for chunksize in chunksizes:
+            with ParallelRunner(workers=workers, chunksize=chunksize) as runner:
+                # Warm the pool so worker start-up is not measured
+                runner.analyze_many('sql', ['ERROR 1064'] * workers)
+                
+                start = time.perf_counter()
+                for language, texts in batches.items():
+                    runner.analyze_many(language, texts)
+                elapsed = time.perf_counter() - start
+            
+            print(f"{workers:>7} {chunksize:>9} {total / elapsed:>12,.0f} {serial / elapsed:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,179 @@
+"""Load-test the analysis server and report requests/s and tail latency.
+
+Starts ``analysis_server`` on a free localhost port (or targets ``--url``) and
+sends ``POST /analyze`` requests over ``--concurrency`` keep-alive
+connections, cycling through the test samples of every language.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_server [--requests N] [--concurrency C] [--workers W]
+    python -m benchmarks.bench_server --url http://127.0.0.1:8000 --no-language
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.bench_suite import percentile
+from benchmarks.corpus import ANALYZERS, load_samples
+
+
+class Connection:
+    """Minimal keep-alive HTTP/1.1 client connection for load generation."""
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, host: str):
+        """Wrap an open stream pair."""
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+    
+    @classmethod
+    async def open(cls, host: str, port: int) -> 'Connection':
+        """Connect to a server."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, host)
+    
+    async def request(self, method: str, path: str, body: bytes = b'',
+                      content_type: str = 'application/json') -> Tuple[int, bytes]:
+        """Send one request and return the status and body of its response."""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: {content_type}\r\nContent-Length: {len(body)}\r\n\r\n"
+            .encode('latin-1') + body
+        )
+        await self.writer.drain()
+        
+        status = int((await self.reader.readuntil(b'\r\n')).split()[1])
+        length, chunked = 0, False
+        while True:
+            line = await self.reader.readuntil(b'\r\n')
+            if line == b'\r\n':
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            name = name.strip().lower()
+            if name == 'content-length':
+                length = int(value)
+            elif name == 'transfer-encoding':
+                chunked = value.strip().lower() == 'chunked'
+        
+        if not chunked:
+            return status, await self.reader.readexactly(length)
+        
+        pieces = []
+        while True:
+            size = int(await self.reader.readuntil(b'\r\n'), 16)
+            pieces.append((await self.reader.readexactly(size + 2))[:-2])
+            if not size:
+                return status, b''.join(pieces)
+    
+    async def close(self) -> None:
+        """Close the connection."""
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+@contextmanager
+def local_server(workers: Optional[int]) -> Iterator[str]:
+    """Run ``analysis_server`` in a subprocess on a free port and yield its URL."""
+    command = [sys.executable, '-m', 'analysis_server', '--port', '0']
+    if workers:
+        command += ['--workers', str(workers)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    try:
+        # The server prints "Serving on <url>" once its workers are warm
+        line = process.stdout.readline()
+        if not line.startswith('Serving on '):
+            raise RuntimeError(f"Server failed to start: {line!r}")
+        yield line.split()[-1]
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def build_payloads(count: int, with_language: bool) -> List[bytes]:
+    """Build request bodies cycling through the samples of every language."""
+    pairs = [(language, text) for language in ANALYZERS for text in load_samples(language)]
+    payloads = []
+    for index in range(count):
+        language, text = pairs[index % len(pairs)]
+        payload = {'message': text}
+        if with_language:
+            payload['language'] = language
+        payloads.append(json.dumps(payload).encode('utf-8'))
+    return payloads
+
+
+async def run_load(url: str, payloads: List[bytes], concurrency: int) -> Dict[str, float]:
+    """Send every payload over concurrent connections and collect latencies."""
+    address = urlsplit(url)
+    connections = [await Connection.open(address.hostname, address.port)
+                   for _ in range(concurrency)]
+    queue = iter(payloads)
+    latencies: List[int] = []
+    errors = 0
+    
+    async def client(connection: Connection) -> None:
+        nonlocal errors
+        for body in queue:
+            start = time.perf_counter_ns()
+            status, _ = await connection.request('POST', '/analyze', body)
+            latencies.append(time.perf_counter_ns() - start)
+            if status != 200:
+                errors += 1
+    
+    start = time.perf_counter()
+    await asyncio.gather(*(client(connection) for connection in connections))
+    elapsed = time.perf_counter() - start
+    for connection in connections:
+        await connection.close()
+    
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'requests_per_sec': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) / 1e6,
+        'p90_ms': percentile(latencies, 0.90) / 1e6,
+        'p99_ms': percentile(latencies, 0.99) / 1e6,
+        'max_ms': latencies[-1] / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='target a running server instead of starting one')
+    parser.add_argument('--requests', type=int, default=5000, help='requests to send')
+    parser.add_argument('--concurrency', type=int, action='append',
+                        help='open connections, may be repeated (default 1, 8 and 32)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes of the started server (default: CPU count)')
+    parser.add_argument('--no-language', action='store_true',
+                        help='omit "language" so the server routes every error')
+    args = parser.parse_args()
+    
+    payloads = build_payloads(args.requests, not args.no_language)
+    
+    def report(url: str) -> None:
+        print(f"{'conns':>5} {'req/s':>10} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} "
+              f"{'max ms':>8} {'errors':>6}")
+        for concurrency in args.concurrency or [1, 8, 32]:
+            stats = asyncio.run(run_load(url, payloads, concurrency))
+            print(f"{concurrency:>5} {stats['requests_per_sec']:>10,.0f} {stats['p50_ms']:>8.2f} "
+                  f"{stats['p90_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['max_ms']:>8.2f} "
+                  f"{stats['errors']:>6}")
+    
+    if args.url:
+        report(args.url)
+    else:
+        with local_server(args.workers) as url:
+            report(url)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""Measure the WebSocket log stream: records/s and latency from close to result.
+
+Starts ``analysis_server`` on a free localhost port (or targets ``--url``),
+opens ``GET /stream?language=docker`` and tails a generated build log of
+``--records`` errors in ``--message-lines`` line messages. A result is due as
+soon as the line after its record has been sent, so latency is timed from the
+message carrying that line to the result for the record.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_stream [--records N] [--message-lines L] [--workers W]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import time
+from typing import Dict, List
+from urllib.parse import urlsplit
+
+from benchmarks.bench_server import local_server
+from benchmarks.bench_suite import percentile
+from websocket_protocol import WebSocket
+
+RECORD_LINES = [
+    "Step {n}/9 : COPY build/app{n}.jar /app/",
+    "COPY failed: file not found in build context: build/app{n}.jar",
+]
+
+
+async def open_stream(url: str, path: str) -> WebSocket:
+    """Open a client WebSocket to a server path."""
+    address = urlsplit(url)
+    reader, writer = await asyncio.open_connection(address.hostname, address.port)
+    writer.write(
+        f"GET {path} HTTP/1.1\r\nHost: {address.hostname}\r\nUpgrade: websocket\r\n"
+        f"Connection: Upgrade\r\nSec-WebSocket-Version: 13\r\n"
+        f"Sec-WebSocket-Key: {base64.b64encode(os.urandom(16)).decode()}\r\n\r\n"
+        .encode('latin-1')
+    )
+    head = await reader.readuntil(b'\r\n\r\n')
+    if not head.startswith(b'HTTP/1.1 101 '):
+        raise RuntimeError(f"Upgrade refused: {head.splitlines()[0]!r}")
+    return WebSocket(reader, writer, client=True)
+
+
+async def run_stream(url: str, records: int, message_lines: int) -> Dict[str, float]:
+    """Tail a generated log over one WebSocket and time every result."""
+    websocket = await open_stream(url, '/stream?language=docker')
+    await websocket.receive()
+    
+    lines = [line.format(n=n) + '\n' for n in range(records) for line in RECORD_LINES]
+    sent_at: List[int] = []
+    latencies: List[int] = []
+    
+    async def send() -> None:
+        for start in range(0, len(lines), message_lines):
+            sent_at.append(time.perf_counter_ns())
+            await websocket.send_text(''.join(lines[start:start + message_lines]))
+        await websocket.close()
+    
+    start = time.perf_counter()
+    sender = asyncio.create_task(send())
+    while True:
+        message = await websocket.receive()
+        if message is None:
+            break
+        record = json.loads(message[1])['record']
+        # Record n closes at line 2n, the step line of the record after it
+        closing_message = min(2 * record, len(lines) - 1) // message_lines
+        latencies.append(time.perf_counter_ns() - sent_at[closing_message])
+    elapsed = time.perf_counter() - start
+    await sender
+    websocket.writer.close()
+    
+    if len(latencies) != records:
+        raise RuntimeError(f"{len(latencies)} of {records} records analyzed")
+    latencies.sort()
+    return {
+        'records_per_sec': records / elapsed,
+        'p50_ms': percentile(latencies, 0.50) / 1e6,
+        'p99_ms': percentile(latencies, 0.99) / 1e6,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='target a running server instead of starting one')
+    parser.add_argument('--records', type=int, default=5000, help='error records in the log')
+    parser.add_argument('--message-lines', type=int, action='append',
+                        help='log lines per message, may be repeated (default 1 and 64)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='worker processes of the started server (default: CPU count)')
+    args = parser.parse_args()
+    
+    def report(url: str) -> None:
+        print(f"{'lines/msg':>9} {'records/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for message_lines in args.message_lines or [1, 64]:
+            stats = asyncio.run(run_stream(url, args.records, message_lines))
+            print(f"{message_lines:>9} {stats['records_per_sec']:>10,.0f} "
+                  f"{stats['p50_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+    
+    if args.url:
+        report(args.url)
+    else:
+        with local_server(args.workers) as url:
+            report(url)
+
+
+if __name__ == '__main__':
+    main()
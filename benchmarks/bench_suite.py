@@ -0,0 +1,270 @@
+"""Benchmark every analyzer operation and check the results against a stored baseline.
+
+For each language the suite runs ``analyze``, the ``_extract_*`` and
+``_detect_*`` helpers and ``format_suggestions`` over a reproducible corpus
+(see ``benchmarks.corpus.iter_corpus``). It reports throughput, p50/p99
+latency and memory allocated per call. Each operation is compared by its
+ratio to a calibration loop timed alongside it, so a baseline recorded on
+one machine stays usable on another and drift in machine speed during a
+run does not skew the comparison.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_suite                    # measure and check
+    python -m benchmarks.bench_suite --save-baseline    # record a new baseline
+    python -m benchmarks.bench_suite --lines 2000000    # scale the corpus up
+
+The exit status is 1 when any operation's throughput or p50 latency is worse
+than the baseline by more than the threshold, in its first measurement and
+in every recheck of it (``--rechecks``).
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+from benchmarks.corpus import ANALYZERS, iter_corpus, load_analyzer
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Allowed slowdown against the baseline before the suite fails
+DEFAULT_THRESHOLD = 0.3
+
+# Latency differences below this are timer noise, whatever the threshold
+MIN_LATENCY_SLACK_US = 1.0
+
+# Times the operations found slower than the baseline are measured again;
+# noise on a busy machine passes, while a real regression shows every time
+DEFAULT_RECHECKS = 2
+
+# Per-text helpers worth timing on their own when an analyzer has them
+HELPER_PREFIXES = ('_extract_', '_detect_')
+
+
+def calibrate(repeat: int = 10) -> float:
+    """Time a fixed pure-Python workload, used to compare machines (best of ``repeat``)."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        total = 0
+        for i in range(300000):
+            total += i % 7
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Return the value at a fraction of a sorted sequence."""
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def measure(operation: Callable, inputs: List, latency_samples: int,
+            alloc_samples: int, repeat: int = 5) -> Dict[str, float]:
+    """Measure throughput, latency percentiles and allocations of one operation.
+    
+    Like ``timeit``, the garbage collector is off while timing, so collections
+    triggered by earlier benchmarks' objects do not land in this one. Each
+    pass runs the calibration loop, the whole input and the latency samples
+    one by one. The best of the passes is kept for each, so the calibration
+    sees the same machine speed as the operation and a preempted call does
+    not count as slow.
+    """
+    perf_counter_ns = time.perf_counter_ns
+    latency_inputs = inputs[:latency_samples]
+    latencies = [float('inf')] * len(latency_inputs)
+    
+    gc.collect()
+    gc.disable()
+    try:
+        elapsed = calibration = float('inf')
+        for _ in range(repeat):
+            calibration = min(calibration, calibrate(repeat=2))
+            start = time.perf_counter()
+            for value in inputs:
+                operation(value)
+            elapsed = min(elapsed, time.perf_counter() - start)
+            
+            for index, value in enumerate(latency_inputs):
+                call_start = perf_counter_ns()
+                operation(value)
+                latency = perf_counter_ns() - call_start
+                if latency < latencies[index]:
+                    latencies[index] = latency
+        latencies.sort()
+    finally:
+        gc.enable()
+    
+    # Peak traced memory above the starting point, averaged over calls
+    allocated = 0
+    samples = inputs[:alloc_samples]
+    tracemalloc.start()
+    try:
+        for value in samples:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            operation(value)
+            allocated += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'ops_per_sec': len(inputs) / elapsed,
+        'p50_us': percentile(latencies, 0.50) / 1000,
+        'p99_us': percentile(latencies, 0.99) / 1000,
+        'alloc_bytes': allocated / max(1, len(samples)),
+        'calibration_s': calibration,
+    }
+
+
+def operations(analyzer) -> Dict[str, Callable]:
+    """Return the per-text operations of an analyzer to benchmark."""
+    ops = {'analyze': analyzer.analyze}
+    for name in sorted(dir(type(analyzer))):
+        if name.startswith(HELPER_PREFIXES) and name != '_extract_context':
+            ops[name] = getattr(analyzer, name)
+    ops['_extract_context'] = analyzer._extract_context
+    return ops
+
+
+def run_suite(lines: int, latency_samples: int, alloc_samples: int,
+              only: Optional[Set[Tuple[str, str]]] = None) -> Dict[str, Dict]:
+    """Benchmark every operation of every analyzer, or only the given (language, operation) pairs."""
+    results = {}
+    for language in ANALYZERS:
+        if only is not None and not any(selected == language for selected, _ in only):
+            continue
+        analyzer = load_analyzer(language)
+        texts = list(iter_corpus(language, lines))
+        
+        results[language] = {
+            name: measure(operation, texts, latency_samples, alloc_samples)
+            for name, operation in operations(analyzer).items()
+            if only is None or (language, name) in only
+        }
+        
+        if only is None or (language, 'format_suggestions') in only:
+            analyzed = list(map(analyzer.analyze, texts))
+            results[language]['format_suggestions'] = measure(
+                analyzer.format_suggestions, analyzed, latency_samples, alloc_samples
+            )
+    return results
+
+
+def machine_scale(current: Dict[str, float], expected: Dict[str, float]) -> float:
+    """Return how much slower the machine ran one operation than when its baseline was recorded."""
+    return current['calibration_s'] / expected['calibration_s']
+
+
+def find_regressions(results: Dict, baseline: Dict,
+                     threshold: float) -> List[Tuple[str, str, str]]:
+    """List the operations slower than the baseline by more than the threshold.
+    
+    Each regression is a (language, operation, description) tuple.
+    """
+    regressions = []
+    for language, ops in baseline['results'].items():
+        for name, expected in ops.items():
+            current = results.get(language, {}).get(name)
+            if current is None:
+                continue
+            
+            # A slower machine (scale > 1) is allowed proportionally lower numbers
+            scale = machine_scale(current, expected)
+            min_ops = expected['ops_per_sec'] / scale * (1 - threshold)
+            max_p50 = max(expected['p50_us'] * scale * (1 + threshold),
+                          expected['p50_us'] * scale + MIN_LATENCY_SLACK_US)
+            if current['ops_per_sec'] < min_ops:
+                regressions.append((
+                    language, name,
+                    f"{language}.{name}: {current['ops_per_sec']:,.0f} ops/s "
+                    f"< {min_ops:,.0f} allowed"
+                ))
+            if current['p50_us'] > max_p50:
+                regressions.append((
+                    language, name,
+                    f"{language}.{name}: p50 {current['p50_us']:.1f}us > {max_p50:.1f}us allowed"
+                ))
+    return regressions
+
+
+def print_results(results: Dict) -> None:
+    """Print one row per language and operation."""
+    print(f"{'language':<8} {'operation':<22} {'ops/s':>12} {'p50 us':>8} "
+          f"{'p99 us':>8} {'alloc B':>9}")
+    for language, ops in results.items():
+        for name, stats in ops.items():
+            print(f"{language:<8} {name:<22} {stats['ops_per_sec']:>12,.0f} "
+                  f"{stats['p50_us']:>8.1f} {stats['p99_us']:>8.1f} {stats['alloc_bytes']:>9,.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--lines', type=int, default=20000, help='corpus lines per language')
+    parser.add_argument('--latency-samples', type=int, default=5000,
+                        help='calls timed one by one for p50/p99')
+    parser.add_argument('--alloc-samples', type=int, default=500,
+                        help='calls traced for allocations')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON file')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='write the results as the new baseline instead of checking')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed slowdown as a fraction (default %(default)s)')
+    parser.add_argument('--rechecks', type=int, default=DEFAULT_RECHECKS,
+                        help='times slower operations are measured again (default %(default)s)')
+    args = parser.parse_args()
+    
+    results = run_suite(args.lines, args.latency_samples, args.alloc_samples)
+    print_results(results)
+    
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({'lines': args.lines, 'results': results},
+                      f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline written to {args.baseline}")
+        return
+    
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+        return
+    
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if 'calibration' in baseline:
+        print(f"\n{args.baseline} has one calibration for the whole run; "
+              f"record it again with --save-baseline")
+        sys.exit(1)
+    
+    regressions = find_regressions(results, baseline, args.threshold)
+    for _ in range(args.rechecks):
+        if not regressions:
+            break
+        flagged = {(language, name) for language, name, _ in regressions}
+        print(f"\nMeasuring {len(flagged)} slower operation(s) again")
+        rechecked = run_suite(args.lines, args.latency_samples, args.alloc_samples, only=flagged)
+        regressions = find_regressions(rechecked, baseline, args.threshold)
+    
+    scales = sorted(
+        machine_scale(stats, baseline['results'][language][name])
+        for language, ops in results.items() for name, stats in ops.items()
+        if name in baseline['results'].get(language, {})
+    )
+    scale = percentile(scales, 0.50) if scales else 1.0
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} "
+              f"(median machine scale {scale:.2f}):")
+        for _, _, description in regressions:
+            print(f"  {description}")
+        sys.exit(1)
+    
+    print(f"\nNo regressions beyond {args.threshold:.0%} (median machine scale {scale:.2f})")
+
+
+if __name__ == '__main__':
+    main()
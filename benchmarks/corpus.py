@@ -0,0 +1,104 @@
+"""Error-text corpus for analyzer benchmarks, built from the analyzer test cases."""
+
+import ast
+import os
+import random
+import re
+from typing import Iterator, List
+
+from registry import ANALYZERS, load_analyzer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Identifiers such as expected error types, field names and language codes
+IDENTIFIER = re.compile(r'^[a-z0-9_.\-]*$')
+
+
+def _parse_module(file_name: str) -> ast.Module:
+    """Parse a module of the repository root."""
+    with open(os.path.join(ROOT, file_name), encoding='utf-8') as f:
+        return ast.parse(f.read())
+
+
+def load_examples(language: str) -> List[str]:
+    """Collect the error texts of the ``__main__`` example of an analyzer module."""
+    tree = _parse_module(f'{ANALYZERS[language][0]}.py')
+    
+    examples = []
+    for node in tree.body:
+        if isinstance(node, ast.If) and '__main__' in ast.unparse(node.test):
+            for statement in node.body:
+                if (isinstance(statement, ast.Assign)
+                        and ast.unparse(statement.targets[0]) == 'test_errors'):
+                    examples.extend(ast.literal_eval(statement.value))
+    
+    return examples
+
+
+def load_samples(language: str) -> List[str]:
+    """Collect the error texts used in the test module of a language."""
+    tree = _parse_module(f'test_{ANALYZERS[language][0]}.py')
+    
+    docstrings = {
+        id(node.value) for node in ast.walk(tree)
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)
+    }
+    
+    samples = []
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Constant) and isinstance(node.value, str)
+                and id(node) not in docstrings
+                and len(node.value) > 3 and not IDENTIFIER.match(node.value)):
+            samples.append(node.value)
+    
+    # Keep first-seen order while dropping duplicates
+    return list(dict.fromkeys(samples))
+
+
+def build_batch(language: str, size: int, unique: bool = False) -> List[str]:
+    """Build a batch of error texts by cycling through the samples of a language.
+    
+    With ``unique`` every text gets a distinct trailing log line, so no two
+    entries in the batch are equal.
+    """
+    samples = load_samples(language)
+    if unique:
+        return [f"{samples[i % len(samples)]}\n(record {i})" for i in range(size)]
+    return [samples[i % len(samples)] for i in range(size)]
+
+
+# Lines that surround real errors in build and server logs
+NOISE_LINES = [
+    "INFO  Starting build {n}",
+    "DEBUG cache hit for layer sha256:{h}",
+    "> Task :app:compileDebugSources UP-TO-DATE",
+    "Downloading https://repo.example.com/lib-{n}.jar",
+    "[{n}/500] Compiling module_{n}",
+    "    at com.example.Worker.run(Worker.kt:{n})",
+    "WARN  retrying request {n} after timeout",
+]
+
+
+def _vary(text: str, rng: random.Random) -> str:
+    """Change the numbers and wrapping of an error text like real logs do."""
+    text = re.sub(r'\d+', lambda m: str(rng.randrange(1, 10 ** len(m.group(0)))), text)
+    prefix = rng.choice(('', '', f"2024-05-{rng.randrange(1, 29):02d}T12:00:00Z ", "[ERROR] "))
+    return prefix + text
+
+
+def iter_corpus(language: str, lines: int, seed: int = 0,
+                noise: float = 0.5) -> Iterator[str]:
+    """Yield a reproducible mix of error texts and log noise for a language.
+    
+    Error texts are the test cases and ``__main__`` examples of the language
+    with their numbers and prefixes varied; a ``noise`` share of the lines are
+    ordinary log lines that match no pattern.
+    """
+    rng = random.Random(seed)
+    samples = list(dict.fromkeys(load_samples(language) + load_examples(language)))
+    
+    for _ in range(lines):
+        if rng.random() < noise:
+            yield rng.choice(NOISE_LINES).format(n=rng.randrange(10000), h='%064x' % rng.getrandbits(256))
+        else:
+            yield _vary(rng.choice(samples), rng)
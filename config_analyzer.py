@@ -1,11 +1,14 @@
 """YAML/JSON configuration error analyzer for CCDebugger."""
 
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 
+from location_extractor import LocationExtractor
+from pattern_engine import PatternAnalyzer, Suggestion
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ConfigError:
     """Represents a YAML/JSON configuration error with analysis."""
     error_type: str
@@ -15,11 +18,12 @@ class ConfigError:
     column: Optional[int] = None
     config_type: Optional[str] = None  # yaml, json, k8s, ci/cd
     severity: str = "high"
-    suggestions: List[Dict[str, any]] = None
+    suggestions: Optional[Tuple[Suggestion, ...]] = None
     explanation: Optional[str] = None
+    score: float = 0.0  # Match strength in [0, 1], see scoring.py
     
 
-class ConfigAnalyzer:
+class ConfigAnalyzer(PatternAnalyzer):
     """Analyzer for YAML/JSON configuration errors."""
     
     # YAML syntax error patterns
@@ -294,192 +298,149 @@ class ConfigAnalyzer:
         }
     }
     
-    def __init__(self):
-        """Initialize the Config analyzer."""
-        # Order patterns for better matching - more specific patterns first
-        self.all_patterns = {}
+    # Configuration type indicators - check more specific types before generic ones
+    CONFIG_INDICATORS = [
+        ('k8s', ['kubernetes', 'k8s', 'kubectl', 'apiVersion', 'kind:', 'ValidationError', 'io.k8s']),
+        ('github', ['github', 'workflow', 'actions/', '.github/workflows']),
+        ('gitlab', ['gitlab', '.gitlab-ci', 'gitlab-ci.yml']),
+        ('circleci', ['circleci', 'circle.yml', '.circleci']),
+        ('docker-compose', ['docker-compose', 'compose.yml', 'compose.yaml']),
+        ('json', ['json', 'JSON.parse', '.json', 'JSON5']),
+        ('yaml', ['yaml', 'yml', '.yaml', '.yml'])
+    ]
+    _CONFIG_INDICATORS_LOWER = tuple(
+        (config_type, tuple(ind.lower() for ind in indicators))
+        for config_type, indicators in CONFIG_INDICATORS
+    )
+    
+    # Language code used by the log segmenter and routing
+    LANGUAGE = 'config'
+    
+    # Banner title and code fence used by format_suggestions
+    DISPLAY_NAMES = {'en': 'Configuration Error', 'zh': '配置錯誤'}
+    CODE_FENCE = 'yaml'
+    
+    # File, line and column locations, highest priority first
+    FILE_LOCATIONS = LocationExtractor([
+        (r'"([^"]+\.(?:ya?ml|json))".*?line (\d+)', ('file', 'line')),  # "file.yaml" at line 10
+        (r'error in ([^:\s]+\.(?:ya?ml|json)) at line (\d+)', ('file', 'line')),  # error in file.yaml at line 10 (check before generic)
+        (r'([^:\s]+\.(?:ya?ml|json)):(\d+):(\d+)', ('file', 'line', 'column')),  # file.yaml:10:5 (simple)
+        (r'([^:\s]+\.(?:ya?ml|json)): line (\d+):(\d+)', ('file', 'line', 'column')),  # file.yaml: line 10:5
+        (r'(?:in |at |from )"([^"]+\.(?:ya?ml|json))":(\d+):(\d+)', ('file', 'line', 'column')),  # in "file.yaml":10:5
+        (r'(?:in |at |from )([^:\s]+\.(?:ya?ml|json)):(\d+):(\d+)', ('file', 'line', 'column')),  # in file.yaml:10:5
+        (r'(?:in |at |from )"([^"]+\.(?:ya?ml|json))" at line (\d+)', ('file', 'line')),  # in "file.yaml" at line 10
+        (r'line (\d+), column (\d+)', ('line', 'column')),  # line 10, column 5
+        (r'line (\d+):(\d+)', ('line', 'column')),  # line 10:5
+        (r':(\d+):(\d+)', ('line', 'column')),  # :10:5
+        (r'at line (\d+)', ('line',)),  # at line 10
+    ], re.IGNORECASE | re.MULTILINE)
+    
+    # Result used when no pattern matches
+    RESULT_CLASS = ConfigError
+    UNKNOWN_ERROR_TYPE = 'unknown_config_error'
+    UNKNOWN_EXPLANATION = "This appears to be a configuration error, but doesn't match common patterns."
+    UNKNOWN_SUGGESTIONS = [
+        {
+            'title': 'Validate configuration syntax',
+            'code': '# For YAML\nyamllint config.yaml\n\n# For JSON\njq . config.json\n\n# Online validators also available',
+            'confidence': 0.5
+        },
+        {
+            'title': 'Check configuration documentation',
+            'code': '# Review the official documentation\n# for your specific tool/platform',
+            'confidence': 0.5
+        }
+    ]
+    
+    @classmethod
+    def _ordered_patterns(cls) -> Dict[str, Dict]:
+        """Merge pattern tables in order - more specific patterns first."""
+        all_patterns = {}
         
         # Add patterns in order of specificity
         # Schema patterns first (very specific)
-        self.all_patterns.update(self.SCHEMA_PATTERNS)
+        all_patterns.update(cls.SCHEMA_PATTERNS)
         
         # CI/CD patterns (domain-specific)
-        self.all_patterns.update(self.CICD_PATTERNS)
+        all_patterns.update(cls.CICD_PATTERNS)
         
         # K8s patterns (domain-specific)
-        self.all_patterns.update(self.K8S_PATTERNS)
+        all_patterns.update(cls.K8S_PATTERNS)
         
         # JSON patterns (more specific than YAML)
         # Reorder JSON patterns - more specific first
         json_ordered = {
-            'json_trailing_comma': self.JSON_PATTERNS['json_trailing_comma'],
-            'json_single_quotes': self.JSON_PATTERNS['json_single_quotes'],
-            'json_unquoted_key': self.JSON_PATTERNS['json_unquoted_key'],
-            'json_parse_error': self.JSON_PATTERNS['json_parse_error'],
+            'json_trailing_comma': cls.JSON_PATTERNS['json_trailing_comma'],
+            'json_single_quotes': cls.JSON_PATTERNS['json_single_quotes'],
+            'json_unquoted_key': cls.JSON_PATTERNS['json_unquoted_key'],
+            'json_parse_error': cls.JSON_PATTERNS['json_parse_error'],
         }
-        self.all_patterns.update(json_ordered)
+        all_patterns.update(json_ordered)
         
         # YAML patterns (general)
-        self.all_patterns.update(self.YAML_PATTERNS)
+        all_patterns.update(cls.YAML_PATTERNS)
+        
+        return all_patterns
     
-    def analyze(self, error_text: str) -> Optional[ConfigError]:
-        """Analyze configuration error text and return structured analysis."""
-        if not error_text:
-            return None
-            
+    def _extract_context(self, error_text: str) -> Dict[str, any]:
+        """Extract configuration type, file and position information."""
         # Detect configuration type
         config_type = self._detect_config_type(error_text)
         
         # Extract file and position information
         file_info = self._extract_file_info(error_text)
         
-        # Try to match against known patterns
-        for error_type, config in self.all_patterns.items():
-            pattern = config['pattern']
-            match = re.search(pattern, error_text, re.MULTILINE | re.IGNORECASE)
-            
-            if match:
-                return ConfigError(
-                    error_type=error_type,
-                    message=error_text,
-                    file_path=file_info.get('file'),
-                    line=file_info.get('line'),
-                    column=file_info.get('column'),
-                    config_type=config_type,
-                    severity=config['severity'],
-                    suggestions=config['suggestions'],
-                    explanation=config['explanation']
-                )
-        
-        # Generic config error if no pattern matches
-        return ConfigError(
-            error_type='unknown_config_error',
-            message=error_text,
-            file_path=file_info.get('file'),
-            line=file_info.get('line'),
-            column=file_info.get('column'),
-            config_type=config_type,
-            severity='medium',
-            explanation="This appears to be a configuration error, but doesn't match common patterns.",
-            suggestions=[
-                {
-                    'title': 'Validate configuration syntax',
-                    'code': '# For YAML\nyamllint config.yaml\n\n# For JSON\njq . config.json\n\n# Online validators also available',
-                    'confidence': 0.5
-                },
-                {
-                    'title': 'Check configuration documentation',
-                    'code': '# Review the official documentation\n# for your specific tool/platform',
-                    'confidence': 0.5
-                }
-            ]
-        )
+        return {
+            'file_path': file_info.get('file'),
+            'line': file_info.get('line'),
+            'column': file_info.get('column'),
+            'config_type': config_type,
+        }
     
     def _detect_config_type(self, error_text: str) -> Optional[str]:
         """Detect the type of configuration from error text."""
-        # Check more specific types before generic ones
-        config_indicators = [
-            ('k8s', ['kubernetes', 'k8s', 'kubectl', 'apiVersion', 'kind:', 'ValidationError', 'io.k8s']),
-            ('github', ['github', 'workflow', 'actions/', '.github/workflows']),
-            ('gitlab', ['gitlab', '.gitlab-ci', 'gitlab-ci.yml']),
-            ('circleci', ['circleci', 'circle.yml', '.circleci']),
-            ('docker-compose', ['docker-compose', 'compose.yml', 'compose.yaml']),
-            ('json', ['json', 'JSON.parse', '.json', 'JSON5']),
-            ('yaml', ['yaml', 'yml', '.yaml', '.yml'])
-        ]
-        
         error_lower = error_text.lower()
-        for config_type, indicators in config_indicators:
-            if any(ind.lower() in error_lower for ind in indicators):
-                return config_type
+        for config_type, indicators in self._CONFIG_INDICATORS_LOWER:
+            for indicator in indicators:
+                if indicator in error_lower:
+                    return config_type
         
         return None
     
     def _extract_file_info(self, error_text: str) -> Dict[str, any]:
         """Extract file path, line and column from error text."""
-        info = {}
-        
-        # Common patterns for file:line:column
-        patterns = [
-            r'"([^"]+\.(?:ya?ml|json))".*?line (\d+)',  # "file.yaml" at line 10
-            r'error in ([^:\s]+\.(?:ya?ml|json)) at line (\d+)',  # error in file.yaml at line 10 (check before generic)
-            r'([^:\s]+\.(?:ya?ml|json)):(\d+):(\d+)',  # file.yaml:10:5 (simple)
-            r'([^:\s]+\.(?:ya?ml|json)): line (\d+):(\d+)',  # file.yaml: line 10:5
-            r'(?:in |at |from )"([^"]+\.(?:ya?ml|json))":(\d+):(\d+)',  # in "file.yaml":10:5
-            r'(?:in |at |from )([^:\s]+\.(?:ya?ml|json)):(\d+):(\d+)',  # in file.yaml:10:5
-            r'(?:in |at |from )"([^"]+\.(?:ya?ml|json))" at line (\d+)',  # in "file.yaml" at line 10
-            r'line (\d+), column (\d+)',  # line 10, column 5
-            r'line (\d+):(\d+)',  # line 10:5
-            r':(\d+):(\d+)',  # :10:5
-            r'at line (\d+)',  # at line 10
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, error_text, re.IGNORECASE | re.MULTILINE)
-            if match:
-                groups = match.groups()
-                if len(groups) == 3 and '.' in groups[0]:  # file:line:column
-                    info['file'] = groups[0]
-                    info['line'] = int(groups[1])
-                    info['column'] = int(groups[2])
-                elif len(groups) == 2 and groups[0] and '.' in groups[0]:  # file at line
-                    info['file'] = groups[0]
-                    info['line'] = int(groups[1])
-                elif len(groups) == 2 and groups[0].isdigit():  # line, column
-                    info['line'] = int(groups[0])
-                    info['column'] = int(groups[1])
-                elif len(groups) == 1:  # just line
-                    info['line'] = int(groups[0])
-                break
-        
-        return info
+        return self.FILE_LOCATIONS.extract(error_text)
     
     def format_suggestions(self, error: ConfigError, language: str = 'en') -> str:
         """Format error analysis for display."""
+        header, body = self._format_blocks(error, language)
+        output = [header]
+        
         if language == 'zh':
-            output = f"🚨 配置錯誤 - {error.severity.upper()} 優先級\n\n"
-            output += f"錯誤類型: {error.error_type}\n"
             if error.config_type:
-                output += f"配置類型: {error.config_type.upper()}\n"
+                output.append(f"配置類型: {error.config_type.upper()}\n")
             if error.file_path:
-                output += f"文件: {error.file_path}"
+                output.append(f"文件: {error.file_path}")
                 if error.line:
-                    output += f" (第 {error.line} 行"
+                    output.append(f" (第 {error.line} 行")
                     if error.column:
-                        output += f", 第 {error.column} 列"
-                    output += ")"
-                output += "\n"
-            output += f"\n說明: {error.explanation}\n"
-            
-            if error.suggestions:
-                output += "\n🎯 智能建議:\n"
-                for i, suggestion in enumerate(error.suggestions, 1):
-                    output += f"\n{i}. {suggestion['title']} (信心度: {suggestion['confidence']*100:.0f}%)\n"
-                    if 'code' in suggestion:
-                        output += f"```yaml\n{suggestion['code']}\n```\n"
+                        output.append(f", 第 {error.column} 列")
+                    output.append(")")
+                output.append("\n")
         else:
-            output = f"🚨 Configuration Error - {error.severity.upper()} Priority\n\n"
-            output += f"Error Type: {error.error_type}\n"
             if error.config_type:
-                output += f"Config Type: {error.config_type.upper()}\n"
+                output.append(f"Config Type: {error.config_type.upper()}\n")
             if error.file_path:
-                output += f"File: {error.file_path}"
+                output.append(f"File: {error.file_path}")
                 if error.line:
-                    output += f" (Line {error.line}"
+                    output.append(f" (Line {error.line}")
                     if error.column:
-                        output += f", Column {error.column}"
-                    output += ")"
-                output += "\n"
-            output += f"\nExplanation: {error.explanation}\n"
-            
-            if error.suggestions:
-                output += "\n🎯 Smart Suggestions:\n"
-                for i, suggestion in enumerate(error.suggestions, 1):
-                    output += f"\n{i}. {suggestion['title']} (Confidence: {suggestion['confidence']*100:.0f}%)\n"
-                    if 'code' in suggestion:
-                        output += f"```yaml\n{suggestion['code']}\n```\n"
+                        output.append(f", Column {error.column}")
+                    output.append(")")
+                output.append("\n")
         
-        return output
+        output.append(body)
+        return ''.join(output)
 
 
 # Example usage
@@ -0,0 +1,151 @@
+"""Deduplication of repeated error records for CCDebugger analyzers."""
+
+import hashlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+from fingerprint import fingerprint
+from log_stream import MAX_RECORD_CHARS, iter_records, open_log, read_lines
+from pattern_engine import result_to_dict
+
+# Distinct raw texts kept per cluster, the representative first
+DEFAULT_MAX_SAMPLES = 3
+
+# Recent texts remembered with their cluster, so exact repeats skip fingerprinting
+DEFAULT_MEMO_SIZE = 1024
+
+
+@dataclass
+class Cluster:
+    """Error records sharing one fingerprint, analyzed once."""
+    result: Any
+    count: int
+    first_offset: int
+    last_offset: int
+    samples: List[str] = field(default_factory=list)
+    
+    @property
+    def text(self) -> str:
+        """Return the representative record, the first one seen."""
+        return self.samples[0]
+
+
+def cluster_key(error_text: str) -> bytes:
+    """Return a short digest of a record's fingerprint, the key of its cluster.
+    
+    Records differing only in numbers, hex ids, quoted names and directories
+    share a key. Digests keep keys small however long the records are.
+    """
+    return hashlib.blake2b(fingerprint(error_text).encode('utf-8', 'surrogatepass'),
+                           digest_size=16).digest()
+
+
+class Deduplicator:
+    """Group error records by fingerprint and analyze each group once.
+    
+    The first record of a cluster is analyzed and its result, file and line
+    included, stands for all of them, so a log storm of one error costs one
+    analysis plus one fingerprint per repeat. Memory grows with the number
+    of clusters, not records: each keeps its result, counters and at most
+    ``max_samples`` distinct texts, plus a memo of up to ``memo_size``
+    recent texts so byte-identical repeats cost one dictionary lookup.
+    """
+    
+    def __init__(self, analyzer, max_samples: int = DEFAULT_MAX_SAMPLES,
+                 memo_size: int = DEFAULT_MEMO_SIZE):
+        """Deduplicate records for an analyzer, keeping up to ``max_samples`` variants each."""
+        if max_samples < 1:
+            raise ValueError("max_samples must be at least 1")
+        
+        self.analyzer = analyzer
+        self.max_samples = max_samples
+        self.memo_size = memo_size
+        self.records = 0
+        self._clusters: Dict[bytes, Cluster] = {}
+        self._memo: Dict[str, Cluster] = {}
+    
+    def add(self, error_text: str, offset: Optional[int] = None) -> Optional[Cluster]:
+        """Count one record and return its cluster; empty texts are ignored.
+        
+        ``offset`` locates the record, e.g. its position in a log; it
+        defaults to the number of records added before it.
+        """
+        if not error_text:
+            return None
+        
+        if offset is None:
+            offset = self.records
+        self.records += 1
+        
+        cluster = self._memo.get(error_text)
+        if cluster is None:
+            key = cluster_key(error_text)
+            cluster = self._clusters.get(key)
+            if cluster is None:
+                cluster = self._clusters[key] = Cluster(
+                    self.analyzer.analyze(error_text), 0, offset, offset
+                )
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[error_text] = cluster
+        
+        cluster.count += 1
+        cluster.first_offset = min(cluster.first_offset, offset)
+        cluster.last_offset = max(cluster.last_offset, offset)
+        samples = cluster.samples
+        if len(samples) < self.max_samples and error_text not in samples:
+            samples.append(error_text)
+        return cluster
+    
+    def update(self, texts: Iterable[str]) -> 'Deduplicator':
+        """Add every record of an iterable and return self."""
+        add = self.add
+        for text in texts:
+            add(text)
+        return self
+    
+    def clusters(self) -> List[Cluster]:
+        """Return every cluster in first-seen order."""
+        return list(self._clusters.values())
+    
+    def most_common(self, n: Optional[int] = None) -> List[Cluster]:
+        """Return the ``n`` largest clusters (all by default), largest first."""
+        ranked = sorted(self._clusters.values(), key=lambda cluster: -cluster.count)
+        return ranked if n is None else ranked[:n]
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Return every cluster as plain data, its result in ``result_to_dict`` form."""
+        return [
+            {
+                'count': cluster.count,
+                'first_offset': cluster.first_offset,
+                'last_offset': cluster.last_offset,
+                'samples': list(cluster.samples),
+                'result': result_to_dict(cluster.result) if cluster.result is not None else None,
+            }
+            for cluster in self._clusters.values()
+        ]
+    
+    def __len__(self) -> int:
+        """Return the number of clusters."""
+        return len(self._clusters)
+
+
+def dedup_stream(lines: Iterable[str], analyzer, language: Optional[str] = None,
+                 max_samples: int = DEFAULT_MAX_SAMPLES,
+                 max_record_chars: int = MAX_RECORD_CHARS) -> Deduplicator:
+    """Split a stream of log lines into records and cluster them.
+    
+    Offsets are record numbers, counted from 0 in stream order.
+    """
+    deduplicator = Deduplicator(analyzer, max_samples)
+    return deduplicator.update(iter_records(lines, language or analyzer.LANGUAGE, max_record_chars))
+
+
+def dedup_file(path: str, analyzer, language: Optional[str] = None,
+               max_samples: int = DEFAULT_MAX_SAMPLES,
+               max_record_chars: int = MAX_RECORD_CHARS) -> Deduplicator:
+    """Cluster the error records of a log file, or stdin when the path is '-'."""
+    with open_log(path) as stream:
+        return dedup_stream(read_lines(stream, max_record_chars), analyzer, language,
+                            max_samples, max_record_chars)
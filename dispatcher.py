@@ -0,0 +1,174 @@
+"""Language routing in front of the CCDebugger analyzers."""
+
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from registry import get_analyzer
+
+DOCKERFILE_INSTRUCTIONS = (
+    'FROM', 'RUN', 'CMD', 'LABEL', 'MAINTAINER', 'EXPOSE', 'ENV', 'ADD', 'COPY',
+    'ENTRYPOINT', 'VOLUME', 'USER', 'WORKDIR', 'ARG', 'ONBUILD', 'STOPSIGNAL',
+    'HEALTHCHECK', 'SHELL'
+)
+
+
+def _indicator_regex(indicator_table: Any) -> str:
+    """Build one alternation from the indicators of a name -> indicators table."""
+    if isinstance(indicator_table, dict):
+        indicator_table = indicator_table.items()
+    return '|'.join(
+        re.escape(indicator) for _, indicators in indicator_table for indicator in indicators
+    )
+
+
+# Routing signals per language as (regex, weight), strongest first. File
+# markers and error codes are worth more than words that other tools print too.
+ROUTING_SIGNALS: Dict[str, List[Tuple[str, int]]] = {
+    'kotlin': [
+        (r"\.kts?:\s*(?:\d|\()", 3),
+        (r"kotlin|java\.lang\.|gradle|AndroidRuntime", 1),
+    ],
+    'swift': [
+        (r"\.swift:\d", 3),
+        (r"Fatal error:|xcode|swiftc?\b|No such module|Undefined symbols for architecture", 1),
+    ],
+    'sql': [
+        (r"ERROR \d{4}|ORA-\d{5}|SQLSTATE|Msg \d+, Level", 3),
+        (r"\b(?:SELECT|INSERT INTO|UPDATE|DELETE FROM|CREATE TABLE)\b|\bSQL\b", 1),
+    ],
+    'docker': [
+        (r"(?-i:^(?:Step \d+/\d+ : |#\d+ \[[^\]]*\] )?(?:%s)\b)" % '|'.join(DOCKERFILE_INSTRUCTIONS), 3),
+        (r"Dockerfile|failed to solve|buildkit", 3),
+        (r"docker|container|image", 1),
+    ],
+    'config': [
+        (r"\.(?:ya?ml|json)\b", 2),
+    ],
+    'shell': [
+        (r": line \d+: |\.sh:\s*\d+:|command not found|^(?:ba|z|da)?sh: ", 3),
+        (r"Permission denied|No such file or directory|exit (?:code|status)|\$\w+", 1),
+    ],
+}
+
+# Signals built from an analyzer's own indicator table, as language ->
+# (table attribute, weight), so that routing imports no analyzer by itself
+INDICATOR_SIGNALS: Dict[str, Tuple[str, int]] = {
+    'sql': ('DIALECT_INDICATORS', 2),
+    'config': ('CONFIG_INDICATORS', 1),
+}
+
+
+def routing_signals(language: str, analyzer: Any) -> List[Tuple[str, int]]:
+    """Return the routing signals of a language, strongest first."""
+    signals = list(ROUTING_SIGNALS[language])
+    if language in INDICATOR_SIGNALS:
+        attribute, weight = INDICATOR_SIGNALS[language]
+        signals.append((_indicator_regex(getattr(analyzer, attribute)), weight))
+        signals.sort(key=lambda signal: -signal[1])
+    return signals
+
+
+@dataclass
+class DispatchResult:
+    """Result of routing an error text to the analyzers that could match it."""
+    language: Optional[str]
+    result: Any
+    scores: Dict[str, int] = field(default_factory=dict)
+    analyzed: List[str] = field(default_factory=list)
+    routing_seconds: float = 0.0
+    analysis_seconds: float = 0.0
+
+
+class Dispatcher:
+    """Route error text to likely analyzers and return the best result.
+    
+    One cheap pre-pass scores every language by the routing signals found in
+    the text. Only languages with a positive score are analyzed, highest
+    score first. The first analyzer that recognizes the error with a match
+    score of at least ``CONFIDENT_SCORE`` wins; a weaker match lets the next
+    languages try, and the best-scoring one is kept. Languages are compared
+    by match score alone, since context scores depend on how many fields an
+    analyzer extracts, and only the winner builds its full result. When no
+    language has a signal, every analyzer is tried in the same way.
+    """
+    
+    # Analysis order between languages with equal scores
+    LANGUAGES = ('kotlin', 'swift', 'sql', 'docker', 'config', 'shell')
+    
+    # Match score (see scoring.py, at most 0.8) that stops trying further languages
+    CONFIDENT_SCORE = 0.45
+    
+    def __init__(self, analyzers: Optional[Iterable] = None):
+        """Initialize the dispatcher with one analyzer per language (the shared ones by default)."""
+        if analyzers is None:
+            analyzers = [get_analyzer(language) for language in self.LANGUAGES]
+        self.analyzers = {analyzer.LANGUAGE: analyzer for analyzer in analyzers}
+        
+        self.signals = [
+            (language, [(re.compile(pattern, re.MULTILINE | re.IGNORECASE), weight)
+                        for pattern, weight in routing_signals(language, analyzer)])
+            for language, analyzer in self.analyzers.items()
+        ]
+    
+    def route(self, error_text: str) -> Dict[str, int]:
+        """Score each language by the routing signals found in the text."""
+        scores = {}
+        for language, signals in self.signals:
+            score = sum(weight for regex, weight in signals if regex.search(error_text))
+            if score:
+                scores[language] = score
+        return scores
+    
+    def dispatch(self, error_text: str) -> Optional[DispatchResult]:
+        """Analyze error text with the analyzers its routing signals point to."""
+        if not error_text:
+            return None
+        
+        start = time.perf_counter()
+        scores = self.route(error_text)
+        routed = time.perf_counter()
+        
+        # Stable sort keeps analyzer order between languages with equal scores
+        candidates = sorted(scores, key=scores.get, reverse=True) or list(self.analyzers)
+        
+        analyzed = []
+        best_language, best_type, best_score = None, None, 0.0
+        for language in candidates:
+            error_type, match_score = self.analyzers[language].find(error_text)
+            analyzed.append(language)
+            
+            if best_language is None or (error_type is not None
+                                         and (best_type is None or match_score > best_score)):
+                best_language, best_type, best_score = language, error_type, match_score
+            if error_type is not None and match_score >= self.CONFIDENT_SCORE:
+                break
+        
+        best = self.analyzers[best_language].build_result(error_text, best_type, best_score)
+        
+        return DispatchResult(
+            language=best_language,
+            result=best,
+            scores=scores,
+            analyzed=analyzed,
+            routing_seconds=routed - start,
+            analysis_seconds=time.perf_counter() - routed
+        )
+
+
+# Example usage
+if __name__ == "__main__":
+    dispatcher = Dispatcher()
+    
+    samples = [
+        "e: /src/main/java/com/example/UserViewModel.kt: (25, 35): Type mismatch: inferred type is String? but String was expected",
+        "ERROR 1054 (42S22): Unknown column 'usernme' in 'field list'",
+        "Step 2/3 : COPY package.json .\nCOPY failed: file not found in build context",
+        "./deploy.sh: line 12: kubectl: command not found",
+    ]
+    
+    for sample in samples:
+        dispatched = dispatcher.dispatch(sample)
+        print(f"{dispatched.language}: {dispatched.result.error_type} "
+              f"(routed in {dispatched.routing_seconds * 1e6:.0f}us, tried {dispatched.analyzed})")
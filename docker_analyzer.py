@@ -1,11 +1,14 @@
 """Docker/Dockerfile language error analyzer for CCDebugger."""
 
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 
+from location_extractor import LocationExtractor
+from pattern_engine import PatternAnalyzer, Suggestion
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class DockerError:
     """Represents a Docker/Dockerfile error with analysis."""
     error_type: str
@@ -14,11 +17,12 @@ class DockerError:
     line: Optional[int] = None
     instruction: Optional[str] = None
     severity: str = "high"
-    suggestions: List[Dict[str, any]] = None
+    suggestions: Optional[Tuple[Suggestion, ...]] = None
     explanation: Optional[str] = None
+    score: float = 0.0  # Match strength in [0, 1], see scoring.py
     
 
-class DockerAnalyzer:
+class DockerAnalyzer(PatternAnalyzer):
     """Analyzer for Docker and Dockerfile errors."""
     
     # Dockerfile syntax error patterns
@@ -285,102 +289,74 @@ class DockerAnalyzer:
         }
     }
     
-    def __init__(self):
-        """Initialize the Docker analyzer."""
+    # Language code used by the log segmenter and routing
+    LANGUAGE = 'docker'
+    
+    # Banner title and code fence used by format_suggestions
+    DISPLAY_NAMES = {'en': 'Docker Error', 'zh': 'Docker 錯誤'}
+    CODE_FENCE = 'dockerfile'
+    
+    # Dockerfile path and line locations, highest priority first
+    FILE_LOCATIONS = LocationExtractor([
+        (r'(?:Dockerfile|dockerfile):(\d+)', ('line',), {'file': 'Dockerfile'}),  # Dockerfile:42
+        (r'line (\d+): .+ \(Dockerfile\)', ('line',), {'file': 'Dockerfile'}),  # line 42: error (Dockerfile)
+        (r'"([^"]+Dockerfile[^"]*)" at line (\d+)', ('file', 'line')),  # "path/Dockerfile" at line 42
+    ], re.IGNORECASE)
+    
+    # Result used when no pattern matches
+    RESULT_CLASS = DockerError
+    UNKNOWN_ERROR_TYPE = 'unknown_docker_error'
+    UNKNOWN_EXPLANATION = "This appears to be a Docker error, but doesn't match common patterns."
+    UNKNOWN_SUGGESTIONS = [
+        {
+            'title': 'Check Docker documentation',
+            'code': '# Verify Docker command syntax\ndocker --help\ndocker COMMAND --help',
+            'confidence': 0.5
+        },
+        {
+            'title': 'Enable debug logging',
+            'code': '# Run with debug output\ndocker --debug COMMAND\n\n# Or set environment variable\nexport DOCKER_BUILDKIT=1',
+            'confidence': 0.5
+        }
+    ]
+    
+    @classmethod
+    def _ordered_patterns(cls) -> Dict[str, Dict]:
+        """Merge pattern tables in matching order."""
         # Order matters for pattern matching - check more specific patterns first
         # Rearrange DOCKERFILE_PATTERNS to check invalid_from before missing_argument
         dockerfile_patterns_ordered = {
-            'invalid_instruction': self.DOCKERFILE_PATTERNS['invalid_instruction'],
-            'invalid_from': self.DOCKERFILE_PATTERNS['invalid_from'],
-            'copy_failed': self.DOCKERFILE_PATTERNS['copy_failed'],
-            'run_failed': self.DOCKERFILE_PATTERNS['run_failed'],
-            'missing_argument': self.DOCKERFILE_PATTERNS['missing_argument'],
+            'invalid_instruction': cls.DOCKERFILE_PATTERNS['invalid_instruction'],
+            'invalid_from': cls.DOCKERFILE_PATTERNS['invalid_from'],
+            'copy_failed': cls.DOCKERFILE_PATTERNS['copy_failed'],
+            'run_failed': cls.DOCKERFILE_PATTERNS['run_failed'],
+            'missing_argument': cls.DOCKERFILE_PATTERNS['missing_argument'],
         }
         
-        self.all_patterns = {
+        return {
             **dockerfile_patterns_ordered,
-            **self.COMPOSE_PATTERNS,
-            **self.NETWORK_PATTERNS,
-            **self.RUNTIME_PATTERNS
+            **cls.COMPOSE_PATTERNS,
+            **cls.NETWORK_PATTERNS,
+            **cls.RUNTIME_PATTERNS
         }
     
-    def analyze(self, error_text: str) -> Optional[DockerError]:
-        """Analyze Docker error text and return structured analysis."""
-        if not error_text:
-            return None
-            
+    def _extract_context(self, error_text: str) -> Dict[str, any]:
+        """Extract Dockerfile location and instruction information."""
         # Extract Dockerfile and line information if present
         file_info = self._extract_file_info(error_text)
         
         # Extract instruction if present
         instruction = self._extract_instruction(error_text)
         
-        # Try to match against known patterns
-        for error_type, config in self.all_patterns.items():
-            pattern = config['pattern']
-            match = re.search(pattern, error_text, re.MULTILINE | re.IGNORECASE)
-            
-            if match:
-                return DockerError(
-                    error_type=error_type,
-                    message=error_text,
-                    dockerfile_path=file_info.get('file'),
-                    line=file_info.get('line'),
-                    instruction=instruction,
-                    severity=config['severity'],
-                    suggestions=config['suggestions'],
-                    explanation=config['explanation']
-                )
-        
-        # Generic Docker error if no pattern matches
-        return DockerError(
-            error_type='unknown_docker_error',
-            message=error_text,
-            dockerfile_path=file_info.get('file'),
-            line=file_info.get('line'),
-            instruction=instruction,
-            severity='medium',
-            explanation="This appears to be a Docker error, but doesn't match common patterns.",
-            suggestions=[
-                {
-                    'title': 'Check Docker documentation',
-                    'code': '# Verify Docker command syntax\ndocker --help\ndocker COMMAND --help',
-                    'confidence': 0.5
-                },
-                {
-                    'title': 'Enable debug logging',
-                    'code': '# Run with debug output\ndocker --debug COMMAND\n\n# Or set environment variable\nexport DOCKER_BUILDKIT=1',
-                    'confidence': 0.5
-                }
-            ]
-        )
+        return {
+            'dockerfile_path': file_info.get('file'),
+            'line': file_info.get('line'),
+            'instruction': instruction,
+        }
     
     def _extract_file_info(self, error_text: str) -> Dict[str, any]:
         """Extract Dockerfile path and line number from error text."""
-        info = {}
-        
-        # Common patterns for Dockerfile:line
-        patterns = [
-            r'(?:Dockerfile|dockerfile):(\d+)',  # Dockerfile:42
-            r'line (\d+): .+ \(Dockerfile\)',    # line 42: error (Dockerfile)
-            r'"([^"]+Dockerfile[^"]*)" at line (\d+)',  # "path/Dockerfile" at line 42
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, error_text, re.IGNORECASE)
-            if match:
-                if '"' in pattern:
-                    info['file'] = match.group(1)
-                    info['line'] = int(match.group(2))
-                elif 'line' in pattern and 'Dockerfile' in pattern:
-                    info['line'] = int(match.group(1))
-                    info['file'] = 'Dockerfile'
-                else:
-                    info['file'] = 'Dockerfile'
-                    info['line'] = int(match.group(1))
-                break
-        
-        return info
+        return self.FILE_LOCATIONS.extract(error_text)
     
     def _extract_instruction(self, error_text: str) -> Optional[str]:
         """Extract the Dockerfile instruction from error text."""
@@ -395,44 +371,28 @@ class DockerAnalyzer:
     
     def format_suggestions(self, error: DockerError, language: str = 'en') -> str:
         """Format error analysis for display."""
+        header, body = self._format_blocks(error, language)
+        output = [header]
+        
         if language == 'zh':
-            output = f"🚨 Docker 錯誤 - {error.severity.upper()} 優先級\n\n"
-            output += f"錯誤類型: {error.error_type}\n"
             if error.dockerfile_path:
-                output += f"Dockerfile: {error.dockerfile_path}"
+                output.append(f"Dockerfile: {error.dockerfile_path}")
                 if error.line:
-                    output += f" (第 {error.line} 行)"
-                output += "\n"
+                    output.append(f" (第 {error.line} 行)")
+                output.append("\n")
             if error.instruction:
-                output += f"指令: {error.instruction}\n"
-            output += f"\n說明: {error.explanation}\n"
-            
-            if error.suggestions:
-                output += "\n🎯 智能建議:\n"
-                for i, suggestion in enumerate(error.suggestions, 1):
-                    output += f"\n{i}. {suggestion['title']} (信心度: {suggestion['confidence']*100:.0f}%)\n"
-                    if 'code' in suggestion:
-                        output += f"```dockerfile\n{suggestion['code']}\n```\n"
+                output.append(f"指令: {error.instruction}\n")
         else:
-            output = f"🚨 Docker Error - {error.severity.upper()} Priority\n\n"
-            output += f"Error Type: {error.error_type}\n"
             if error.dockerfile_path:
-                output += f"Dockerfile: {error.dockerfile_path}"
+                output.append(f"Dockerfile: {error.dockerfile_path}")
                 if error.line:
-                    output += f" (Line {error.line})"
-                output += "\n"
+                    output.append(f" (Line {error.line})")
+                output.append("\n")
             if error.instruction:
-                output += f"Instruction: {error.instruction}\n"
-            output += f"\nExplanation: {error.explanation}\n"
-            
-            if error.suggestions:
-                output += "\n🎯 Smart Suggestions:\n"
-                for i, suggestion in enumerate(error.suggestions, 1):
-                    output += f"\n{i}. {suggestion['title']} (Confidence: {suggestion['confidence']*100:.0f}%)\n"
-                    if 'code' in suggestion:
-                        output += f"```dockerfile\n{suggestion['code']}\n```\n"
+                output.append(f"Instruction: {error.instruction}\n")
         
-        return output
+        output.append(body)
+        return ''.join(output)
 
 
 # Example usage
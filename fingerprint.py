@@ -0,0 +1,37 @@
+"""Normalized fingerprints of error text for CCDebugger result caching."""
+
+import re
+
+# Quoted words that error patterns match on, so they are never masked
+KEPT_QUOTED_WORDS = frozenset({'EOF', 'async', 'await'})
+
+HEX_ID = re.compile(r"\b(?:0x[0-9a-f]+|[0-9a-f]{12,64})\b", re.IGNORECASE)
+QUOTED_IDENTIFIER = re.compile(r"(['\"`])([\w.$-]+)\1")
+# Directory parts of paths. Hidden directories (.circleci/, .github/) and the
+# basename are kept because patterns match on them (Dockerfile, .kt, action.yml).
+DIRECTORY = re.compile(r"(?<![\w.])(?:[\w~-][\w.~-]*/)+(?=[\w.-])")
+# Numbers, which covers line and column numbers but not N+1
+NUMBER = re.compile(r"(?<![\w+])\d+")
+
+
+def _mask_quoted(match) -> str:
+    """Mask a quoted identifier unless it is a kept word."""
+    if match.group(2) in KEPT_QUOTED_WORDS:
+        return match.group(0)
+    return match.group(1) + '?' + match.group(1)
+
+
+def fingerprint(error_text: str) -> str:
+    """Return the error text with hex ids, quoted identifiers, paths and numbers masked.
+    
+    Repeats of the same error that differ only in those parts share one
+    fingerprint, e.g. "ERROR 1054: Unknown column 'x'" and
+    "ERROR 1054: Unknown column 'user_id'".
+    """
+    error_text = HEX_ID.sub('#', error_text)
+    # Substring checks are far cheaper than a regex scan that finds nothing
+    if "'" in error_text or '"' in error_text or '`' in error_text:
+        error_text = QUOTED_IDENTIFIER.sub(_mask_quoted, error_text)
+    if '/' in error_text:
+        error_text = DIRECTORY.sub('', error_text)
+    return NUMBER.sub('0', error_text)
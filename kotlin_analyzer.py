@@ -1,11 +1,13 @@
 """Kotlin language error analyzer for CCDebugger."""
 
-import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 
+from location_extractor import LocationExtractor
+from pattern_engine import PatternAnalyzer, Suggestion
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class KotlinError:
     """Represents a Kotlin error with analysis."""
     error_type: str
@@ -13,11 +15,12 @@ class KotlinError:
     file_path: Optional[str] = None
     line: Optional[int] = None
     severity: str = "high"
-    suggestions: List[Dict[str, any]] = None
+    suggestions: Optional[Tuple[Suggestion, ...]] = None
     explanation: Optional[str] = None
+    score: float = 0.0  # Match strength in [0, 1], see scoring.py
     
 
-class KotlinAnalyzer:
+class KotlinAnalyzer(PatternAnalyzer):
     """Analyzer for Kotlin language errors."""
     
     # Common Kotlin error patterns
@@ -273,98 +276,64 @@ class KotlinAnalyzer:
         }
     }
     
-    def __init__(self):
-        """Initialize the Kotlin analyzer."""
-        self.all_patterns = {
-            **self.ERROR_PATTERNS, 
-            **self.ANDROID_PATTERNS,
-            **self.BUILD_PATTERNS
+    # Language code used by the log segmenter and routing
+    LANGUAGE = 'kotlin'
+    
+    # Banner title and code fence used by format_suggestions
+    DISPLAY_NAMES = {'en': 'Kotlin Error', 'zh': 'Kotlin 錯誤'}
+    CODE_FENCE = 'kotlin'
+    
+    # Common Kotlin error format: "File.kt:42:10: error:"
+    FILE_LOCATIONS = LocationExtractor([
+        (r'([^\s]+\.kt):(\d+):', ('file', 'line')),
+    ])
+    
+    # Result used when no pattern matches
+    RESULT_CLASS = KotlinError
+    UNKNOWN_ERROR_TYPE = 'unknown_kotlin_error'
+    UNKNOWN_EXPLANATION = "This appears to be a Kotlin error, but doesn't match common patterns."
+    
+    @classmethod
+    def _ordered_patterns(cls) -> Dict[str, Dict]:
+        """Merge pattern tables in matching order."""
+        return {
+            **cls.ERROR_PATTERNS, 
+            **cls.ANDROID_PATTERNS,
+            **cls.BUILD_PATTERNS
         }
     
-    def analyze(self, error_text: str) -> Optional[KotlinError]:
-        """Analyze Kotlin error text and return structured analysis."""
-        if not error_text:
-            return None
-            
+    def _extract_context(self, error_text: str) -> Dict[str, any]:
+        """Extract file and line information."""
         # Extract file and line information if present
         file_info = self._extract_file_info(error_text)
         
-        # Try to match against known patterns
-        for error_type, config in self.all_patterns.items():
-            pattern = config['pattern']
-            match = re.search(pattern, error_text, re.MULTILINE | re.IGNORECASE)
-            
-            if match:
-                return KotlinError(
-                    error_type=error_type,
-                    message=error_text,
-                    file_path=file_info.get('file'),
-                    line=file_info.get('line'),
-                    severity=config['severity'],
-                    suggestions=config['suggestions'],
-                    explanation=config['explanation']
-                )
-        
-        # Generic Kotlin error if no pattern matches
-        return KotlinError(
-            error_type='unknown_kotlin_error',
-            message=error_text,
-            file_path=file_info.get('file'),
-            line=file_info.get('line'),
-            severity='medium',
-            explanation="This appears to be a Kotlin error, but doesn't match common patterns."
-        )
+        return {
+            'file_path': file_info.get('file'),
+            'line': file_info.get('line'),
+        }
     
     def _extract_file_info(self, error_text: str) -> Dict[str, any]:
         """Extract file path and line number from error text."""
-        info = {}
-        
-        # Common Kotlin error format: "File.kt:42:10: error:"
-        file_pattern = r'([^\s]+\.kt):(\d+):'
-        match = re.search(file_pattern, error_text)
-        
-        if match:
-            info['file'] = match.group(1)
-            info['line'] = int(match.group(2))
-        
-        return info
+        return self.FILE_LOCATIONS.extract(error_text)
     
     def format_suggestions(self, error: KotlinError, language: str = 'en') -> str:
         """Format error analysis for display."""
-        if language == 'zh':
-            output = f"🚨 Kotlin 錯誤 - {error.severity.upper()} 優先級\n\n"
-            output += f"錯誤類型: {error.error_type}\n"
-            if error.file_path:
-                output += f"文件: {error.file_path}"
+        header, body = self._format_blocks(error, language)
+        output = [header]
+        
+        if error.file_path:
+            if language == 'zh':
+                output.append(f"文件: {error.file_path}")
                 if error.line:
-                    output += f" (第 {error.line} 行)"
-                output += "\n"
-            output += f"\n說明: {error.explanation}\n"
-            
-            if error.suggestions:
-                output += "\n🎯 智能建議:\n"
-                for i, suggestion in enumerate(error.suggestions, 1):
-                    output += f"\n{i}. {suggestion['title']} (信心度: {suggestion['confidence']*100:.0f}%)\n"
-                    if 'code' in suggestion:
-                        output += f"```kotlin\n{suggestion['code']}\n```\n"
-        else:
-            output = f"🚨 Kotlin Error - {error.severity.upper()} Priority\n\n"
-            output += f"Error Type: {error.error_type}\n"
-            if error.file_path:
-                output += f"File: {error.file_path}"
+                    output.append(f" (第 {error.line} 行)")
+            else:
+                output.append(f"File: {error.file_path}")
                 if error.line:
-                    output += f" (Line {error.line})"
-                output += "\n"
-            output += f"\nExplanation: {error.explanation}\n"
-            
-            if error.suggestions:
-                output += "\n🎯 Smart Suggestions:\n"
-                for i, suggestion in enumerate(error.suggestions, 1):
-                    output += f"\n{i}. {suggestion['title']} (Confidence: {suggestion['confidence']*100:.0f}%)\n"
-                    if 'code' in suggestion:
-                        output += f"```kotlin\n{suggestion['code']}\n```\n"
+                    output.append(f" (Line {error.line})")
+            output.append("\n")
         
-        return output
+        output.append(body)
+        return ''.join(output)
 
 
 # Example usage
@@ -0,0 +1,59 @@
+"""Shared location extraction (file, line, column) for CCDebugger analyzers."""
+
+import re
+from typing import Any, Dict, Iterable, Sequence
+
+from pattern_engine import required_literals
+
+# Fields whose captured text is converted to int
+INT_FIELDS = frozenset({'line', 'column', 'position'})
+
+
+class LocationExtractor:
+    """Extract location fields using rules checked in priority order.
+    
+    Each rule is ``(pattern, fields)`` or ``(pattern, fields, constants)``:
+    ``fields`` names the field each capture group fills, and ``constants``
+    adds fixed values such as ``{'file': 'Dockerfile'}``. The first rule
+    that matches anywhere in the text wins, as with the ordered pattern
+    lists this replaces.
+    
+    Rules are compiled once, and a rule's regex is only searched when one of
+    its required literals occurs in the lowercased text. One alternation of
+    all rules was measured too: keeping first-rule-wins priority takes an
+    anchored lookahead per rule, which loses sre's literal fast paths and
+    ran about twice as slow as the original lists.
+    """
+    
+    def __init__(self, rules: Iterable[Sequence], flags: int = 0):
+        """Compile the rules, keeping their order as priority."""
+        self.rules = []
+        for rule in rules:
+            pattern, fields = rule[0], tuple(rule[1])
+            constants = dict(rule[2]) if len(rule) > 2 else {}
+            regex = re.compile(pattern, flags)
+            if regex.groups != len(fields):
+                raise ValueError(f"Pattern {pattern!r} has {regex.groups} groups for fields {fields}")
+            self.rules.append((regex, required_literals(pattern), fields, constants))
+    
+    def extract(self, text: str) -> Dict[str, Any]:
+        """Return the fields of the first matching rule, or an empty dict."""
+        # Lowercasing only agrees with case-insensitive matching for ASCII
+        lowered = text.lower() if text.isascii() else None
+        
+        for regex, literals, fields, constants in self.rules:
+            if lowered is not None and literals is not None:
+                for literal in literals:
+                    if literal in lowered:
+                        break
+                else:
+                    continue
+            
+            match = regex.search(text)
+            if match:
+                info = dict(constants)
+                for field, value in zip(fields, match.groups()):
+                    info[field] = int(value) if field in INT_FIELDS else value
+                return info
+        
+        return {}
@@ -0,0 +1,145 @@
+"""Memory-mapped log scanning for CCDebugger analyzers."""
+
+import heapq
+import mmap
+import re
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Tuple
+
+# Newlines are counted in slices of this many bytes between hits
+COUNT_CHUNK_BYTES = 1024 * 1024
+
+
+@dataclass
+class LogHit:
+    """A pattern match found in a scanned log buffer."""
+    language: str
+    error_type: str
+    severity: str
+    offset: int  # byte offset of the match
+    end: int  # byte offset just past the match
+    line: int  # 1-based line number of the match
+    line_offset: int  # byte offset where that line starts
+
+
+class MmapLogScanner:
+    """Scan log files for analyzer patterns directly over a memory map.
+    
+    Each analyzer's patterns are compiled as bytes into one alternation that
+    only finds candidate lines, so a file is never decoded as a whole or
+    split into lines. A candidate is decoded and resolved through the
+    analyzer's ``PatternTable.find``, so its error type is the one
+    ``analyze`` gives that text. Every analyzer scans the buffer on its own,
+    so hits of different analyzers on one line do not hide each other.
+    """
+    
+    FLAGS = re.MULTILINE | re.IGNORECASE
+    
+    def __init__(self, analyzers: Iterable):
+        """Compile each analyzer's pattern table into a bytes prefilter."""
+        self.analyzers = list(analyzers)
+        self._by_language = {analyzer.LANGUAGE: analyzer for analyzer in self.analyzers}
+        self._prefilters = [
+            re.compile(b'|'.join(f"(?:{config['pattern']})".encode('utf-8')
+                                 for config in analyzer.all_patterns.values()), self.FLAGS)
+            for analyzer in self.analyzers
+        ]
+    
+    def scan(self, path: str) -> Iterator[LogHit]:
+        """Memory-map a file and yield every hit in it, in file order."""
+        with open(path, 'rb') as f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty files cannot be mapped
+                return
+            
+            with buffer:
+                yield from self.scan_buffer(buffer)
+    
+    def scan_buffer(self, buffer) -> Iterator[LogHit]:
+        """Yield every hit in a bytes-like buffer such as an mmap, in order.
+        
+        Hits at the same offset come in analyzer order.
+        """
+        scans = [self._scan_analyzer(buffer, index) for index in range(len(self.analyzers))]
+        return heapq.merge(*scans, key=lambda hit: hit.offset)
+    
+    def _scan_analyzer(self, buffer, index: int) -> Iterator[LogHit]:
+        """Yield the hits of one analyzer, at most one per candidate line."""
+        analyzer = self.analyzers[index]
+        table = analyzer.pattern_table()
+        classifications = table.classifications
+        prefilter = self._prefilters[index]
+        line = 1
+        counted_to = 0
+        position = 0
+        
+        while True:
+            candidate = prefilter.search(buffer, position)
+            if candidate is None:
+                return
+            
+            # Resolve the whole lines the candidate touches, as analyze would
+            start = buffer.rfind(b'\n', 0, candidate.start()) + 1
+            end = buffer.find(b'\n', candidate.end())
+            if end == -1:
+                end = len(buffer)
+            position = end + 1
+            
+            # surrogateescape keeps undecodable bytes one character each, so
+            # character offsets map back to exact byte offsets
+            text = buffer[start:end].decode('utf-8', 'surrogateescape')
+            found = table.find(text)
+            if found is None:
+                continue
+            error_type, match = found
+            
+            offset = start + len(text[:match.start()].encode('utf-8', 'surrogateescape'))
+            line += self._count_newlines(buffer, counted_to, offset)
+            counted_to = offset
+            yield LogHit(
+                language=analyzer.LANGUAGE,
+                error_type=error_type,
+                severity=classifications[error_type].severity,
+                offset=offset,
+                end=offset + len(match.group().encode('utf-8', 'surrogateescape')),
+                line=line,
+                line_offset=buffer.rfind(b'\n', 0, offset) + 1
+            )
+    
+    def line_text(self, buffer, hit: LogHit) -> str:
+        """Decode the full line containing a hit."""
+        end = buffer.find(b'\n', hit.end)
+        if end == -1:
+            end = len(buffer)
+        return buffer[hit.line_offset:end].decode('utf-8', errors='replace')
+    
+    def to_result(self, buffer, hit: LogHit):
+        """Analyze the line a hit was found on, giving the hit's error type and a full result."""
+        return self._by_language[hit.language].analyze(self.line_text(buffer, hit))
+    
+    @staticmethod
+    def _count_newlines(buffer, start: int, end: int) -> int:
+        """Count newlines between two offsets in bounded slices."""
+        count = 0
+        while start < end:
+            stop = min(start + COUNT_CHUNK_BYTES, end)
+            count += buffer[start:stop].count(b'\n')
+            start = stop
+        return count
+
+
+def scan_file(path: str, analyzers: Iterable) -> List[Tuple[int, int, str, str]]:
+    """Return (line, offset, language, error_type) for every hit in a file."""
+    scanner = MmapLogScanner(analyzers)
+    return [(hit.line, hit.offset, hit.language, hit.error_type) for hit in scanner.scan(path)]
+
+
+# Example usage
+if __name__ == "__main__":
+    import sys
+    from docker_analyzer import DockerAnalyzer
+    from kotlin_analyzer import KotlinAnalyzer
+    
+    for line, offset, language, error_type in scan_file(sys.argv[1], [DockerAnalyzer(), KotlinAnalyzer()]):
+        print(f"{line}:{offset}: {language} {error_type}")
@@ -0,0 +1,427 @@
+"""Streaming log segmentation and analysis for CCDebugger."""
+
+import re
+import sys
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from registry import analyzer_class
+
+# Default cap on the size of one error record, in characters
+MAX_RECORD_CHARS = 64 * 1024
+
+# Characters read at a time by read_blocks
+BLOCK_CHARS = 1024 * 1024
+
+# What loggers and CI runners put before a message, in any combination: ISO
+# or clock timestamps, bracketed tags such as "[ERROR]", and BuildKit step
+# timings such as "#7 0.123". The "^" anchors of RECORD_START and
+# RECORD_CONTEXT allow it.
+LOG_PREFIX = (
+    r"(?:(?:\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?|"
+    r"\d{2}:\d{2}:\d{2}(?:[.,]\d+)?|\[[^\]\n]*\]|#\d+ \d+\.\d+)[ \t]+)*"
+)
+
+# Lines that start a new error record, per language. Lines containing one of
+# the analyzer's required literals (see pattern_engine.required_literals)
+# start one too.
+RECORD_START = {
+    'kotlin': re.compile(
+        r"(?:^[ew]: |\.kts?:\d+:|FATAL EXCEPTION|^Exception in thread|"
+        r"^[\w.$]*(?:Exception|Error)(?::|$)|Could not resolve|Duplicate class|^FAILURE: )"
+    ),
+    'swift': re.compile(
+        r"(?:\.swift:\d+:(?:\d+:)?\s*(?:error|fatal error)|Fatal error:|^error: |"
+        r"Undefined symbols for architecture|No such module)"
+    ),
+    'docker': re.compile(
+        r"(?:Dockerfile:\d+|^(?:#\d+ )?ERROR\b|(?:COPY|ADD) failed|failed to solve|"
+        r"failed to compute cache key|returned a non-zero code|Error response from daemon|"
+        r"^docker: |^Unknown instruction|^unknown flag)"
+    ),
+    'sql': re.compile(
+        r"(?:^ERROR\b|^FATAL:|^ORA-\d+|^Msg \d+, Level|SQLSTATE|"
+        r"^(?:psql|mysql|sqlite3?): |^(?:Error|Warning): )"
+    ),
+    'shell': re.compile(
+        r"(?:^\S+: line \d+: |^\S+\.sh:\s*\d+: |^(?:ba|z|da)?sh: |command not found)"
+    ),
+    'config': re.compile(
+        r"(?:\.(?:ya?ml|json)\b.*(?:line \d+|:\d+)|^(?:yaml|json)[\w.]*(?:Error)?:|JSON\.parse|"
+        r"SyntaxError|JSON5:|error validating data|ValidationError|^Error from server|^error: error parsing)"
+    ),
+}
+
+# Lines that continue the current record (indentation, stack frames, hints)
+RECORD_CONTINUATION = {
+    'default': re.compile(r"(?:[ \t]|Caused by:|\.\.\. \d+ more|---)"),
+    'sql': re.compile(r"(?:[ \t]|LINE \d+:|DETAIL:|HINT:|CONTEXT:|QUERY:|---)"),
+    'config': re.compile(r"(?:[ \t]|could not find|expected|found|while |---)"),
+}
+
+# Progress lines worth keeping as context for the next record
+RECORD_CONTEXT = {
+    'docker': re.compile(r"^(?:Step \d+/\d+ : |#\d+ \[[^\]]*\] )"),
+}
+
+# Compiled on first use: record start regexes and regexes finding the
+# analyzer's literals in lowercased text, by language, and multiline regexes
+# finding the next line that may start a record (and, with context, set
+# one), by (language, with context)
+_record_starts: Dict[str, 're.Pattern'] = {}
+_record_literals: Dict[str, Optional['re.Pattern']] = {}
+_line_finders: Dict[Tuple[str, bool], 're.Pattern'] = {}
+
+
+def _after_log_prefix(pattern: str) -> str:
+    """Return a pattern whose line-start anchors also allow a ``LOG_PREFIX``."""
+    return re.sub(r"(?<!\[)\^", lambda _: '^' + LOG_PREFIX, pattern)
+
+
+def record_start(language: str) -> 're.Pattern':
+    """Return the ``RECORD_START`` regex of a language, allowing log prefixes."""
+    start = _record_starts.get(language)
+    if start is None:
+        start = _record_starts[language] = re.compile(_after_log_prefix(RECORD_START[language].pattern))
+    return start
+
+
+def record_literals(language: str) -> Optional['re.Pattern']:
+    """Return a regex finding the literals the language's analyzer requires, in lowercased text.
+    
+    A line containing one may be recognized by the analyzer, so it starts a
+    record like a ``RECORD_START`` line. Searching lowercased text for the
+    plain alternation is several times faster than a case-insensitive
+    search. Returns None when no pattern requires literals.
+    """
+    if language not in _record_literals:
+        literals = sorted({
+            literal
+            for alternatives in analyzer_class(language).pattern_table().literals
+            if alternatives for literal in alternatives
+        })
+        _record_literals[language] = (re.compile('|'.join(map(re.escape, literals)))
+                                      if literals else None)
+    return _record_literals[language]
+
+
+def _line_finder(language: str, context: bool = True) -> 're.Pattern':
+    """Return a regex whose matches fall on lines that may start a record by ``RECORD_START``.
+    
+    The patterns are searched unanchored over the whole text, which the regex
+    engine does faster than line by line. A match may also fall on a line
+    that starts no record, when a pattern spans a line break, but the first
+    match is never past the next line that does.
+    """
+    finder = _line_finders.get((language, context))
+    if finder is None:
+        patterns = [record_start(language).pattern]
+        if context and language in RECORD_CONTEXT:
+            patterns.append(_after_log_prefix(RECORD_CONTEXT[language].pattern))
+        finder = re.compile('|'.join(f"(?:{pattern})" for pattern in patterns), re.MULTILINE)
+        _line_finders[language, context] = finder
+    return finder
+
+
+def _candidate_search(text: str, language: str, context: bool = True) -> Callable[[int], int]:
+    """Return a function giving where the next match at or after a position starts, or -1.
+    
+    Matches are those of ``_line_finder`` in the text and of
+    ``record_literals`` in its lowercased copy. Each regex's last match is
+    kept until the position passes it, so neither scans a stretch twice.
+    """
+    searches = [(_line_finder(language, context).search, text)]
+    literals = record_literals(language)
+    if literals is not None:
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            searches.append((literals.search, lowered))
+        else:
+            # Some characters lowercase to several, so positions would shift
+            searches.append((re.compile(literals.pattern, re.IGNORECASE).search, text))
+    hits = [-2] * len(searches)
+    
+    def next_candidate(position: int) -> int:
+        best = -1
+        for index, (search, subject) in enumerate(searches):
+            hit = hits[index]
+            if -1 < hit < position or hit == -2:
+                match = search(subject, position)
+                hit = hits[index] = match.start() if match is not None else -1
+            if hit >= 0 and (best < 0 or hit < best):
+                best = hit
+        return best
+    
+    return next_candidate
+
+
+class RecordSegmenter:
+    """Incrementally split log lines into multi-line error records.
+    
+    A record starts at a line matching the language's start pattern, after
+    any log prefix, or containing a literal its analyzer requires (see
+    ``record_literals``). It takes every following continuation line. Any other line closes the record. Each
+    record is capped at ``max_record_chars`` so memory stays bounded by one
+    record, however long the log is.
+    """
+    
+    def __init__(self, language: str, max_record_chars: int = MAX_RECORD_CHARS):
+        """Initialize the segmenter for one language."""
+        if language not in RECORD_START:
+            raise ValueError(f"Unsupported language: {language}")
+        
+        self.language = language
+        self.max_record_chars = max_record_chars
+        self._start = record_start(language)
+        self._literals = record_literals(language)
+        self._continuation = RECORD_CONTINUATION.get(language, RECORD_CONTINUATION['default'])
+        self._context = (re.compile(_after_log_prefix(RECORD_CONTEXT[language].pattern))
+                         if language in RECORD_CONTEXT else None)
+        
+        self._lines: List[str] = []
+        self._size = 0
+        self._context_line: Optional[str] = None
+        self._in_partial_line = False
+    
+    def feed(self, line: str) -> Optional[str]:
+        """Consume one line and return the record it closes, if any.
+        
+        Lines without a trailing newline are treated as the first part of a
+        longer line; the following parts are appended to it.
+        """
+        partial = self._in_partial_line
+        self._in_partial_line = not line.endswith('\n')
+        text = line.rstrip('\r\n')
+        
+        if partial:
+            if self._lines:
+                self._append(text, new_line=False)
+            return None
+        
+        if self._lines and self._continuation.match(text):
+            self._append(text)
+            return None
+        
+        if self._start.search(text) or (self._literals is not None
+                                         and self._literals.search(text.lower())):
+            closed = self._emit()
+            if self._context_line is not None:
+                self._append(self._context_line)
+                self._context_line = None
+            self._append(text)
+            return closed
+        
+        if self._context is not None and self._context.search(text):
+            self._context_line = text[:self.max_record_chars]
+        
+        return self._emit()
+    
+    @property
+    def in_record(self) -> bool:
+        """Return whether a record is open, so the next line may continue or close it."""
+        return bool(self._lines)
+    
+    def close(self) -> Optional[str]:
+        """Return the record still open at the end of the stream, if any."""
+        self._in_partial_line = False
+        return self._emit()
+    
+    def _append(self, text: str, new_line: bool = True) -> None:
+        """Add text to the current record without exceeding the size cap."""
+        room = self.max_record_chars - self._size
+        if room <= 0:
+            return
+        
+        text = text[:room]
+        if new_line:
+            self._lines.append(text)
+        else:
+            self._lines[-1] += text
+        self._size += len(text) + new_line
+    
+    def _emit(self) -> Optional[str]:
+        """Close the current record and return its text."""
+        if not self._lines:
+            return None
+        
+        record = '\n'.join(self._lines)
+        self._lines = []
+        self._size = 0
+        return record
+
+
+def read_lines(stream: TextIO, max_line_chars: int = MAX_RECORD_CHARS) -> Iterator[str]:
+    """Yield lines from a text stream, splitting lines longer than the limit."""
+    readline = stream.readline
+    while True:
+        line = readline(max_line_chars)
+        if not line:
+            return
+        yield line
+
+
+def iter_records(lines: Iterable[str], language: str,
+                 max_record_chars: int = MAX_RECORD_CHARS) -> Iterator[str]:
+    """Lazily split an iterable of log lines into error records."""
+    segmenter = RecordSegmenter(language, max_record_chars)
+    feed = segmenter.feed
+    
+    for line in lines:
+        record = feed(line)
+        if record is not None:
+            yield record
+    
+    record = segmenter.close()
+    if record is not None:
+        yield record
+
+
+def read_blocks(stream: TextIO, block_chars: int = BLOCK_CHARS) -> Iterator[str]:
+    """Yield a text stream in blocks of whole lines, each about ``block_chars`` long.
+    
+    A line longer than a block is yielded in pieces without a trailing
+    newline, the way ``read_lines`` splits long lines.
+    """
+    read = stream.read
+    rest = ''
+    while True:
+        data = read(block_chars)
+        if not data:
+            break
+        
+        data = rest + data
+        cut = data.rfind('\n') + 1
+        if cut:
+            rest = data[cut:]
+            yield data[:cut]
+        else:
+            rest = ''
+            yield data
+    
+    if rest:
+        yield rest
+
+
+def iter_text_records(text: str, language: str,
+                      max_record_chars: int = MAX_RECORD_CHARS) -> Iterator[str]:
+    """Split a whole log held in memory into error records.
+    
+    Gives the records ``iter_records`` gives for the lines of the same text
+    read from a file. Between records, one multiline regex search skips to the
+    next line that may start one, so lines that matter to no record never
+    reach Python code.
+    """
+    return iter_block_records((text,), language, max_record_chars)
+
+
+def iter_block_records(blocks: Iterable[str], language: str,
+                       max_record_chars: int = MAX_RECORD_CHARS) -> Iterator[str]:
+    """Split a log given in blocks of whole lines, as ``read_blocks`` yields them, into records.
+    
+    Works like ``iter_text_records`` on the joined text while holding only
+    one block and the open record in memory.
+    """
+    segmenter = RecordSegmenter(language, max_record_chars)
+    feed = segmenter.feed
+    partial = False
+    
+    for text in blocks:
+        if '\r' in text:
+            # Universal newlines, as when reading the file in text mode
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        position, size = 0, len(text)
+        next_candidate = _candidate_search(text, language)
+        
+        while position < size:
+            # The rest of a line split across blocks is fed before skipping ahead
+            if not partial and not segmenter.in_record:
+                candidate = next_candidate(position)
+                if candidate >= 0:
+                    position = text.rfind('\n', 0, candidate) + 1
+                elif text.endswith('\n'):
+                    break
+                else:
+                    # The unfinished last line is fed, so the next block continues it
+                    position = text.rfind('\n') + 1
+            partial = False
+            
+            end = text.find('\n', position)
+            end = size if end < 0 else end + 1
+            record = feed(text[position:end])
+            if record is not None:
+                yield record
+            position = end
+        
+        partial = not text.endswith('\n')
+    
+    record = segmenter.close()
+    if record is not None:
+        yield record
+
+
+def count_record_starts(text: str, language: str) -> int:
+    """Count the lines of a text that may start a record, e.g. to guess its language.
+    
+    A cheap estimate from regex scans that resume at the next line after
+    each hit, so a line is counted once however many start patterns and
+    literals it contains. A pattern matching across a line break may still
+    count a line that starts no record.
+    """
+    next_candidate = _candidate_search(text, language, context=False)
+    count, position = 0, 0
+    while True:
+        candidate = next_candidate(position)
+        if candidate < 0:
+            return count
+        count += 1
+        position = text.find('\n', candidate) + 1
+        if not position:
+            return count
+
+
+def analyze_stream(lines: Iterable[str], analyzer, language: Optional[str] = None,
+                   max_record_chars: int = MAX_RECORD_CHARS) -> Iterator:
+    """Lazily analyze each error record found in a stream of log lines.
+    
+    The language defaults to the analyzer's own, so a ``KotlinAnalyzer``
+    yields ``KotlinError`` results for Gradle output, and so on.
+    """
+    analyze = analyzer.analyze
+    for record in iter_records(lines, language or analyzer.LANGUAGE, max_record_chars):
+        yield analyze(record)
+
+
+@contextmanager
+def open_log(path: str):
+    """Open a log file for streaming, or stdin when the path is '-'."""
+    if path == '-':
+        yield sys.stdin
+        return
+    
+    with open(path, encoding='utf-8', errors='replace') as stream:
+        yield stream
+
+
+def analyze_file(path: str, analyzer, language: Optional[str] = None,
+                 max_record_chars: int = MAX_RECORD_CHARS) -> Iterator:
+    """Lazily analyze the error records of a log file, or stdin when the path is '-'."""
+    with open_log(path) as stream:
+        yield from analyze_stream(read_lines(stream, max_record_chars), analyzer,
+                                  language, max_record_chars)
+
+
+# Example usage
+if __name__ == "__main__":
+    from docker_analyzer import DockerAnalyzer
+    
+    build_log = [
+        "Step 1/4 : FROM node:16-alpine\n",
+        " ---> 3a2b1c0d9e8f\n",
+        "Step 2/4 : COPY package.json .\n",
+        "COPY failed: file not found in build context: package.json\n",
+        "Step 3/4 : RUN npm install\n",
+        "The command '/bin/sh -c npm install' returned a non-zero code: 1\n",
+    ]
+    
+    for result in analyze_stream(build_log, DockerAnalyzer()):
+        print(f"{result.error_type}: {result.instruction}")
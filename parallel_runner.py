@@ -0,0 +1,203 @@
+"""Multi-process parallel analysis for CCDebugger analyzers."""
+
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice, repeat
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from aggregation import ResultAggregate
+from dispatcher import Dispatcher
+from log_stream import analyze_file
+from pattern_engine import result_to_dict
+from registry import ANALYZERS, get_analyzer
+
+# Texts sent to a worker per task
+DEFAULT_CHUNKSIZE = 512
+
+# Analyzers of the current worker process, built once by _init_worker
+_worker_analyzers: Dict[str, object] = {}
+_worker_dispatcher: Optional[Dispatcher] = None
+
+
+def _init_worker(languages: Tuple[str, ...]) -> None:
+    """Build the analyzers of a worker process."""
+    for language in languages:
+        _worker_analyzers[language] = get_analyzer(language)
+
+
+def _to_data(result) -> Optional[dict]:
+    """Convert an analyzer result into plain data that pickles cheaply.
+    
+    This equals ``dataclasses.asdict(result)``, without ``asdict``'s generic
+    recursive copy, which costs more than the analysis itself.
+    """
+    return result_to_dict(result) if result is not None else None
+
+
+def _analyze_chunk(language: str, texts: List[str]) -> List[Optional[dict]]:
+    """Analyze one chunk of texts in a worker."""
+    return [_to_data(result) for result in _worker_analyzers[language].analyze_many(texts)]
+
+
+def _analyze_mixed_chunk(tasks: List[Tuple[str, str]]) -> List[Optional[dict]]:
+    """Analyze one chunk of (language, text) pairs in a worker."""
+    analyzers = _worker_analyzers
+    return [_to_data(analyzers[language].analyze(text)) for language, text in tasks]
+
+
+def _analyze_one(language: Optional[str], text: str) -> Tuple[Optional[str], Optional[dict]]:
+    """Analyze one text in a worker, routing it first when no language is given."""
+    global _worker_dispatcher
+    if language is not None:
+        return language, _to_data(_worker_analyzers[language].analyze(text))
+    
+    if _worker_dispatcher is None:
+        _worker_dispatcher = Dispatcher(_worker_analyzers.values())
+    dispatched = _worker_dispatcher.dispatch(text)
+    if dispatched is None:
+        return None, None
+    return dispatched.language, _to_data(dispatched.result)
+
+
+def _analyze_pairs(tasks: List[Tuple[Optional[str], str]]) -> List[Tuple[Optional[str], Optional[dict]]]:
+    """Analyze a chunk of (language, text) pairs in a worker, routing those without one."""
+    return [_analyze_one(language, text) for language, text in tasks]
+
+
+def _aggregate_chunk(language: str, texts: List[str]) -> ResultAggregate:
+    """Analyze one chunk of texts in a worker and return only their counts."""
+    return ResultAggregate().update(_worker_analyzers[language].analyze_many(texts), language)
+
+
+def _analyze_log(language: str, path: str) -> List[Optional[dict]]:
+    """Analyze every error record of one log file in a worker."""
+    return [_to_data(result) for result in analyze_file(path, _worker_analyzers[language])]
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    """Split an iterable into lists of at most ``size`` items."""
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class ParallelRunner:
+    """Spread analysis over a pool of worker processes.
+    
+    Every worker builds its analyzers once when it starts, so tasks only carry
+    the texts. Results come back in input order as plain dictionaries, the
+    ``dataclasses.asdict`` form of ``SQLError``, ``ShellError`` and the others.
+    Texts are sent in chunks of ``chunksize`` to keep pickling and scheduling
+    overhead small next to the matching work.
+    """
+    
+    def __init__(self, languages: Optional[Iterable[str]] = None,
+                 workers: Optional[int] = None, chunksize: int = DEFAULT_CHUNKSIZE):
+        """Start the worker pool for the given languages (all by default)."""
+        self.languages = tuple(languages) if languages is not None else tuple(ANALYZERS)
+        for language in self.languages:
+            if language not in ANALYZERS:
+                raise ValueError(f"Unsupported language: {language}")
+        if chunksize < 1:
+            raise ValueError("chunksize must be at least 1")
+        
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.languages,)
+        )
+    
+    def analyze_many(self, language: str, texts: Iterable[str]) -> List[Optional[dict]]:
+        """Analyze error texts of one language and return results in input order."""
+        self._check_language(language)
+        results = []
+        for chunk_results in self._executor.map(_analyze_chunk, repeat(language),
+                                                _chunks(texts, self.chunksize)):
+            results.extend(chunk_results)
+        return results
+    
+    def analyze_mixed(self, tasks: Iterable[Tuple[str, str]]) -> List[Optional[dict]]:
+        """Analyze (language, text) pairs and return results in input order."""
+        tasks = list(tasks)
+        for language in {language for language, _ in tasks}:
+            self._check_language(language)
+        
+        results = []
+        for chunk_results in self._executor.map(_analyze_mixed_chunk,
+                                                _chunks(tasks, self.chunksize)):
+            results.extend(chunk_results)
+        return results
+    
+    def submit(self, language: Optional[str], text: str) -> Future:
+        """Schedule one text and return a future of its (language, result) pair.
+        
+        With ``language=None`` the worker routes the text with a ``Dispatcher``
+        over the runner's languages, and the pair names the language it chose.
+        """
+        if language is not None:
+            self._check_language(language)
+        return self._executor.submit(_analyze_one, language, text)
+    
+    def submit_many(self, tasks: Iterable[Tuple[Optional[str], str]]) -> Future:
+        """Schedule (language, text) pairs as one task and return a future of their pairs.
+        
+        Like ``submit``, a language of None routes the text in the worker.
+        """
+        tasks = list(tasks)
+        for language in {language for language, _ in tasks if language is not None}:
+            self._check_language(language)
+        return self._executor.submit(_analyze_pairs, tasks)
+    
+    def aggregate(self, language: str, texts: Iterable[str]) -> ResultAggregate:
+        """Analyze error texts of one language and return the counts of their results.
+        
+        Each worker counts its own chunk, so only the partial aggregates come
+        back to be merged, not one result per text.
+        """
+        self._check_language(language)
+        aggregate = ResultAggregate()
+        for partial in self._executor.map(_aggregate_chunk, repeat(language),
+                                          _chunks(texts, self.chunksize)):
+            aggregate.merge(partial)
+        return aggregate
+    
+    def analyze_logs(self, language: str, paths: Iterable[str]) -> List[List[Optional[dict]]]:
+        """Analyze log files, one per task, and return their results in path order."""
+        self._check_language(language)
+        return list(self._executor.map(_analyze_log, repeat(language), paths))
+    
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        self._executor.shutdown()
+    
+    def __enter__(self):
+        """Use the runner as a context manager that closes the pool."""
+        return self
+    
+    def __exit__(self, *exc_info):
+        """Shut down the worker pool on leaving the context."""
+        self.close()
+    
+    def _check_language(self, language: str) -> None:
+        """Reject languages the workers were not started with."""
+        if language not in self.languages:
+            raise ValueError(f"Runner has no analyzer for language: {language}")
+
+
+# Example usage
+if __name__ == "__main__":
+    texts = [
+        "ERROR 1054 (42S22): Unknown column 'usernme' in 'field list'",
+        "ERROR: relation \"users\" does not exist",
+        "ERROR 1064 (42000): You have an error in your SQL syntax",
+    ] * 1000
+    
+    with ParallelRunner(['sql'], workers=2) as runner:
+        results = runner.analyze_many('sql', texts)
+    
+    print(f"{len(results)} results, first: {results[0]['error_type']}")
@@ -0,0 +1,90 @@
+"""Opt-in on-disk cache of pattern table preparation for faster cold starts.
+
+Set ``CCDEBUGGER_PATTERN_CACHE`` to a directory to enable it. Each entry is
+stored under a hash of the regexes it was derived from, their flags and the
+Python version, so editing a pattern or upgrading Python simply misses and
+writes a new file. Entries are JSON holding their own key, so reading one
+never runs code; unreadable files, corrupt or unexpected content count as
+misses and write failures are ignored.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from typing import Any, Iterable, Optional, Tuple
+
+CACHE_ENV = 'CCDEBUGGER_PATTERN_CACHE'
+
+# Bump when the layout of stored entries changes
+CACHE_VERSION = 2
+
+# Required literals of every pattern of a table, None where a pattern has none
+Literals = Tuple[Optional[Tuple[str, ...]], ...]
+
+
+def cache_dir() -> Optional[str]:
+    """Return the cache directory, or None when caching is disabled."""
+    return os.environ.get(CACHE_ENV) or None
+
+
+def table_key(regexes: Iterable[str], flags: int) -> str:
+    """Return a hash identifying an ordered list of regexes compiled with the given flags."""
+    source = '\0'.join((str(CACHE_VERSION), sys.version, str(flags), *regexes))
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+def _path(directory: str, key: str) -> str:
+    """Return the file holding one cache entry."""
+    return os.path.join(directory, f'patterns-{key[:32]}.json')
+
+
+def _to_literals(value: Any) -> Literals:
+    """Turn a decoded entry back into tuples, raising ValueError for any other shape."""
+    if not isinstance(value, list):
+        raise ValueError("entry is not a list")
+    
+    literals = []
+    for item in value:
+        if item is None:
+            literals.append(None)
+        elif isinstance(item, list) and all(isinstance(literal, str) for literal in item):
+            literals.append(tuple(item))
+        else:
+            raise ValueError("entry item is not a list of strings")
+    return tuple(literals)
+
+
+def load(key: str) -> Optional[Literals]:
+    """Return the cached literals for a key, or None."""
+    directory = cache_dir()
+    if directory is None:
+        return None
+    try:
+        with open(_path(directory, key), encoding='utf-8') as f:
+            entry = json.load(f)
+        if entry['key'] != key:
+            return None
+        return _to_literals(entry['literals'])
+    except (OSError, ValueError, TypeError, KeyError):
+        return None
+
+
+def store(key: str, literals: Literals) -> None:
+    """Write an entry atomically, so concurrent processes never read half a file."""
+    directory = cache_dir()
+    if directory is None:
+        return
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'key': key, 'literals': literals}, f)
+            os.replace(temp_path, _path(directory, key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+    except OSError:
+        pass
@@ -0,0 +1,568 @@
+"""Shared pattern-matching engine for CCDebugger language analyzers."""
+
+import re
+from dataclasses import dataclass, fields
+from typing import Any, Callable, ClassVar, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import pattern_cache
+import scoring
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+PATTERN_FLAGS = re.MULTILINE | re.IGNORECASE
+
+
+@dataclass(frozen=True, slots=True)
+class Suggestion:
+    """An immutable suggested fix, readable like the suggestion dicts it replaces.
+    
+    ``suggestion['title']`` and ``'code' in suggestion`` keep working, so
+    formatting code and callers written against dicts need no changes.
+    """
+    title: str
+    code: Optional[str] = None
+    confidence: float = 0.0
+    
+    KEYS: ClassVar[Tuple[str, ...]] = ('title', 'code', 'confidence')
+    
+    def __getitem__(self, key: str) -> Any:
+        """Return a field by name, raising KeyError like a dict for unset fields."""
+        if key in self.KEYS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+    
+    def __contains__(self, key: str) -> bool:
+        """Return whether a field is set."""
+        return key in self.KEYS and getattr(self, key) is not None
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field by name, or the default when it is unset."""
+        return self[key] if key in self else default
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the suggestion as a plain dict of its set fields."""
+        return {key: getattr(self, key) for key in self.KEYS if key in self}
+
+
+def freeze_suggestions(suggestions: Optional[Iterable]) -> Optional[Tuple[Suggestion, ...]]:
+    """Convert a list of suggestion dicts into a tuple of Suggestion records."""
+    if suggestions is None:
+        return None
+    return tuple(
+        suggestion if isinstance(suggestion, Suggestion) else Suggestion(**suggestion)
+        for suggestion in suggestions
+    )
+
+
+class Classification(NamedTuple):
+    """Error type and severity of a text, without location or suggestions."""
+    error_type: str
+    severity: str
+
+
+def result_to_dict(result) -> Dict[str, Any]:
+    """Return an analyzer result as plain dicts and lists, e.g. for JSON or pickling."""
+    data = {field.name: getattr(result, field.name) for field in fields(result)}
+    if data.get('suggestions') is not None:
+        data['suggestions'] = [suggestion.to_dict() for suggestion in data['suggestions']]
+    return data
+
+
+def _literal_alternatives(items) -> Optional[Set[str]]:
+    """Return literals of which at least one must occur for a parsed pattern to match."""
+    candidates = []
+    run = []
+    
+    def end_run():
+        if run:
+            candidates.append({''.join(run).lower()})
+            run.clear()
+    
+    for op, arg in items:
+        if op is sre_constants.LITERAL:
+            run.append(chr(arg))
+            continue
+        
+        end_run()
+        if op is sre_constants.SUBPATTERN:
+            literals = _literal_alternatives(arg[-1])
+            if literals:
+                candidates.append(literals)
+        elif op is sre_constants.BRANCH:
+            branches = [_literal_alternatives(branch) for branch in arg[1]]
+            if all(branches):
+                candidates.append(set().union(*branches))
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT) and arg[0] >= 1:
+            literals = _literal_alternatives(arg[2])
+            if literals:
+                candidates.append(literals)
+    end_run()
+    
+    if not candidates:
+        return None
+    # The set whose shortest literal is longest rejects the most text
+    return max(candidates, key=lambda literals: (min(map(len, literals)), -len(literals)))
+
+
+def required_literals(pattern: str) -> Optional[Tuple[str, ...]]:
+    """Return lowercase literals of which one must occur for the pattern to match.
+    
+    Returns None when no such set exists, or when a literal is not ASCII and
+    lowercasing could disagree with the regex's case-insensitive matching.
+    """
+    literals = _literal_alternatives(sre_parse.parse(pattern, PATTERN_FLAGS))
+    if not literals or not all(literal.isascii() for literal in literals):
+        return None
+    
+    # A literal containing another one adds nothing to the check
+    return tuple(sorted(
+        literal for literal in literals
+        if not any(other != literal and other in literal for other in literals)
+    ))
+
+
+class PatternTable:
+    """Ordered error patterns, each compiled once and checked in priority order.
+    
+    Every pattern carries the literals it requires (see ``required_literals``).
+    A regex is only searched when one of its literals occurs in the lowercased
+    text, so text that matches nothing is rejected with substring checks alone.
+    
+    Regexes are compiled on first search, so a short-lived process pays only
+    for the patterns its texts get past the literal check. Finding the
+    literals parses every pattern; with ``pattern_cache`` enabled that result
+    is read from disk instead, which leaves construction cheap.
+    """
+    
+    FLAGS = PATTERN_FLAGS
+    
+    def __init__(self, patterns: Dict[str, Dict[str, Any]]):
+        """Compile patterns, keeping their insertion order as match priority.
+        
+        Suggestion lists are frozen into tuples of ``Suggestion`` records, so
+        results can share them without one caller's changes reaching another.
+        """
+        self.patterns = {
+            error_type: {**config, 'suggestions': freeze_suggestions(config.get('suggestions'))}
+            for error_type, config in patterns.items()
+        }
+        self.error_types = tuple(patterns)
+        
+        self.classifications = {
+            error_type: Classification(error_type, config.get('severity'))
+            for error_type, config in patterns.items()
+        }
+        # Confidence of each pattern's best suggestion, the prior of its scores
+        self.confidences = {
+            error_type: max((suggestion.confidence for suggestion in config['suggestions'] or ()),
+                            default=0.0)
+            for error_type, config in self.patterns.items()
+        }
+        self.literals = self._prepared_literals(patterns)
+        
+        # Separate searches with early exit beat a single combined alternation
+        # here: sre keeps its per-pattern literal fast paths, while a combined
+        # scan must try every alternative at every position.
+        self._entries = tuple(
+            (error_type, self._lazy_search(index), literals)
+            for index, (error_type, literals) in enumerate(zip(self.error_types, self.literals))
+        )
+        self._indexes = {error_type: index for index, error_type in enumerate(self.error_types)}
+    
+    def _prepared_literals(self, patterns: Dict[str, Dict[str, Any]]) -> Tuple[Optional[Tuple[str, ...]], ...]:
+        """Return the required literals of every pattern, from the disk cache when enabled."""
+        regexes = [config['pattern'] for config in patterns.values()]
+        key = pattern_cache.table_key(regexes, self.FLAGS) if pattern_cache.cache_dir() else None
+        if key is not None:
+            literals = pattern_cache.load(key)
+            if literals is not None and len(literals) == len(regexes):
+                return literals
+        
+        literals = tuple(required_literals(regex) for regex in regexes)
+        if key is not None:
+            pattern_cache.store(key, literals)
+        return literals
+    
+    def _lazy_search(self, index: int) -> Callable[[str], Optional[re.Match]]:
+        """Return a search that compiles the regex and replaces itself on first call."""
+        def search(text: str) -> Optional[re.Match]:
+            error_type, _, literals = self._entries[index]
+            regex = re.compile(self.patterns[error_type]['pattern'], self.FLAGS)
+            entries = list(self._entries)
+            entries[index] = (error_type, regex.search, literals)
+            self._entries = tuple(entries)
+            return regex.search(text)
+        return search
+    
+    def match(self, error_text: str) -> Optional[str]:
+        """Return the highest-priority error type matching anywhere in the text."""
+        found = self.find(error_text)
+        return found[0] if found is not None else None
+    
+    def find(self, error_text: str) -> Optional[Tuple[str, re.Match]]:
+        """Return the highest-priority matching error type with its match, for scoring."""
+        # Lowercasing only agrees with IGNORECASE for ASCII; other text is
+        # searched with every regex
+        lowered = error_text.lower() if error_text.isascii() else None
+        
+        for error_type, search, literals in self._entries:
+            if lowered is not None and literals is not None:
+                for literal in literals:
+                    if literal in lowered:
+                        break
+                else:
+                    continue
+            
+            match = search(error_text)
+            if match:
+                return error_type, match
+        
+        return None
+    
+    def find_scored(self, error_text: str) -> Tuple[Optional[str], float]:
+        """Return the highest-priority matching error type and its ``scoring.match_score``.
+        
+        Text matching nothing gives (None, 0.0).
+        """
+        found = self.find(error_text)
+        if found is None:
+            return None, 0.0
+        error_type, match = found
+        return error_type, scoring.match_score(self.confidences[error_type], match, error_text)
+    
+    def score(self, error_type: str, error_text: str) -> Optional[float]:
+        """Return the ``scoring.match_score`` of one error type's pattern in the text.
+        
+        Searches that pattern alone, e.g. to score a classification found in
+        a cache. Returns None when it does not match.
+        """
+        match = self._entries[self._indexes[error_type]][1](error_text)
+        if match is None:
+            return None
+        return scoring.match_score(self.confidences[error_type], match, error_text)
+    
+    def match_all(self, error_text: str) -> List[str]:
+        """Return every error type matching the text, best first.
+        
+        All patterns go through the same literal check as ``match``, without
+        stopping at the first hit, so only candidates are searched. Matches
+        are ranked by ``scoring.match_score`` (how much of the text each
+        covers, where and with what confidence), then by table priority.
+        """
+        return [error_type for error_type, _, _ in self.find_all(error_text)]
+    
+    def find_all(self, error_text: str) -> List[Tuple[str, re.Match, float]]:
+        """Return every matching error type with its match and match score, ranked as in ``match_all``."""
+        lowered = error_text.lower() if error_text.isascii() else None
+        confidences = self.confidences
+        match_score = scoring.match_score
+        found = []
+        
+        for priority, (error_type, search, literals) in enumerate(self._entries):
+            if lowered is not None and literals is not None:
+                for literal in literals:
+                    if literal in lowered:
+                        break
+                else:
+                    continue
+            
+            match = search(error_text)
+            if match:
+                found.append((-match_score(confidences[error_type], match, error_text),
+                              priority, error_type, match))
+        
+        found.sort(key=lambda entry: entry[:2])
+        return [(error_type, match, -score) for score, _, error_type, match in found]
+
+
+class PatternAnalyzer:
+    """Base class for analyzers that match error text against pattern tables.
+    
+    Subclasses declare their ``*_PATTERNS`` tables, the order they are merged
+    in, the result dataclass and the extractors that fill its location fields.
+    The merged table is compiled once per class and shared by all instances.
+    An optional ``ResultCache`` skips the pattern scan for texts whose
+    fingerprint was classified before.
+    """
+    
+    LANGUAGE: Optional[str] = None
+    RESULT_CLASS = None
+    UNKNOWN_ERROR_TYPE = 'unknown_error'
+    UNKNOWN_EXPLANATION = "This appears to be an error, but doesn't match common patterns."
+    UNKNOWN_SUGGESTIONS: Optional[List[Dict[str, Any]]] = None
+    
+    # Banner title per display language and code fence used by format_suggestions
+    DISPLAY_NAMES: Dict[str, str] = {'en': 'Error', 'zh': '錯誤'}
+    CODE_FENCE = ''
+    
+    def __init__(self, cache=None):
+        """Initialize the analyzer with its class-wide pattern table and optional cache."""
+        self._table = self.pattern_table()
+        self.all_patterns = self._table.patterns
+        self.cache = cache
+        self._unknown_classification = Classification(self.UNKNOWN_ERROR_TYPE, 'medium')
+        self._formatted: Dict[Tuple[str, str], tuple] = {}
+    
+    @classmethod
+    def pattern_table(cls) -> PatternTable:
+        """Return the compiled pattern table, building it on first use."""
+        # Look in the class's own namespace so subclasses never share a table
+        table = cls.__dict__.get('_pattern_table')
+        if table is None:
+            table = PatternTable(cls._ordered_patterns())
+            cls._pattern_table = table
+        return table
+    
+    @classmethod
+    def unknown_suggestions(cls) -> Optional[Tuple[Suggestion, ...]]:
+        """Return the frozen suggestions of the generic result, building them on first use."""
+        if '_unknown_suggestions' not in cls.__dict__:
+            cls._unknown_suggestions = freeze_suggestions(cls.UNKNOWN_SUGGESTIONS)
+        return cls._unknown_suggestions
+    
+    @classmethod
+    def _ordered_patterns(cls) -> Dict[str, Dict[str, Any]]:
+        """Merge the pattern tables in matching order."""
+        raise NotImplementedError
+    
+    def analyze(self, error_text: str):
+        """Analyze error text and return structured analysis."""
+        if not error_text:
+            return None
+        
+        error_type, match_score = self.find(error_text)
+        return self.build_result(error_text, error_type, match_score)
+    
+    def find(self, error_text: str) -> Tuple[Optional[str], float]:
+        """Return the matching error type and its match score, through the cache when there is one.
+        
+        The match score is ``scoring.match_score``, the part of a result's
+        score that does not depend on context. Text matching nothing gives
+        (None, 0.0).
+        """
+        if self.cache is not None:
+            return self.cache.find(self, error_text)
+        return self._table.find_scored(error_text)
+    
+    def build_result(self, error_text: str, error_type: Optional[str], match_score: float = 0.0):
+        """Build the full result for a classification made by ``find``.
+        
+        Context always comes from this text, so cached classifications still
+        get their own file and line information.
+        """
+        return self._make_result(error_type, error_text, self._extract_context(error_text),
+                                 match_score)
+    
+    def analyze_all(self, error_text: str) -> List[Any]:
+        """Return a result for every pattern the text matches, most specific first.
+        
+        ``analyze`` stops at the highest-priority pattern; a record holding
+        several problems gets them all here, ranked by score as in
+        ``PatternTable.match_all``. Context is extracted once and shared.
+        Text matching nothing gets the generic result alone. The result
+        cache is not used, since it only knows the first match.
+        """
+        if not error_text:
+            return []
+        
+        context = self._extract_context(error_text)
+        found = self._table.find_all(error_text)
+        if not found:
+            return [self._make_result(None, error_text, context)]
+        return [
+            self._make_result(error_type, error_text, context, match_score)
+            for error_type, _, match_score in found
+        ]
+    
+    def classify(self, error_text: str) -> Optional[Classification]:
+        """Return only the error type and severity, skipping all context extraction."""
+        if not error_text:
+            return None
+        
+        error_type = self._match(error_text)
+        if error_type:
+            return self._table.classifications[error_type]
+        return self._unknown_classification
+    
+    def analyze_lazy(self, error_text: str) -> Optional['LazyResult']:
+        """Classify error text now and extract its location fields on first access."""
+        if not error_text:
+            return None
+        error_type, match_score = self.find(error_text)
+        return LazyResult(self, error_type, error_text, match_score)
+    
+    def analyze_many(self, texts: Iterable[str]) -> List[Any]:
+        """Analyze a batch of error texts and return results in input order.
+        
+        Each distinct text is extracted and matched once; repeats in the batch
+        share the first result, which is safe because results are immutable.
+        """
+        analyze = self.analyze
+        analyzed = {}
+        results = []
+        append = results.append
+        
+        for text in texts:
+            if text in analyzed:
+                result = analyzed[text]
+            else:
+                result = analyzed[text] = analyze(text)
+            append(result)
+        
+        return results
+    
+    def _match(self, error_text: str) -> Optional[str]:
+        """Return the matching error type, through the cache when there is one."""
+        if self.cache is not None:
+            return self.cache.classify(self, error_text)
+        return self._table.match(error_text)
+    
+    def _make_result(self, error_type: Optional[str], error_text: str, context: Dict[str, Any],
+                     match_score: float = 0.0):
+        """Build the result for a matched error type, or the generic result for None."""
+        if error_type:
+            config = self.all_patterns[error_type]
+            return self.RESULT_CLASS(
+                error_type=error_type,
+                message=error_text,
+                severity=config['severity'],
+                suggestions=config['suggestions'],
+                explanation=config['explanation'],
+                score=scoring.score(match_score, context),
+                **context
+            )
+        
+        # Generic error if no pattern matches
+        return self.RESULT_CLASS(
+            error_type=self.UNKNOWN_ERROR_TYPE,
+            message=error_text,
+            severity='medium',
+            explanation=self.UNKNOWN_EXPLANATION,
+            suggestions=self.unknown_suggestions(),
+            **context
+        )
+    
+    def _extract_context(self, error_text: str) -> Dict[str, Any]:
+        """Extract the result fields that do not depend on the matched pattern."""
+        return {}
+    
+    def _format_blocks(self, error, language: str) -> Tuple[str, str]:
+        """Return the rendered header and body of an error for format_suggestions.
+        
+        Both depend only on the error type, severity, explanation and
+        suggestions, so they are rendered once per error type and language;
+        format_suggestions splices the location lines in between.
+        """
+        language = 'zh' if language == 'zh' else 'en'
+        key = (error.error_type, language)
+        entry = self._formatted.get(key)
+        
+        # Results built outside this analyzer may carry other text for the
+        # same error type; render those afresh
+        if (entry is None or entry[0] != error.severity
+                or entry[1] is not error.explanation or entry[2] is not error.suggestions):
+            entry = (error.severity, error.explanation, error.suggestions,
+                     *self._render_blocks(error, language))
+            self._formatted[key] = entry
+        
+        return entry[3], entry[4]
+    
+    def _render_blocks(self, error, language: str) -> Tuple[str, str]:
+        """Render the header and body of an error in one display language."""
+        title = self.DISPLAY_NAMES[language]
+        severity = error.severity.upper()
+        fence = self.CODE_FENCE
+        
+        if language == 'zh':
+            header = f"🚨 {title} - {severity} 優先級\n\n錯誤類型: {error.error_type}\n"
+            body = [f"\n說明: {error.explanation}\n"]
+            suggestions_title, confidence_label = "\n🎯 智能建議:\n", "信心度"
+        else:
+            header = f"🚨 {title} - {severity} Priority\n\nError Type: {error.error_type}\n"
+            body = [f"\nExplanation: {error.explanation}\n"]
+            suggestions_title, confidence_label = "\n🎯 Smart Suggestions:\n", "Confidence"
+        
+        if error.suggestions:
+            body.append(suggestions_title)
+            for i, suggestion in enumerate(error.suggestions, 1):
+                body.append(f"\n{i}. {suggestion['title']} "
+                            f"({confidence_label}: {suggestion['confidence']*100:.0f}%)\n")
+                if 'code' in suggestion:
+                    body.append(f"```{fence}\n{suggestion['code']}\n```\n")
+        
+        return header, ''.join(body)
+
+
+class LazyResult:
+    """An analyzer result whose location fields are extracted on first access.
+    
+    ``error_type``, ``severity``, ``explanation`` and ``suggestions`` come
+    straight from the pattern table. Reading any other field, such as
+    ``line`` or ``file_path``, runs the analyzer's extraction once and builds
+    the full result, which ``resolve()`` also returns.
+    """
+    
+    __slots__ = ('_analyzer', '_matched', 'message', '_match_score', '_resolved')
+    
+    def __init__(self, analyzer: PatternAnalyzer, matched: Optional[str], message: str,
+                 match_score: float = 0.0):
+        """Wrap a classification made by an analyzer, with its match score."""
+        object.__setattr__(self, '_analyzer', analyzer)
+        object.__setattr__(self, '_matched', matched)
+        object.__setattr__(self, 'message', message)
+        object.__setattr__(self, '_match_score', match_score)
+        object.__setattr__(self, '_resolved', None)
+    
+    @property
+    def error_type(self) -> str:
+        """Return the matched error type, or the analyzer's unknown type."""
+        return self._matched or self._analyzer.UNKNOWN_ERROR_TYPE
+    
+    @property
+    def severity(self) -> str:
+        """Return the severity of the matched pattern."""
+        if self._matched:
+            return self._analyzer.all_patterns[self._matched]['severity']
+        return 'medium'
+    
+    @property
+    def explanation(self) -> str:
+        """Return the explanation of the matched pattern."""
+        if self._matched:
+            return self._analyzer.all_patterns[self._matched]['explanation']
+        return self._analyzer.UNKNOWN_EXPLANATION
+    
+    @property
+    def suggestions(self) -> Optional[Tuple[Suggestion, ...]]:
+        """Return the suggestions of the matched pattern."""
+        if self._matched:
+            return self._analyzer.all_patterns[self._matched]['suggestions']
+        return self._analyzer.unknown_suggestions()
+    
+    def resolve(self):
+        """Return the full analyzer result, extracting the location fields once."""
+        if self._resolved is None:
+            object.__setattr__(self, '_resolved', self._analyzer.build_result(
+                self.message, self._matched, self._match_score
+            ))
+        return self._resolved
+    
+    def __getattr__(self, name: str) -> Any:
+        """Resolve the full result for fields that need extraction."""
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Refuse changes, like the frozen result types."""
+        raise AttributeError(f"{type(self).__name__} is read-only")
+    
+    def __repr__(self) -> str:
+        """Show the classification without forcing extraction."""
+        return f"{type(self).__name__}(error_type={self.error_type!r}, severity={self.severity!r})"
@@ -0,0 +1,178 @@
+"""Token-bucket rate limiting with per-key quotas for the CCDebugger API."""
+
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Container, Dict, List, Optional, Tuple
+
+# Quotas promised by API-DOCUMENTATION.md, in requests per hour
+ANONYMOUS_LIMIT = 100
+API_KEY_LIMIT = 1000
+PERIOD_SECONDS = 3600
+
+# Seconds between sweeps that drop the buckets of idle clients
+COMPACT_INTERVAL = 60
+
+
+@dataclass(frozen=True, slots=True)
+class Quota:
+    """Requests allowed per period; the bucket refills at ``limit / period`` per second."""
+    limit: int
+    period: float = PERIOD_SECONDS
+    
+    @property
+    def rate(self) -> float:
+        """Tokens added per second."""
+        return self.limit / self.period
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    """Outcome of one rate-limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset: int
+    retry_after: int
+    
+    def headers(self) -> Dict[str, str]:
+        """Return the documented ``X-RateLimit-*`` headers, with Retry-After when denied."""
+        headers = {
+            'X-RateLimit-Limit': str(self.limit),
+            'X-RateLimit-Remaining': str(self.remaining),
+            'X-RateLimit-Reset': str(self.reset),
+        }
+        if not self.allowed:
+            headers['Retry-After'] = str(self.retry_after)
+        return headers
+
+
+class RateLimitBackend:
+    """Storage for token buckets.
+    
+    ``take`` must refill and debit a bucket atomically, so a backend shared by
+    several server processes or nodes (for example a Redis script keyed by
+    ``key``) can replace the in-process ``LocalBackend`` without changing
+    ``RateLimiter``. Times are Unix timestamps so nodes agree on them.
+    """
+    
+    def take(self, key: str, capacity: int, rate: float, cost: int, now: float) -> Tuple[bool, float]:
+        """Debit ``cost`` tokens if available; return whether it was and the tokens left."""
+        raise NotImplementedError
+    
+    def compact(self, now: float) -> int:
+        """Drop buckets that have refilled completely; return how many were dropped."""
+        return 0
+
+
+class LocalBackend(RateLimitBackend):
+    """In-process bucket store split into independently locked shards.
+    
+    A bucket is a ``[tokens, updated, capacity, rate]`` list in the dict of the
+    shard its key hashes to, so a check is one dict lookup and a little
+    arithmetic under one shard's lock, and threads checking different keys
+    rarely contend. A full bucket behaves exactly like a missing one, so
+    compaction drops those and memory tracks recently active clients only.
+    """
+    
+    def __init__(self, shards: int = 16):
+        """Initialize empty shards."""
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        
+        self._buckets: List[Dict[str, list]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+    
+    def __len__(self) -> int:
+        """Return the number of buckets held."""
+        return sum(len(buckets) for buckets in self._buckets)
+    
+    def take(self, key: str, capacity: int, rate: float, cost: int, now: float) -> Tuple[bool, float]:
+        """Refill the key's bucket for the time elapsed and debit it."""
+        shard = hash(key) % len(self._buckets)
+        buckets = self._buckets[shard]
+        
+        with self._locks[shard]:
+            bucket = buckets.get(key)
+            if bucket is None:
+                tokens = capacity
+                bucket = buckets[key] = [capacity, now, capacity, rate]
+            else:
+                tokens = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            bucket[0] = tokens
+            bucket[1] = now
+            bucket[2] = capacity
+            bucket[3] = rate
+            return allowed, tokens
+    
+    def compact(self, now: float) -> int:
+        """Drop full buckets one shard at a time, so checks on other shards go on."""
+        dropped = 0
+        for buckets, lock in zip(self._buckets, self._locks):
+            with lock:
+                idle = [
+                    key for key, (tokens, updated, capacity, rate) in buckets.items()
+                    if tokens + (now - updated) * rate >= capacity
+                ]
+                for key in idle:
+                    del buckets[key]
+            dropped += len(idle)
+        return dropped
+
+
+class RateLimiter:
+    """Per-client request quotas backed by token buckets.
+    
+    Requests with one of the configured ``api_keys`` are counted against the
+    key at the keyed quota, others against the client address at the
+    anonymous quota. Without ``api_keys`` no key can be verified, so keys
+    earn no larger quota; otherwise a client sending a new key with every
+    request would never be limited. Each bucket holds a full quota, refills continuously and
+    lets a burst of up to ``limit`` requests through. Idle buckets are
+    compacted every ``compact_interval`` seconds during checks, so there is
+    no background thread to manage.
+    """
+    
+    def __init__(self, anonymous: Quota = Quota(ANONYMOUS_LIMIT), keyed: Quota = Quota(API_KEY_LIMIT),
+                 backend: Optional[RateLimitBackend] = None, api_keys: Optional[Container[str]] = None,
+                 clock: Callable[[], float] = time.time, compact_interval: float = COMPACT_INTERVAL):
+        """Initialize the limiter; without ``api_keys``, any key is accepted at the anonymous quota."""
+        self.anonymous = anonymous
+        self.keyed = keyed
+        self.backend = backend if backend is not None else LocalBackend()
+        self.api_keys = api_keys
+        self.compact_interval = compact_interval
+        self._clock = clock
+        self._next_compact = clock() + compact_interval
+    
+    def known_key(self, api_key: str) -> bool:
+        """Return whether an API key may be used."""
+        return self.api_keys is None or api_key in self.api_keys
+    
+    def check(self, client: str, api_key: Optional[str] = None, cost: int = 1) -> RateLimitDecision:
+        """Count a request from a client address or API key against its quota."""
+        now = self._clock()
+        if now >= self._next_compact:
+            self._next_compact = now + self.compact_interval
+            self.backend.compact(now)
+        
+        if api_key is not None and self.api_keys is not None and api_key in self.api_keys:
+            quota, key = self.keyed, 'key:' + api_key
+        else:
+            quota, key = self.anonymous, 'client:' + client
+        
+        rate = quota.rate
+        allowed, tokens = self.backend.take(key, quota.limit, rate, cost, now)
+        missing = quota.limit - tokens
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=quota.limit,
+            remaining=int(tokens),
+            reset=math.ceil(now + missing / rate),
+            retry_after=0 if allowed else math.ceil((cost - tokens) / rate),
+        )
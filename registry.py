@@ -0,0 +1,58 @@
+"""Lazy registry of the CCDebugger analyzers by language code."""
+
+import importlib
+import threading
+from typing import Dict, Tuple
+
+# Language code, as listed by GET /languages -> (module, analyzer class)
+ANALYZERS: Dict[str, Tuple[str, str]] = {
+    'sql': ('sql_analyzer', 'SQLAnalyzer'),
+    'shell': ('shell_analyzer', 'ShellAnalyzer'),
+    'docker': ('docker_analyzer', 'DockerAnalyzer'),
+    'config': ('config_analyzer', 'ConfigAnalyzer'),
+    'kotlin': ('kotlin_analyzer', 'KotlinAnalyzer'),
+    'swift': ('swift_analyzer', 'SwiftAnalyzer'),
+}
+
+# Shared analyzers built by get_analyzer, by language code
+_instances: Dict[str, object] = {}
+_lock = threading.Lock()
+
+
+def languages() -> Tuple[str, ...]:
+    """Return the codes of every registered language."""
+    return tuple(ANALYZERS)
+
+
+def analyzer_class(language: str) -> type:
+    """Import the module of a language's analyzer and return the class."""
+    try:
+        module_name, class_name = ANALYZERS[language]
+    except KeyError:
+        raise ValueError(f"Unsupported language: {language}") from None
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def load_analyzer(language: str):
+    """Import and construct a new analyzer for a language."""
+    return analyzer_class(language)()
+
+
+def get_analyzer(language: str):
+    """Return the shared analyzer of a language, importing and building it on first use.
+    
+    Only the requested language's module is imported and only its pattern
+    table is built, so a host using one language never pays for the others.
+    """
+    analyzer = _instances.get(language)
+    if analyzer is None:
+        with _lock:
+            analyzer = _instances.get(language)
+            if analyzer is None:
+                analyzer = _instances[language] = load_analyzer(language)
+    return analyzer
+
+
+def loaded_languages() -> Tuple[str, ...]:
+    """Return the languages whose shared analyzer has been built, in registry order."""
+    return tuple(language for language in ANALYZERS if language in _instances)
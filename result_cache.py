@@ -0,0 +1,117 @@
+"""Bounded result cache for CCDebugger analyzers, keyed by error fingerprint."""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fingerprint import fingerprint
+
+# Marks a lookup that found nothing, since None is a valid cached value
+_MISSING = object()
+
+
+class ResultCache:
+    """LRU cache of error classifications with optional time-to-live.
+    
+    Keys are (analyzer class, fingerprint) pairs, so one cache can be shared
+    by all analyzers. Only the matched error type is stored; the analyzer
+    rebuilds the result around it with the file, line and other context of
+    the text at hand. Safe to share between threads.
+    """
+    
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize an empty cache holding at most ``maxsize`` entries."""
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for a key, or the default when absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                
+                del self._entries[key]
+                self.evictions += 1
+            
+            self.misses += 1
+            return default
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        expires = self._clock() + self.ttl if self.ttl is not None else None
+        
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def classify(self, analyzer, error_text: str) -> Optional[str]:
+        """Return the error type an analyzer's patterns give the text, using the cache."""
+        key = (type(analyzer), fingerprint(error_text))
+        error_type = self.get(key, _MISSING)
+        if error_type is _MISSING:
+            error_type = analyzer.pattern_table().match(error_text)
+            self.put(key, error_type)
+        return error_type
+    
+    def find(self, analyzer, error_text: str) -> Tuple[Optional[str], float]:
+        """Return the error type and match score an analyzer's patterns give the text, using the cache.
+        
+        The score is always this text's own: a cached type is scored by
+        searching its pattern alone, and a text that pattern misses, though
+        it shares a fingerprint, is classified afresh.
+        """
+        key = (type(analyzer), fingerprint(error_text))
+        table = analyzer.pattern_table()
+        error_type = self.get(key, _MISSING)
+        if error_type is _MISSING:
+            error_type, match_score = table.find_scored(error_text)
+            self.put(key, error_type)
+            return error_type, match_score
+        
+        if error_type is None:
+            return None, 0.0
+        match_score = table.score(error_type, error_text)
+        if match_score is None:
+            return table.find_scored(error_text)
+        return error_type, match_score
+    
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+    
+    def stats(self) -> Dict[str, int]:
+        """Return the hit, miss and eviction counters and the current size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+    
+    def __len__(self) -> int:
+        """Return the number of entries, including any not yet expired."""
+        return len(self._entries)
@@ -0,0 +1,72 @@
+"""Match scores of CCDebugger analyzer results.
+
+A score in [0, 1] says how strongly a text matched the pattern of its error
+type. It combines signals that matching and context extraction produce
+anyway, so scoring never scans the text again:
+
+- ``confidence``: the best suggestion confidence of the pattern, its prior
+- ``span``: characters the pattern matched, saturating at ``SPAN_SATURATION``
+- ``density``: share of the matched line the match covers, low for a keyword
+  buried in a long unrelated line
+- ``position``: how early in the text the match starts, since the headline
+  of a record states its error
+- ``context``: share of the analyzer's context fields found, such as the SQL
+  dialect, config type, file and line
+
+The first four make up ``match_score``. A cached classification is scored
+by searching its error type's pattern alone (see ``PatternTable.score``).
+The context signal depends on how many fields an analyzer defines, so only
+match scores are compared across analyzers.
+"""
+
+import re
+from typing import Any, Dict
+
+# Weight of each signal; they sum to 1
+SIGNAL_WEIGHTS = {
+    'confidence': 0.4,
+    'span': 0.2,
+    'density': 0.1,
+    'position': 0.1,
+    'context': 0.2,
+}
+
+# Matched characters at which the span signal is full
+SPAN_SATURATION = 40
+
+# Weights applied per call, with the span weight scaled to its saturation
+_CONFIDENCE = SIGNAL_WEIGHTS['confidence']
+_SPAN = SIGNAL_WEIGHTS['span'] / SPAN_SATURATION
+_DENSITY = SIGNAL_WEIGHTS['density']
+_POSITION = SIGNAL_WEIGHTS['position']
+_CONTEXT = SIGNAL_WEIGHTS['context']
+
+
+def match_score(confidence: float, match: re.Match, text: str) -> float:
+    """Return the part of a score that depends on the match, without context.
+    
+    Every match of one text shares its context, so this alone ranks them.
+    """
+    start, end = match.span()
+    span = end - start
+    line_end = text.find('\n', end)
+    if line_end < 0:
+        line_end = len(text)
+    line = line_end - text.rfind('\n', 0, start) - 1
+    
+    return (_CONFIDENCE * confidence
+            + _SPAN * (span if span < SPAN_SATURATION else SPAN_SATURATION)
+            + _DENSITY * span / (line or 1)
+            + _POSITION * (1 - start / (len(text) or 1)))
+
+
+def context_score(context: Dict[str, Any]) -> float:
+    """Return the share of context fields an analyzer found in the text."""
+    if not context:
+        return 0.0
+    return 1 - tuple(context.values()).count(None) / len(context)
+
+
+def score(match_score: float, context: Dict[str, Any]) -> float:
+    """Return the score of a result from its match score and context, rounded to three decimals."""
+    return round(match_score + _CONTEXT * context_score(context), 3)
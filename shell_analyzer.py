@@ -1,11 +1,14 @@
 """Shell/Bash language error analyzer for CCDebugger."""
 
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 
+from location_extractor import LocationExtractor
+from pattern_engine import PatternAnalyzer, Suggestion
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class ShellError:
     """Represents a Shell/Bash error with analysis."""
     error_type: str
@@ -14,11 +17,12 @@ class ShellError:
     line: Optional[int] = None
     command: Optional[str] = None
     severity: str = "high"
-    suggestions: List[Dict[str, any]] = None
+    suggestions: Optional[Tuple[Suggestion, ...]] = None
     explanation: Optional[str] = None
+    score: float = 0.0  # Match strength in [0, 1], see scoring.py
     
 
-class ShellAnalyzer:
+class ShellAnalyzer(PatternAnalyzer):
     """Analyzer for Shell/Bash script errors."""
     
     # Common Shell/Bash syntax error patterns
@@ -318,95 +322,67 @@ class ShellAnalyzer:
         }
     }
     
-    def __init__(self):
-        """Initialize the Shell analyzer."""
+    # Language code used by the log segmenter and routing
+    LANGUAGE = 'shell'
+    
+    # Banner title and code fence used by format_suggestions
+    DISPLAY_NAMES = {'en': 'Shell/Bash Error', 'zh': 'Shell/Bash 錯誤'}
+    CODE_FENCE = 'bash'
+    
+    # Script path and line locations, highest priority first
+    SCRIPT_LOCATIONS = LocationExtractor([
+        (r'([^:]+\.sh):(\d+):', ('script', 'line')),  # script.sh:42:
+        (r'([^:]+): line (\d+):', ('script', 'line')),  # script: line 42:
+        (r'line (\d+) of ([^:]+)', ('line', 'script')),  # line 42 of script.sh
+        (r'"([^"]+)", line (\d+)', ('script', 'line')),  # "script.sh", line 42
+    ])
+    
+    # Result used when no pattern matches
+    RESULT_CLASS = ShellError
+    UNKNOWN_ERROR_TYPE = 'unknown_shell_error'
+    UNKNOWN_EXPLANATION = "This appears to be a Shell/Bash error, but doesn't match common patterns."
+    UNKNOWN_SUGGESTIONS = [
+        {
+            'title': 'Check shell syntax',
+            'code': '# Verify script syntax\nbash -n script.sh\n# Or use shellcheck\nshellcheck script.sh',
+            'confidence': 0.5
+        },
+        {
+            'title': 'Enable debug mode',
+            'code': '# Run with debug output\nbash -x script.sh\n# Or add to script\nset -x',
+            'confidence': 0.5
+        }
+    ]
+    
+    @classmethod
+    def _ordered_patterns(cls) -> Dict[str, Dict]:
+        """Merge pattern tables in matching order."""
         # Order matters - more specific patterns should be checked first
-        self.all_patterns = {
-            **self.CONTROL_PATTERNS,  # Check control patterns first (more specific)
-            **self.IO_PATTERNS,       # Then IO patterns
-            **self.ARRAY_PATTERNS,    # Then array patterns
-            **self.SPECIAL_PATTERNS,  # Then special patterns
-            **self.SYNTAX_PATTERNS    # Finally general syntax patterns
+        return {
+            **cls.CONTROL_PATTERNS,  # Check control patterns first (more specific)
+            **cls.IO_PATTERNS,       # Then IO patterns
+            **cls.ARRAY_PATTERNS,    # Then array patterns
+            **cls.SPECIAL_PATTERNS,  # Then special patterns
+            **cls.SYNTAX_PATTERNS    # Finally general syntax patterns
         }
     
-    def analyze(self, error_text: str) -> Optional[ShellError]:
-        """Analyze Shell/Bash error text and return structured analysis."""
-        if not error_text:
-            return None
-            
+    def _extract_context(self, error_text: str) -> Dict[str, any]:
+        """Extract script location and command information."""
         # Extract script and line information if present
         script_info = self._extract_script_info(error_text)
         
         # Extract command if present
         command = self._extract_command(error_text)
         
-        # Try to match against known patterns
-        for error_type, config in self.all_patterns.items():
-            pattern = config['pattern']
-            match = re.search(pattern, error_text, re.MULTILINE | re.IGNORECASE)
-            
-            if match:
-                return ShellError(
-                    error_type=error_type,
-                    message=error_text,
-                    script_path=script_info.get('script'),
-                    line=script_info.get('line'),
-                    command=command,
-                    severity=config['severity'],
-                    suggestions=config['suggestions'],
-                    explanation=config['explanation']
-                )
-        
-        # Generic Shell error if no pattern matches
-        return ShellError(
-            error_type='unknown_shell_error',
-            message=error_text,
-            script_path=script_info.get('script'),
-            line=script_info.get('line'),
-            command=command,
-            severity='medium',
-            explanation="This appears to be a Shell/Bash error, but doesn't match common patterns.",
-            suggestions=[
-                {
-                    'title': 'Check shell syntax',
-                    'code': '# Verify script syntax\nbash -n script.sh\n# Or use shellcheck\nshellcheck script.sh',
-                    'confidence': 0.5
-                },
-                {
-                    'title': 'Enable debug mode',
-                    'code': '# Run with debug output\nbash -x script.sh\n# Or add to script\nset -x',
-                    'confidence': 0.5
-                }
-            ]
-        )
+        return {
+            'script_path': script_info.get('script'),
+            'line': script_info.get('line'),
+            'command': command,
+        }
     
     def _extract_script_info(self, error_text: str) -> Dict[str, any]:
         """Extract script path and line number from error text."""
-        info = {}
-        
-        # Common patterns for script:line format
-        patterns = [
-            r'([^:]+\.sh):(\d+):',  # script.sh:42:
-            r'([^:]+): line (\d+):',  # script: line 42:
-            r'line (\d+) of ([^:]+)',  # line 42 of script.sh
-            r'"([^"]+)", line (\d+)'  # "script.sh", line 42
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, error_text)
-            if match:
-                if 'line' in pattern and 'of' in pattern:
-                    info['line'] = int(match.group(1))
-                    info['script'] = match.group(2)
-                elif '"' in pattern:
-                    info['script'] = match.group(1)
-                    info['line'] = int(match.group(2))
-                else:
-                    info['script'] = match.group(1)
-                    info['line'] = int(match.group(2))
-                break
-        
-        return info
+        return self.SCRIPT_LOCATIONS.extract(error_text)
     
     def _extract_command(self, error_text: str) -> Optional[str]:
         """Extract the command that caused the error."""
@@ -426,44 +402,28 @@ class ShellAnalyzer:
     
     def format_suggestions(self, error: ShellError, language: str = 'en') -> str:
         """Format error analysis for display."""
+        header, body = self._format_blocks(error, language)
+        output = [header]
+        
         if language == 'zh':
-            output = f"🚨 Shell/Bash 錯誤 - {error.severity.upper()} 優先級\n\n"
-            output += f"錯誤類型: {error.error_type}\n"
             if error.script_path:
-                output += f"腳本: {error.script_path}"
+                output.append(f"腳本: {error.script_path}")
                 if error.line:
-                    output += f" (第 {error.line} 行)"
-                output += "\n"
+                    output.append(f" (第 {error.line} 行)")
+                output.append("\n")
             if error.command:
-                output += f"命令: {error.command}\n"
-            output += f"\n說明: {error.explanation}\n"
-            
-            if error.suggestions:
-                output += "\n🎯 智能建議:\n"
-                for i, suggestion in enumerate(error.suggestions, 1):
-                    output += f"\n{i}. {suggestion['title']} (信心度: {suggestion['confidence']*100:.0f}%)\n"
-                    if 'code' in suggestion:
-                        output += f"```bash\n{suggestion['code']}\n```\n"
+                output.append(f"命令: {error.command}\n")
         else:
-            output = f"🚨 Shell/Bash Error - {error.severity.upper()} Priority\n\n"
-            output += f"Error Type: {error.error_type}\n"
             if error.script_path:
-                output += f"Script: {error.script_path}"
+                output.append(f"Script: {error.script_path}")
                 if error.line:
-                    output += f" (Line {error.line})"
-                output += "\n"
+                    output.append(f" (Line {error.line})")
+                output.append("\n")
             if error.command:
-                output += f"Command: {error.command}\n"
-            output += f"\nExplanation: {error.explanation}\n"
-            
-            if error.suggestions:
-                output += "\n🎯 Smart Suggestions:\n"
-                for i, suggestion in enumerate(error.suggestions, 1):
-                    output += f"\n{i}. {suggestion['title']} (Confidence: {suggestion['confidence']*100:.0f}%)\n"
-                    if 'code' in suggestion:
-                        output += f"```bash\n{suggestion['code']}\n```\n"
+                output.append(f"Command: {error.command}\n")
         
-        return output
+        output.append(body)
+        return ''.join(output)
 
 
 # Example usage
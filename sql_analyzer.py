@@ -1,11 +1,16 @@
 """SQL language error analyzer for CCDebugger."""
 
 import re
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 
+from location_extractor import LocationExtractor
+from pattern_engine import PatternAnalyzer, Suggestion
 
-@dataclass
+MYSQL_ERROR_CODE = re.compile(r'ERROR \d{4}')
+
+
+@dataclass(frozen=True, slots=True)
 class SQLError:
     """Represents a SQL error with analysis."""
     error_type: str
@@ -14,11 +19,12 @@ class SQLError:
     line: Optional[int] = None
     position: Optional[int] = None
     severity: str = "high"
-    suggestions: List[Dict[str, any]] = None
+    suggestions: Optional[Tuple[Suggestion, ...]] = None
     explanation: Optional[str] = None
+    score: float = 0.0  # Match strength in [0, 1], see scoring.py
     
 
-class SQLAnalyzer:
+class SQLAnalyzer(PatternAnalyzer):
     """Analyzer for SQL language errors."""
     
     # Common SQL syntax error patterns
@@ -258,153 +264,117 @@ class SQLAnalyzer:
         }
     }
     
-    def __init__(self):
-        """Initialize the SQL analyzer."""
+    # Dialect indicators, checked in order after the error code patterns
+    DIALECT_INDICATORS = {
+        'mysql': ['MySQL', 'mysqld', 'MyISAM', 'InnoDB', 'ERROR 1'],
+        'postgresql': ['PostgreSQL', 'psql', 'pg_', 'postgres', 'relation'],
+        'sqlite': ['SQLite', 'sqlite3'],
+        'mssql': ['SQL Server', 'MSSQL', 'Transact-SQL'],
+        'oracle': ['Oracle', 'ORA-', 'PL/SQL']
+    }
+    _DIALECT_INDICATORS_LOWER = tuple(
+        (dialect, tuple(ind.lower() for ind in indicators))
+        for dialect, indicators in DIALECT_INDICATORS.items()
+    )
+    
+    # Language code used by the log segmenter and routing
+    LANGUAGE = 'sql'
+    
+    # Banner title and code fence used by format_suggestions
+    DISPLAY_NAMES = {'en': 'SQL Error', 'zh': 'SQL 錯誤'}
+    CODE_FENCE = 'sql'
+    
+    # Line and position locations, each list highest priority first
+    LINE_LOCATIONS = LocationExtractor([
+        (r'line (\d+)', ('line',)),
+        (r'LINE (\d+)', ('line',)),
+        (r':(\d+):', ('line',)),
+        (r'at line (\d+)', ('line',)),
+    ])
+    POSITION_LOCATIONS = LocationExtractor([
+        (r'position (\d+)', ('position',)),
+        (r'column (\d+)', ('position',)),
+        (r':\d+:(\d+)', ('position',)),
+    ])
+    
+    # Result used when no pattern matches
+    RESULT_CLASS = SQLError
+    UNKNOWN_ERROR_TYPE = 'unknown_sql_error'
+    UNKNOWN_EXPLANATION = "This appears to be a SQL error, but doesn't match common patterns."
+    
+    @classmethod
+    def _ordered_patterns(cls) -> Dict[str, Dict]:
+        """Merge pattern tables in matching order."""
         # Order matters - more specific patterns should be checked first
-        self.all_patterns = {
-            **self.CONNECTION_PATTERNS,  # Check connection patterns first (includes auth)
-            **self.SYNTAX_PATTERNS,
-            **self.OPTIMIZATION_PATTERNS,
-            **self.ORM_PATTERNS
+        return {
+            **cls.CONNECTION_PATTERNS,  # Check connection patterns first (includes auth)
+            **cls.SYNTAX_PATTERNS,
+            **cls.OPTIMIZATION_PATTERNS,
+            **cls.ORM_PATTERNS
         }
     
-    def analyze(self, error_text: str) -> Optional[SQLError]:
-        """Analyze SQL error text and return structured analysis."""
-        if not error_text:
-            return None
-            
+    def _extract_context(self, error_text: str) -> Dict[str, any]:
+        """Extract SQL dialect and line/position information."""
         # Detect SQL dialect if possible
         dialect = self._detect_dialect(error_text)
         
         # Extract line/position information if present
         line_info = self._extract_line_info(error_text)
         
-        # Try to match against known patterns
-        for error_type, config in self.all_patterns.items():
-            pattern = config['pattern']
-            match = re.search(pattern, error_text, re.MULTILINE | re.IGNORECASE)
-            
-            if match:
-                return SQLError(
-                    error_type=error_type,
-                    message=error_text,
-                    sql_dialect=dialect,
-                    line=line_info.get('line'),
-                    position=line_info.get('position'),
-                    severity=config['severity'],
-                    suggestions=config['suggestions'],
-                    explanation=config['explanation']
-                )
-        
-        # Generic SQL error if no pattern matches
-        return SQLError(
-            error_type='unknown_sql_error',
-            message=error_text,
-            sql_dialect=dialect,
-            line=line_info.get('line'),
-            position=line_info.get('position'),
-            severity='medium',
-            explanation="This appears to be a SQL error, but doesn't match common patterns."
-        )
+        return {
+            'sql_dialect': dialect,
+            'line': line_info.get('line'),
+            'position': line_info.get('position'),
+        }
     
     def _detect_dialect(self, error_text: str) -> Optional[str]:
         """Detect SQL dialect from error message."""
         # Check for specific error code patterns first
-        if re.search(r'ERROR \d{4}', error_text):  # MySQL error codes
+        if MYSQL_ERROR_CODE.search(error_text):  # MySQL error codes
             return 'mysql'
-        if re.search(r'ERROR:', error_text) and 'LINE' in error_text:  # PostgreSQL format
+        if 'ERROR:' in error_text and 'LINE' in error_text:  # PostgreSQL format
             return 'postgresql'
-        if re.search(r'FATAL:', error_text):  # PostgreSQL fatal errors
+        if 'FATAL:' in error_text:  # PostgreSQL fatal errors
             return 'postgresql'
         
-        dialect_indicators = {
-            'mysql': ['MySQL', 'mysqld', 'MyISAM', 'InnoDB', 'ERROR 1'],
-            'postgresql': ['PostgreSQL', 'psql', 'pg_', 'postgres', 'relation'],
-            'sqlite': ['SQLite', 'sqlite3'],
-            'mssql': ['SQL Server', 'MSSQL', 'Transact-SQL'],
-            'oracle': ['Oracle', 'ORA-', 'PL/SQL']
-        }
-        
         error_lower = error_text.lower()
-        for dialect, indicators in dialect_indicators.items():
-            if any(ind.lower() in error_lower for ind in indicators):
-                return dialect
+        for dialect, indicators in self._DIALECT_INDICATORS_LOWER:
+            for indicator in indicators:
+                if indicator in error_lower:
+                    return dialect
         
         return None
     
     def _extract_line_info(self, error_text: str) -> Dict[str, any]:
         """Extract line and position information from error text."""
-        info = {}
-        
-        # Common patterns for line numbers
-        line_patterns = [
-            r'line (\d+)',
-            r'LINE (\d+)',
-            r':(\d+):',
-            r'at line (\d+)'
-        ]
-        
-        for pattern in line_patterns:
-            match = re.search(pattern, error_text)
-            if match:
-                info['line'] = int(match.group(1))
-                break
-        
-        # Position/column patterns
-        pos_patterns = [
-            r'position (\d+)',
-            r'column (\d+)',
-            r':\d+:(\d+)'
-        ]
-        
-        for pattern in pos_patterns:
-            match = re.search(pattern, error_text)
-            if match:
-                info['position'] = int(match.group(1))
-                break
-        
+        info = self.LINE_LOCATIONS.extract(error_text)
+        info.update(self.POSITION_LOCATIONS.extract(error_text))
         return info
     
     def format_suggestions(self, error: SQLError, language: str = 'en') -> str:
         """Format error analysis for display."""
+        header, body = self._format_blocks(error, language)
+        output = [header]
+        
         if language == 'zh':
-            output = f"🚨 SQL 錯誤 - {error.severity.upper()} 優先級\n\n"
-            output += f"錯誤類型: {error.error_type}\n"
             if error.sql_dialect:
-                output += f"SQL 方言: {error.sql_dialect.upper()}\n"
+                output.append(f"SQL 方言: {error.sql_dialect.upper()}\n")
             if error.line:
-                output += f"行號: {error.line}"
+                output.append(f"行號: {error.line}")
                 if error.position:
-                    output += f", 位置: {error.position}"
-                output += "\n"
-            output += f"\n說明: {error.explanation}\n"
-            
-            if error.suggestions:
-                output += "\n🎯 智能建議:\n"
-                for i, suggestion in enumerate(error.suggestions, 1):
-                    output += f"\n{i}. {suggestion['title']} (信心度: {suggestion['confidence']*100:.0f}%)\n"
-                    if 'code' in suggestion:
-                        output += f"```sql\n{suggestion['code']}\n```\n"
+                    output.append(f", 位置: {error.position}")
+                output.append("\n")
         else:
-            output = f"🚨 SQL Error - {error.severity.upper()} Priority\n\n"
-            output += f"Error Type: {error.error_type}\n"
             if error.sql_dialect:
-                output += f"SQL Dialect: {error.sql_dialect.upper()}\n"
+                output.append(f"SQL Dialect: {error.sql_dialect.upper()}\n")
             if error.line:
-                output += f"Line: {error.line}"
+                output.append(f"Line: {error.line}")
                 if error.position:
-                    output += f", Position: {error.position}"
-                output += "\n"
-            output += f"\nExplanation: {error.explanation}\n"
-            
-            if error.suggestions:
-                output += "\n🎯 Smart Suggestions:\n"
-                for i, suggestion in enumerate(error.suggestions, 1):
-                    output += f"\n{i}. {suggestion['title']} (Confidence: {suggestion['confidence']*100:.0f}%)\n"
-                    if 'code' in suggestion:
-                        output += f"```sql\n{suggestion['code']}\n```\n"
+                    output.append(f", Position: {error.position}")
+                output.append("\n")
         
-        return output
+        output.append(body)
+        return ''.join(output)
 
 
 # Example usage
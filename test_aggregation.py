@@ -0,0 +1,120 @@
+"""Test cases for result aggregation."""
+
+import pickle
+import unittest
+from collections import Counter
+from aggregation import CountMinSketch, ResultAggregate
+from docker_analyzer import DockerAnalyzer
+from kotlin_analyzer import KotlinAnalyzer
+from pattern_engine import result_to_dict
+from sql_analyzer import SQLAnalyzer
+
+SQL_TEXTS = [
+    "ERROR 1054 (42S22): Unknown column 'usernme' in 'field list'",
+    "ERROR: relation \"users\" does not exist",
+    "ERROR 1064 (42000): You have an error in your SQL syntax",
+    "something unexpected happened",
+]
+
+KOTLIN_TEXTS = [
+    "UserViewModel.kt:25: error: unresolved reference: foo",
+    "java.lang.NullPointerException",
+    "kotlin.UninitializedPropertyAccessException: lateinit property adapter has not been initialized",
+]
+
+
+class TestCountMinSketch(unittest.TestCase):
+    """Test approximate counting of high-cardinality keys."""
+    
+    def setUp(self):
+        """Count a skewed stream of keys."""
+        self.keys = (['Main.kt'] * 500 + ['App.kt'] * 300 + ['View.kt'] * 200
+                     + [f"src/file{i}.kt" for i in range(2000)])
+        self.counts = Counter(self.keys)
+    
+    def build(self, keys) -> CountMinSketch:
+        sketch = CountMinSketch(width=256, depth=4, heavy_hitters=8)
+        for key in keys:
+            sketch.add(key)
+        return sketch
+    
+    def test_estimates_bound_counts(self):
+        """Test that estimates never fall below the true count and stay close to it."""
+        sketch = self.build(self.keys)
+        
+        self.assertEqual(sketch.total, len(self.keys))
+        for key, count in self.counts.items():
+            estimate = sketch.estimate(key)
+            self.assertGreaterEqual(estimate, count)
+            self.assertLessEqual(estimate, count + 2 * sketch.total // sketch.width)
+    
+    def test_top(self):
+        """Test that heavy hitters are the most frequent keys."""
+        top = self.build(self.keys).top(3)
+        self.assertEqual([key for key, _ in top], ['Main.kt', 'App.kt', 'View.kt'])
+    
+    def test_merge_equals_single_pass(self):
+        """Test that merging sketches of two halves equals sketching the whole stream."""
+        whole = self.build(self.keys)
+        merged = self.build(self.keys[:1000]).merge(self.build(self.keys[1000:]))
+        
+        self.assertEqual(merged.total, whole.total)
+        for key in self.counts:
+            self.assertEqual(merged.estimate(key), whole.estimate(key))
+        self.assertEqual(merged.top(3), whole.top(3))
+    
+    def test_merge_shape_mismatch(self):
+        """Test that sketches of different shapes are not merged."""
+        with self.assertRaises(ValueError):
+            CountMinSketch(width=256).merge(CountMinSketch(width=512))
+
+
+class TestResultAggregate(unittest.TestCase):
+    """Test streaming counts of analyzer results."""
+    
+    def test_counts_fields(self):
+        """Test exact histograms of result fields, skipping texts without a result."""
+        aggregate = ResultAggregate().update(SQLAnalyzer().analyze_many(SQL_TEXTS * 2 + ['']), 'sql')
+        
+        self.assertEqual(aggregate.results, 8)
+        self.assertEqual(aggregate.count('language', 'sql'), 8)
+        self.assertEqual(aggregate.count('sql_dialect', 'mysql'), 4)
+        self.assertEqual(aggregate.count('error_type', 'missing_column'), 2)
+        self.assertEqual(len(aggregate.top('error_type')), 4)
+        self.assertEqual(aggregate.top('file_path'), [])
+    
+    def test_file_paths_sketched(self):
+        """Test that file paths of every result type reach the file_path sketch."""
+        aggregate = ResultAggregate().update(KotlinAnalyzer().analyze_many(KOTLIN_TEXTS * 3))
+        aggregate.add(DockerAnalyzer().analyze("Dockerfile:3\nCOPY failed: file not found in build context"))
+        
+        self.assertEqual(aggregate.count('file_path', 'UserViewModel.kt'), 3)
+        self.assertEqual(aggregate.top('file_path'), [('UserViewModel.kt', 3), ('Dockerfile', 1)])
+    
+    def test_dicts_and_dataclasses_agree(self):
+        """Test that the dictionary form of results is counted like the results."""
+        results = KotlinAnalyzer().analyze_many(KOTLIN_TEXTS)
+        from_results = ResultAggregate().update(results, 'kotlin')
+        from_dicts = ResultAggregate().update((result_to_dict(r) for r in results), 'kotlin')
+        
+        self.assertEqual(from_dicts.to_dict(), from_results.to_dict())
+    
+    def test_merge_pickled_partials(self):
+        """Test that partial aggregates survive pickling and merge into the whole."""
+        results = SQLAnalyzer().analyze_many(SQL_TEXTS * 3)
+        whole = ResultAggregate().update(results, 'sql')
+        merged = ResultAggregate()
+        for first in range(0, len(results), 5):
+            partial = ResultAggregate().update(results[first:first + 5], 'sql')
+            merged.merge(pickle.loads(pickle.dumps(partial)))
+        
+        self.assertEqual(merged.to_dict(), whole.to_dict())
+    
+    def test_unknown_field(self):
+        """Test that unknown fields are rejected."""
+        with self.assertRaises(ValueError):
+            ResultAggregate().top('colour')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,393 @@
+"""Test cases for the asyncio analysis server."""
+
+import asyncio
+import base64
+import http.client
+import json
+import os
+import threading
+import unittest
+from analysis_server import AnalysisServer, HTTPError, error_text
+from rate_limit import Quota, RateLimiter
+from websocket_protocol import (
+    CLOSE_NORMAL, CLOSE_POLICY_VIOLATION, CLOSE_TOO_BIG, MAX_MESSAGE_BYTES, OP_PING, OP_PONG,
+    WebSocket, encode_frame, read_frame
+)
+from sql_analyzer import SQLAnalyzer
+from docker_analyzer import DockerAnalyzer
+
+
+DOCKER_LOG = """Step 2/3 : COPY package.json .
+COPY failed: file not found in build context: package.json
+Step 3/3 : RUN npm install
+The command '/bin/sh -c npm install' returned a non-zero code: 1
+"""
+
+
+class TestErrorText(unittest.TestCase):
+    """Test validation of error payloads."""
+    
+    def test_stack_trace_appended(self):
+        """Test that a trace not repeating the message is appended to it."""
+        text = error_text({'message': 'COPY failed', 'stack_trace': 'Step 3/5 : COPY app /app'})
+        self.assertEqual(text, 'COPY failed\nStep 3/5 : COPY app /app')
+    
+    def test_stack_trace_repeating_message(self):
+        """Test that a trace containing the message is used on its own."""
+        text = error_text({'message': 'boom', 'stack_trace': 'Error: boom\n  at main'})
+        self.assertEqual(text, 'Error: boom\n  at main')
+    
+    def test_missing_message(self):
+        """Test that payloads without a message are rejected."""
+        for payload in ({}, {'message': '  '}, {'message': 3}, ['message']):
+            with self.assertRaises(HTTPError) as context:
+                error_text(payload)
+            self.assertEqual(context.exception.status, 400)
+
+
+class TestAnalysisServer(unittest.TestCase):
+    """Test the HTTP routes against a server running in a background thread."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Start one server with a single worker for all tests."""
+        cls.loop = asyncio.new_event_loop()
+        cls.thread = threading.Thread(target=cls.loop.run_forever, daemon=True)
+        cls.thread.start()
+        cls.server = AnalysisServer(port=0, workers=1)
+        asyncio.run_coroutine_threadsafe(cls.server.start(), cls.loop).result(timeout=30)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the server and its event loop."""
+        asyncio.run_coroutine_threadsafe(cls.server.close(), cls.loop).result(timeout=30)
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join()
+        cls.loop.close()
+    
+    def setUp(self):
+        """Open a keep-alive connection to the server."""
+        self.connection = http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=10)
+    
+    def tearDown(self):
+        """Close the connection."""
+        self.connection.close()
+    
+    def request(self, method, path, payload=None, raw=None):
+        """Send a request and return the status, decoded body and response."""
+        body = raw if raw is not None else (json.dumps(payload) if payload is not None else None)
+        self.connection.request(method, path, body=body,
+                                headers={'Content-Type': 'application/json'})
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read()), response
+    
+    def test_analyze_with_language(self):
+        """Test that an analysis matches the analyzer's own result."""
+        message = "ERROR 1054 (42S22): Unknown column 'usernme' in 'field list'"
+        status, body, _ = self.request('POST', '/analyze', {'message': message, 'language': 'sql'})
+        expected = SQLAnalyzer().analyze(message)
+        
+        self.assertEqual(status, 200)
+        self.assertEqual(body['language'], 'sql')
+        self.assertEqual(body['error_type'], expected.error_type)
+        self.assertEqual(body['severity'], expected.severity)
+        self.assertEqual([s['title'] for s in body['suggestions']],
+                         [s.title for s in expected.suggestions])
+        self.assertEqual(body['suggestions'][0]['id'], 'sugg_001')
+        self.assertEqual(body['context']['sql_dialect'], expected.sql_dialect)
+        self.assertNotIn('score', body['context'])
+    
+    def test_analyze_routes_without_language(self):
+        """Test that errors without a language are routed to an analyzer."""
+        status, body, _ = self.request('POST', '/analyze',
+                                       {'message': './deploy.sh: line 12: kubectl: command not found'})
+        
+        self.assertEqual(status, 200)
+        self.assertEqual(body['language'], 'shell')
+        self.assertEqual(body['error_type'], 'command_not_found')
+        self.assertEqual(body['context']['line'], 12)
+    
+    def test_keep_alive(self):
+        """Test that several requests share one connection."""
+        for _ in range(3):
+            status, _, response = self.request('GET', '/health')
+            self.assertEqual(status, 200)
+            self.assertEqual(response.getheader('Connection'), 'keep-alive')
+    
+    def test_invalid_requests(self):
+        """Test the documented error body for invalid requests."""
+        status, body, _ = self.request('POST', '/analyze', {'language': 'sql'})
+        self.assertEqual(status, 400)
+        self.assertEqual(body['error']['code'], 'INVALID_REQUEST')
+        self.assertEqual(body['error']['details']['field'], 'message')
+        
+        status, body, _ = self.request('POST', '/analyze', raw='{not json')
+        self.assertEqual(status, 400)
+        self.assertEqual(body['error']['code'], 'INVALID_REQUEST')
+        
+        status, body, _ = self.request('POST', '/analyze', {'message': 'x', 'language': 'cobol'})
+        self.assertEqual(status, 400)
+        self.assertEqual(body['error']['code'], 'LANGUAGE_NOT_SUPPORTED')
+    
+    def test_patterns(self):
+        """Test listing the patterns of a language."""
+        status, body, _ = self.request('GET', '/patterns/docker')
+        patterns = DockerAnalyzer.pattern_table().patterns
+        
+        self.assertEqual(status, 200)
+        self.assertEqual(body['total'], len(patterns))
+        self.assertEqual([p['name'] for p in body['patterns']], list(patterns))
+        
+        status, body, _ = self.request('GET', '/patterns/cobol')
+        self.assertEqual(status, 400)
+        self.assertEqual(body['error']['code'], 'LANGUAGE_NOT_SUPPORTED')
+    
+    def test_languages_and_health(self):
+        """Test the language listing and health check."""
+        status, body, _ = self.request('GET', '/languages')
+        self.assertEqual(status, 200)
+        self.assertEqual(body['total'], 6)
+        self.assertIn({'code': 'sql', 'name': 'SQL',
+                       'error_pattern_count': len(SQLAnalyzer.pattern_table().patterns)},
+                      body['languages'])
+        
+        status, body, _ = self.request('GET', '/health')
+        self.assertEqual(status, 200)
+        self.assertEqual(body['status'], 'healthy')
+    
+    def batch(self, body, content_type='application/json', chunked=False):
+        """Send a batch request and return the response and its result lines by index."""
+        self.connection.request('POST', '/analyze/batch', body=body, encode_chunked=chunked,
+                                headers={'Content-Type': content_type})
+        response = self.connection.getresponse()
+        lines = [json.loads(line) for line in response.read().splitlines()]
+        return response, {line.get('index'): line for line in lines}
+    
+    def test_batch_array(self):
+        """Test a JSON array batch with one invalid payload."""
+        payloads = [
+            {'message': "ERROR 1064 (42000): You have an error in your SQL syntax", 'language': 'sql'},
+            {'message': ''},
+            {'message': "bash: foo: command not found"},
+        ]
+        response, results = self.batch(json.dumps(payloads))
+        
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.getheader('Content-Type'), 'application/x-ndjson; charset=utf-8')
+        self.assertEqual(sorted(results), [0, 1, 2])
+        self.assertEqual(results[0]['error_type'], 'syntax_error')
+        self.assertEqual(results[1]['error']['code'], 'INVALID_REQUEST')
+        self.assertEqual(results[2]['language'], 'shell')
+    
+    def test_batch_ndjson_stream(self):
+        """Test a chunked NDJSON upload spanning many worker chunks."""
+        message = "ERROR 1054 (42S22): Unknown column 'usernme' in 'field list'"
+        lines = [json.dumps({'message': message}).encode() + b'\n' for _ in range(150)]
+        lines.insert(10, b'not json\n')
+        response, results = self.batch(iter(lines), 'application/x-ndjson', chunked=True)
+        
+        self.assertEqual(response.status, 200)
+        self.assertEqual(len(results), 151)
+        self.assertEqual(results[10]['error']['code'], 'INVALID_REQUEST')
+        self.assertEqual({r['error_type'] for i, r in results.items() if i != 10}, {'missing_column'})
+        
+        # The connection stays usable after a streamed response
+        status, _, _ = self.request('GET', '/health')
+        self.assertEqual(status, 200)
+    
+    def test_malformed_chunk_size(self):
+        """Test that chunk sizes other than bare hex digits are rejected as bad requests."""
+        body = b'{"message": "x"}'
+        for size, expected in ((b'10;ext=1', 200), (b'-5', 400), (b'+10', 400),
+                               (b'1_0', 400), (b'0x10', 400), (b'', 400)):
+            with self.subTest(size=size):
+                connection = http.client.HTTPConnection('127.0.0.1', self.server.port, timeout=10)
+                try:
+                    connection.putrequest('POST', '/analyze')
+                    connection.putheader('Content-Type', 'application/json')
+                    connection.putheader('Transfer-Encoding', 'chunked')
+                    connection.endheaders()
+                    connection.send(size + b'\r\n' + body + b'\r\n0\r\n\r\n')
+                    response = connection.getresponse()
+                    answer = json.loads(response.read())
+                finally:
+                    connection.close()
+                
+                self.assertEqual(response.status, expected)
+                if expected == 400:
+                    self.assertEqual(answer['error'], {'code': 'INVALID_REQUEST',
+                                                       'message': "Malformed chunk size"})
+    
+    def test_batch_rejects_non_array(self):
+        """Test that a JSON batch must be an array."""
+        status, body, _ = self.request('POST', '/analyze/batch', {'message': 'x'})
+        self.assertEqual(status, 400)
+        self.assertEqual(body['error']['code'], 'INVALID_REQUEST')
+    
+    def test_unread_body_keeps_connection(self):
+        """Test that a body no handler reads is drained before the next request."""
+        status, _, response = self.request('POST', '/health', {'message': 'x'})
+        self.assertEqual(status, 405)
+        self.assertEqual(response.getheader('Connection'), 'keep-alive')
+        
+        status, _, _ = self.request('GET', '/languages')
+        self.assertEqual(status, 200)
+    
+    def test_unknown_route_and_method(self):
+        """Test 404 for unknown paths and 405 with Allow for wrong methods."""
+        status, body, _ = self.request('GET', '/feedback')
+        self.assertEqual(status, 404)
+        
+        status, body, response = self.request('GET', '/analyze')
+        self.assertEqual(status, 405)
+        self.assertEqual(response.getheader('Allow'), 'POST')
+    
+    
+    def test_rate_limit(self):
+        """Test quotas per client and API key, their headers and the exempt health check."""
+        self.server.rate_limiter = RateLimiter(Quota(2), Quota(3), api_keys={'secret'})
+        try:
+            for remaining in ('1', '0'):
+                status, _, response = self.request('GET', '/languages')
+                self.assertEqual(status, 200)
+                self.assertEqual(response.getheader('X-RateLimit-Limit'), '2')
+                self.assertEqual(response.getheader('X-RateLimit-Remaining'), remaining)
+            
+            status, body, response = self.request('GET', '/languages')
+            self.assertEqual(status, 429)
+            self.assertEqual(body['error']['code'], 'RATE_LIMIT_EXCEEDED')
+            self.assertEqual(response.getheader('Retry-After'), '1800')
+            
+            status, _, response = self.request('GET', '/health')
+            self.assertEqual(status, 200)
+            self.assertIsNone(response.getheader('X-RateLimit-Limit'))
+            
+            for key, expected in (('secret', 200), ('guess', 401)):
+                self.connection.request('GET', '/languages', headers={'Authorization': f'Bearer {key}'})
+                response = self.connection.getresponse()
+                response.read()
+                self.assertEqual(response.status, expected)
+            self.assertEqual(response.getheader('WWW-Authenticate'), 'Bearer')
+        finally:
+            self.server.rate_limiter = None
+    
+    def test_rate_limit_rotating_keys(self):
+        """Test that without configured keys a new key per request does not lift the client's quota."""
+        self.server.rate_limiter = RateLimiter(Quota(2), Quota(3))
+        try:
+            statuses = []
+            for key in ('one', 'two', 'three'):
+                self.connection.request('GET', '/languages', headers={'Authorization': f'Bearer {key}'})
+                response = self.connection.getresponse()
+                response.read()
+                statuses.append(response.status)
+            
+            self.assertEqual(statuses, [200, 200, 429])
+            self.assertEqual(response.getheader('X-RateLimit-Limit'), '2')
+        finally:
+            self.server.rate_limiter = None
+    
+    def test_stream_bad_handshake(self):
+        """Test that a plain GET on the stream route is rejected."""
+        status, body, _ = self.request('GET', '/stream')
+        self.assertEqual(status, 400)
+        self.assertEqual(body['error']['code'], 'INVALID_REQUEST')
+        
+        self.connection.request('GET', '/stream?language=cobol', headers={
+            'Upgrade': 'websocket', 'Connection': 'Upgrade', 'Sec-WebSocket-Version': '13',
+            'Sec-WebSocket-Key': base64.b64encode(os.urandom(16)).decode(),
+        })
+        response = self.connection.getresponse()
+        self.assertEqual(response.status, 400)
+        self.assertEqual(json.loads(response.read())['error']['code'], 'LANGUAGE_NOT_SUPPORTED')
+    
+    def stream(self, session, path='/stream?language=docker'):
+        """Open a WebSocket to the stream route and run a client coroutine on it."""
+        async def run():
+            reader, writer = await asyncio.open_connection('127.0.0.1', self.server.port)
+            writer.write(
+                f"GET {path} HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\n"
+                f"Connection: Upgrade\r\nSec-WebSocket-Version: 13\r\n"
+                f"Sec-WebSocket-Key: {base64.b64encode(os.urandom(16)).decode()}\r\n\r\n"
+                .encode('latin-1')
+            )
+            head = await reader.readuntil(b'\r\n\r\n')
+            self.assertTrue(head.startswith(b'HTTP/1.1 101 '))
+            try:
+                return await asyncio.wait_for(session(WebSocket(reader, writer, client=True)), 30)
+            finally:
+                writer.close()
+        return asyncio.run(run())
+    
+    @staticmethod
+    async def messages(websocket):
+        """Return the JSON messages received until the server closes."""
+        messages = []
+        while True:
+            message = await websocket.receive()
+            if message is None:
+                return messages
+            messages.append(json.loads(message[1]))
+    
+    def test_stream_pushes_closed_records(self):
+        """Test that a record is analyzed once the next line closes it."""
+        async def session(websocket):
+            subscribed = json.loads((await websocket.receive())[1])
+            lines = DOCKER_LOG.splitlines(keepends=True)
+            await websocket.send_text(''.join(lines[:2]))
+            # The COPY record is still open until another line arrives
+            await websocket.send_text(lines[2])
+            first = json.loads((await websocket.receive())[1])
+            await websocket.send_binary(''.join(lines[3:]).encode())
+            await websocket.close()
+            return subscribed, first, await self.messages(websocket), websocket.close_code
+        
+        subscribed, first, rest, code = self.stream(session)
+        self.assertEqual(subscribed, {'type': 'subscribed', 'language': 'docker'})
+        self.assertEqual(first['type'], 'analysis')
+        self.assertEqual(first['record'], 1)
+        self.assertEqual(first['error_type'], 'copy_failed')
+        # Closing flushes the last record, which has no line after it
+        self.assertEqual([m['error_type'] for m in rest], ['run_failed'])
+        self.assertEqual(code, CLOSE_NORMAL)
+    
+    def test_stream_split_lines_and_subscribe(self):
+        """Test lines split across messages and a subscription with a severity filter."""
+        async def session(websocket):
+            await websocket.send_text(json.dumps({
+                'action': 'subscribe', 'language': 'kotlin', 'filters': {'severity': ['high']}
+            }))
+            subscribed = json.loads((await websocket.receive())[1])
+            text = ("e: /src/App.kt: (25, 35): Type mismatch: inferred type is String? but String was expected\n"
+                    "e: /src/App.kt: (3, 1): Unresolved reference: foo\n")
+            for index in range(0, len(text), 7):
+                await websocket.send_binary(text[index:index + 7].encode())
+            await websocket.close()
+            return subscribed, await self.messages(websocket)
+        
+        subscribed, messages = self.stream(session, '/stream')
+        self.assertEqual(subscribed['language'], 'kotlin')
+        self.assertTrue(messages)
+        self.assertTrue(all(m['severity'] == 'high' for m in messages))
+        self.assertIn("Type mismatch", messages[0]['text'])
+    
+    def test_stream_ping_and_limits(self):
+        """Test ping replies, data before a subscription and the message size cap."""
+        async def ping(websocket):
+            websocket.writer.write(encode_frame(OP_PING, b'hi', mask=True))
+            return await read_frame(websocket.reader, require_mask=False)
+        self.assertEqual(self.stream(ping, '/stream'), (True, OP_PONG, b'hi'))
+        
+        async def unsubscribed(websocket):
+            await websocket.send_text(DOCKER_LOG)
+            return await self.messages(websocket), websocket.close_code
+        self.assertEqual(self.stream(unsubscribed, '/stream'), ([], CLOSE_POLICY_VIOLATION))
+        
+        async def oversize(websocket):
+            await websocket.send_binary(b'x' * (MAX_MESSAGE_BYTES + 1))
+            return await self.messages(websocket), websocket.close_code
+        self.assertEqual(self.stream(oversize)[1], CLOSE_TOO_BIG)
+
+
+if __name__ == '__main__':
+    unittest.main()
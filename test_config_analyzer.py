@@ -306,6 +306,16 @@ class TestConfigAnalyzer(unittest.TestCase):
         self.assertIn('Configuration Error', formatted)
         self.assertIn('Smart Suggestions', formatted)
         self.assertIn('JSON', formatted)
+    
+    def test_pattern_priority_over_position(self):
+        """Test that pattern priority wins over match position in the text."""
+        # yaml_invalid_value matches first in the text, but schema patterns
+        # are checked before YAML patterns
+        error_text = "invalid value for 'version'\nschema validation failed"
+        result = self.analyzer.analyze(error_text)
+        
+        self.assertEqual(result.error_type, 'schema_validation_failed')
+        self.assertEqual(result.severity, 'high')
 
 
 class TestConfigAnalyzerIntegration(unittest.TestCase):
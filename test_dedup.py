@@ -0,0 +1,100 @@
+"""Test cases for error record deduplication."""
+
+import io
+import unittest
+from unittest import mock
+from dedup import Deduplicator, cluster_key, dedup_stream
+from docker_analyzer import DockerAnalyzer
+from sql_analyzer import SQLAnalyzer
+
+
+def denied(user: str, host: str) -> str:
+    return f"ERROR 1045 (28000): Access denied for user '{user}'@'{host}' (using password: YES)"
+
+
+class TestDeduplicator(unittest.TestCase):
+    """Test clustering of repeated records."""
+    
+    def setUp(self):
+        """Deduplicate for a SQL analyzer whose analyze calls are counted."""
+        self.analyzer = SQLAnalyzer()
+        self.analyze = mock.patch.object(self.analyzer, 'analyze', wraps=self.analyzer.analyze)
+        self.calls = self.analyze.start()
+        self.addCleanup(self.analyze.stop)
+    
+    def test_storm_analyzed_once(self):
+        """Test that variants of one error form one cluster with one analysis."""
+        texts = [denied(f'app{i % 7}', f'10.0.0.{i}') for i in range(1000)]
+        texts.insert(500, "ERROR 1146 (42S02): Table 'shop.orders' doesn't exist")
+        deduplicator = Deduplicator(self.analyzer, max_samples=2).update(texts)
+        
+        self.assertEqual(len(deduplicator), 2)
+        self.assertEqual(self.calls.call_count, 2)
+        self.assertEqual(deduplicator.records, 1001)
+        
+        storm, table = deduplicator.most_common()
+        self.assertEqual((storm.count, storm.first_offset, storm.last_offset), (1000, 0, 1000))
+        self.assertEqual((table.count, table.first_offset, table.last_offset), (1, 500, 500))
+        self.assertEqual(storm.result.error_type, 'authentication_failed')
+        self.assertEqual(storm.samples, texts[:2])
+        self.assertEqual(storm.text, texts[0])
+    
+    def test_exact_repeats_skip_fingerprint(self):
+        """Test that remembered texts are not fingerprinted again."""
+        deduplicator = Deduplicator(self.analyzer)
+        deduplicator.add(denied('app', 'db1'))
+        with mock.patch('dedup.cluster_key', side_effect=AssertionError):
+            cluster = deduplicator.add(denied('app', 'db1'), offset=42)
+        
+        self.assertEqual((cluster.count, cluster.last_offset), (2, 42))
+        self.assertEqual(cluster.samples, [denied('app', 'db1')])
+    
+    def test_memo_bounded(self):
+        """Test that the memo of recent texts never exceeds its size."""
+        deduplicator = Deduplicator(self.analyzer, memo_size=10)
+        deduplicator.update(denied('app', f'10.0.0.{i}') for i in range(100))
+        
+        self.assertLessEqual(len(deduplicator._memo), 10)
+        self.assertEqual(len(deduplicator), 1)
+    
+    def test_distinct_errors_kept_apart(self):
+        """Test that records with different wording get different keys."""
+        self.assertEqual(cluster_key(denied('a', 'h1')), cluster_key(denied('b', 'h2')))
+        self.assertNotEqual(cluster_key(denied('a', 'h1')),
+                            cluster_key("ERROR 1044 (42000): Access denied for user 'a'@'h1' to database 'x'"))
+    
+    def test_to_dicts(self):
+        """Test the plain-data form of clusters."""
+        deduplicator = Deduplicator(self.analyzer).update(['', denied('a', 'h'), denied('b', 'h')])
+        
+        data, = deduplicator.to_dicts()
+        self.assertEqual(data['count'], 2)
+        self.assertEqual(data['result']['error_type'], 'authentication_failed')
+        self.assertEqual(len(data['samples']), 2)
+    
+    def test_invalid_max_samples(self):
+        """Test that clusters must keep at least one sample."""
+        with self.assertRaises(ValueError):
+            Deduplicator(self.analyzer, max_samples=0)
+
+
+class TestDedupStream(unittest.TestCase):
+    """Test clustering the records of a log."""
+    
+    def test_build_log(self):
+        """Test that repeated build failures collapse into one cluster per error."""
+        log = ''.join(
+            f"Step {i}/9 : COPY build/{i}/app.jar /opt/\n"
+            f"COPY failed: file not found in build context: build/{i}/app.jar\n"
+            for i in range(1, 9)
+        ) + "unknown flag: --chown\n"
+        deduplicator = dedup_stream(io.StringIO(log), DockerAnalyzer())
+        
+        copy, flag = deduplicator.clusters()
+        self.assertEqual((copy.count, copy.first_offset, copy.last_offset), (8, 0, 7))
+        self.assertEqual(copy.result.error_type, 'copy_failed')
+        self.assertEqual((flag.count, flag.first_offset), (1, 8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""Test cases for the language routing dispatcher."""
+
+import unittest
+from dispatcher import Dispatcher, DispatchResult
+from kotlin_analyzer import KotlinError
+from sql_analyzer import SQLError
+from docker_analyzer import DockerError
+
+
+class TestDispatcher(unittest.TestCase):
+    """Test routing error text to the analyzers that could match it."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.dispatcher = Dispatcher()
+    
+    def test_file_markers(self):
+        """Test that .kt: and .swift: markers route to one analyzer."""
+        kotlin = self.dispatcher.dispatch(
+            "MainActivity.kt:45: error: Unresolved reference: textView"
+        )
+        swift = self.dispatcher.dispatch(
+            "ViewController.swift:12:5: error: cannot find 'foo' in scope"
+        )
+        
+        self.assertEqual(kotlin.language, 'kotlin')
+        self.assertIsInstance(kotlin.result, KotlinError)
+        self.assertEqual(kotlin.analyzed, ['kotlin'])
+        self.assertEqual(swift.language, 'swift')
+        self.assertEqual(swift.analyzed, ['swift'])
+    
+    def test_dialect_codes(self):
+        """Test that SQL error codes route to the SQL analyzer."""
+        dispatched = self.dispatcher.dispatch(
+            "ERROR 1054 (42S22): Unknown column 'usernme' in 'field list'"
+        )
+        
+        self.assertIsInstance(dispatched.result, SQLError)
+        self.assertEqual(dispatched.result.error_type, 'missing_column')
+        self.assertEqual(dispatched.analyzed, ['sql'])
+    
+    def test_dockerfile_instruction(self):
+        """Test that Dockerfile instructions route to the Docker analyzer."""
+        dispatched = self.dispatcher.dispatch(
+            "Step 2/3 : COPY package.json .\nCOPY failed: file not found in build context"
+        )
+        
+        self.assertIsInstance(dispatched.result, DockerError)
+        self.assertEqual(dispatched.result.error_type, 'copy_failed')
+    
+    def test_recognized_result_beats_unknown(self):
+        """Test that a lower-scored analyzer wins when it recognizes the error."""
+        dispatched = self.dispatcher.dispatch("./deploy.sh: line 3: docker: command not found")
+        
+        self.assertEqual(dispatched.language, 'shell')
+        self.assertEqual(dispatched.result.error_type, 'command_not_found')
+    
+    def test_weak_result_lets_next_language_try(self):
+        """Test that a recognized but weak result does not stop dispatch."""
+        dispatched = self.dispatcher.dispatch(
+            "JSON.parse: Unexpected token }\n"
+            "kotlin: the response handler of worker 3 gave up after retrying the request five times on NPE"
+        )
+        
+        self.assertEqual(dispatched.analyzed, ['kotlin', 'config'])
+        self.assertEqual(dispatched.language, 'config')
+        self.assertEqual(dispatched.result.error_type, 'json_parse_error')
+        self.assertGreaterEqual(dispatched.result.score, Dispatcher.CONFIDENT_SCORE)
+    
+    def test_no_signals_tries_every_analyzer(self):
+        """Test the fallback when no routing signal is present."""
+        dispatched = self.dispatcher.dispatch("something went wrong")
+        
+        self.assertEqual(dispatched.scores, {})
+        self.assertEqual(len(dispatched.analyzed), 6)
+        self.assertEqual(dispatched.language, 'kotlin')
+        self.assertEqual(dispatched.result.error_type, 'unknown_kotlin_error')
+    
+    def test_routing_cost_measured(self):
+        """Test that routing and analysis times are reported."""
+        dispatched = self.dispatcher.dispatch("ORA-00942: table or view does not exist")
+        
+        self.assertIsInstance(dispatched, DispatchResult)
+        self.assertGreater(dispatched.routing_seconds, 0)
+        self.assertGreater(dispatched.analysis_seconds, 0)
+    
+    def test_empty_input(self):
+        """Test that empty text is not dispatched."""
+        self.assertIsNone(self.dispatcher.dispatch(""))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""Test cases for the shared location extractor."""
+
+import re
+import unittest
+from location_extractor import LocationExtractor
+from config_analyzer import ConfigAnalyzer
+from docker_analyzer import DockerAnalyzer
+from shell_analyzer import ShellAnalyzer
+from sql_analyzer import SQLAnalyzer
+
+
+class TestLocationExtractor(unittest.TestCase):
+    """Test rule priority, field mapping and the literal prefilter."""
+    
+    def setUp(self):
+        """Set up an extractor with overlapping rules."""
+        self.extractor = LocationExtractor([
+            (r'(\S+\.yaml):(\d+):(\d+)', ('file', 'line', 'column')),
+            (r'line (\d+)', ('line',), {'file': 'unknown'}),
+        ], re.IGNORECASE)
+    
+    def test_first_rule_wins_wherever_it_matches(self):
+        """Test that rule order, not position in the text, decides the match."""
+        info = self.extractor.extract("error at line 3 in app.yaml:10:5")
+        self.assertEqual(info, {'file': 'app.yaml', 'line': 10, 'column': 5})
+    
+    def test_constants_and_int_fields(self):
+        """Test that constants are added and numeric fields converted."""
+        self.assertEqual(self.extractor.extract("LINE 42: bad"), {'file': 'unknown', 'line': 42})
+    
+    def test_no_match(self):
+        """Test that text without a location gives an empty dict."""
+        self.assertEqual(self.extractor.extract("something failed"), {})
+    
+    def test_non_ascii_text(self):
+        """Test that non-ASCII text skips the prefilter but still matches."""
+        self.assertEqual(self.extractor.extract("錯誤 at Line 7"), {'file': 'unknown', 'line': 7})
+    
+    def test_group_count_mismatch(self):
+        """Test that a rule naming the wrong number of fields is rejected."""
+        with self.assertRaises(ValueError):
+            LocationExtractor([(r'(\d+):(\d+)', ('line',))])
+
+
+class TestAnalyzerLocations(unittest.TestCase):
+    """Test the analyzers' location rules."""
+    
+    def test_config_file_line_column(self):
+        """Test YAML file, line and column extraction."""
+        info = ConfigAnalyzer()._extract_file_info("in config.yaml:10:5: mapping values are not allowed")
+        self.assertEqual(info, {'file': 'config.yaml', 'line': 10, 'column': 5})
+    
+    def test_docker_constant_file(self):
+        """Test that bare Dockerfile line numbers name the Dockerfile."""
+        info = DockerAnalyzer()._extract_file_info("line 12: unknown instruction (Dockerfile)")
+        self.assertEqual(info, {'file': 'Dockerfile', 'line': 12})
+    
+    def test_shell_line_of_script(self):
+        """Test the rule whose groups come in line, script order."""
+        info = ShellAnalyzer()._extract_script_info("syntax error near line 8 of deploy.sh")
+        self.assertEqual(info, {'script': 'deploy.sh', 'line': 8})
+    
+    def test_sql_line_and_position(self):
+        """Test that line and position come from separate rule lists."""
+        info = SQLAnalyzer()._extract_line_info('ERROR: syntax error at or near "FORM"\nLINE 1: SELECT * FORM users\n position 10')
+        self.assertEqual(info, {'line': 1, 'position': 10})
+
+
+if __name__ == '__main__':
+    unittest.main()
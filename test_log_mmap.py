@@ -0,0 +1,133 @@
+"""Test cases for memory-mapped log scanning."""
+
+import os
+import tempfile
+import unittest
+from benchmarks.corpus import ANALYZERS, load_analyzer, load_examples, load_samples
+from log_mmap import MmapLogScanner
+from config_analyzer import ConfigAnalyzer
+from docker_analyzer import DockerAnalyzer, DockerError
+from kotlin_analyzer import KotlinAnalyzer
+from shell_analyzer import ShellAnalyzer
+from sql_analyzer import SQLAnalyzer
+
+
+LOG = (
+    b"Step 2/3 : COPY package.json .\n"
+    b"COPY failed: file not found in build context: package.json\n"
+    b"noise line\n"
+    b"\xe2\x9c\x94 unicode noise\n"
+    b"docker: Error response from daemon: bind: address already in use\n"
+    b"java.lang.NullPointerException\n"
+)
+
+
+class TestMmapLogScanner(unittest.TestCase):
+    """Test scanning log files through a memory map."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.docker = DockerAnalyzer()
+        self.scanner = MmapLogScanner([self.docker, KotlinAnalyzer()])
+        
+        with tempfile.NamedTemporaryFile('wb', suffix='.log', delete=False) as f:
+            f.write(LOG)
+        self.path = f.name
+    
+    def tearDown(self):
+        """Remove the temporary log file."""
+        os.unlink(self.path)
+    
+    def test_hits_offsets_and_lines(self):
+        """Test that every hit reports its byte offset and line number."""
+        hits = list(self.scanner.scan(self.path))
+        
+        self.assertEqual(
+            [(hit.line, hit.language, hit.error_type) for hit in hits],
+            [
+                (2, 'docker', 'copy_failed'),
+                (5, 'docker', 'port_already_allocated'),
+                (6, 'kotlin', 'null_pointer'),
+            ]
+        )
+        for hit in hits:
+            self.assertEqual(hit.line_offset, LOG.rfind(b'\n', 0, hit.offset) + 1)
+        self.assertTrue(LOG[hits[0].offset:].startswith(b'COPY failed'))
+    
+    def test_matches_analyzer_error_types(self):
+        """Test that hits resolve to the same error types as the analyzer."""
+        with open(self.path, 'rb') as f:
+            buffer = f.read()
+        
+        for hit in self.scanner.scan(self.path):
+            if hit.language != 'docker':
+                continue
+            result = self.scanner.to_result(buffer, hit)
+            self.assertIsInstance(result, DockerError)
+            self.assertEqual(result.error_type, hit.error_type)
+            self.assertEqual(result.error_type, self.docker.analyze(result.message).error_type)
+    
+    def test_priority_matches_analyze(self):
+        """Test that a line matching several patterns gets the analyzer's priority type."""
+        text = "CircleCI: Schema error in config.yml: jobs: build: steps: expected array, got string"
+        analyzer = ConfigAnalyzer()
+        hits = list(MmapLogScanner([analyzer]).scan_buffer(text.encode('utf-8')))
+        
+        self.assertEqual([hit.error_type for hit in hits], ['schema_validation_failed'])
+        self.assertEqual(hits[0].error_type, analyzer.analyze(text).error_type)
+    
+    def test_analyzers_do_not_hide_each_other(self):
+        """Test that hits of different analyzers on one line are all reported."""
+        scanner = MmapLogScanner([SQLAnalyzer(), ShellAnalyzer()])
+        hits = list(scanner.scan_buffer(
+            b"ERROR 1045: Access denied for user 'root'@'localhost' ./deploy.sh: Permission denied\n"
+            b"/bin/sh: 1: npm: command not found\n"
+        ))
+        
+        self.assertEqual(
+            [(hit.line, hit.language, hit.error_type) for hit in hits],
+            [
+                (1, 'sql', 'authentication_failed'),
+                (1, 'shell', 'permission_denied'),
+                (2, 'shell', 'command_not_found'),
+            ]
+        )
+    
+    def test_corpus_types_match_analyze(self):
+        """Test that every hit in the analyzer corpora has the type analyze gives its line."""
+        for language in ANALYZERS:
+            analyzer = load_analyzer(language)
+            scanner = MmapLogScanner([analyzer])
+            for text in dict.fromkeys(load_samples(language) + load_examples(language)):
+                with self.subTest(language=language, text=text):
+                    buffer = text.encode('utf-8')
+                    hits = list(scanner.scan_buffer(buffer))
+                    for hit in hits:
+                        line = scanner.line_text(buffer, hit)
+                        self.assertEqual(hit.error_type, analyzer.analyze(line).error_type)
+                    
+                    if '\n' not in text:
+                        result = analyzer.analyze(text)
+                        expected = [] if result.error_type == analyzer.UNKNOWN_ERROR_TYPE else [result.error_type]
+                        self.assertEqual([hit.error_type for hit in hits], expected)
+    
+    def test_empty_file(self):
+        """Test that empty files produce no hits."""
+        with tempfile.NamedTemporaryFile('wb', delete=False) as f:
+            pass
+        try:
+            self.assertEqual(list(self.scanner.scan(f.name)), [])
+        finally:
+            os.unlink(f.name)
+    
+    def test_line_text(self):
+        """Test decoding of the line containing a hit."""
+        hit = next(self.scanner.scan_buffer(LOG))
+        self.assertEqual(
+            self.scanner.line_text(LOG, hit),
+            "COPY failed: file not found in build context: package.json"
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
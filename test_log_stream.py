@@ -0,0 +1,225 @@
+"""Test cases for streaming log segmentation and analysis."""
+
+import io
+import os
+import tempfile
+import unittest
+from benchmarks.corpus import load_samples
+from log_stream import (RecordSegmenter, analyze_file, analyze_stream, count_record_starts,
+                        iter_block_records, iter_records, iter_text_records, read_blocks)
+from docker_analyzer import DockerAnalyzer, DockerError
+from kotlin_analyzer import KotlinAnalyzer, KotlinError
+from sql_analyzer import SQLAnalyzer
+from swift_analyzer import SwiftAnalyzer
+from registry import get_analyzer, languages
+
+
+GRADLE_LOG = """> Task :app:preBuild UP-TO-DATE
+> Task :app:compileDebugKotlin
+e: /src/main/java/com/example/UserViewModel.kt: (25, 35): Type mismatch: inferred type is String? but String was expected
+> Task :app:compileDebugKotlin FAILED
+E/AndroidRuntime: FATAL EXCEPTION: main
+    Process: com.example.app, PID: 12345
+    java.lang.NullPointerException
+        at com.example.app.MainActivity.onCreate(MainActivity.kt:45)
+
+BUILD FAILED in 3s
+"""
+
+DOCKER_LOG = """Sending build context to Docker daemon  2.048kB
+Step 1/3 : FROM node:16-alpine
+ ---> 3a2b1c0d9e8f
+Step 2/3 : COPY package.json .
+COPY failed: file not found in build context: package.json
+Step 3/3 : RUN npm install
+The command '/bin/sh -c npm install' returned a non-zero code: 1
+"""
+
+# Prefixes loggers and CI runners put before each line
+LOG_PREFIXES = (
+    "2024-05-01T12:00:00Z ",
+    "2024-05-01 12:00:00,250 [ERROR] ",
+    "[ERROR] ",
+    "#7 0.123 ",
+    "12:00:01.250 [main] ",
+)
+
+
+class TestRecordSegmenter(unittest.TestCase):
+    """Test incremental record segmentation."""
+    
+    def test_multi_line_record(self):
+        """Test that stack frames stay in the record they belong to."""
+        records = list(iter_records(io.StringIO(GRADLE_LOG), 'kotlin'))
+        
+        self.assertEqual(len(records), 2)
+        self.assertTrue(records[0].startswith('e: '))
+        self.assertIn('FATAL EXCEPTION', records[1])
+        self.assertIn('MainActivity.kt:45', records[1])
+        self.assertNotIn('BUILD FAILED', records[1])
+    
+    def test_context_line_prepended(self):
+        """Test that Docker step lines are attached to the following record."""
+        records = list(iter_records(io.StringIO(DOCKER_LOG), 'docker'))
+        
+        self.assertEqual(len(records), 2)
+        self.assertTrue(records[0].startswith('Step 2/3 : COPY'))
+        self.assertTrue(records[1].startswith('Step 3/3 : RUN'))
+    
+    def test_sql_hint_lines(self):
+        """Test that PostgreSQL LINE/HINT lines continue the record."""
+        log = [
+            'ERROR:  column "usernme" does not exist\n',
+            'LINE 1: SELECT usernme FROM users;\n',
+            'HINT:  Perhaps you meant to reference the column "users.username".\n',
+            'psql done\n',
+        ]
+        records = list(iter_records(log, 'sql'))
+        
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].count('\n'), 2)
+    
+    def test_record_size_bounded(self):
+        """Test that oversized records are truncated to the cap."""
+        log = ["Fatal error: Index out of range\n"] + ["    frame\n"] * 10000
+        records = list(iter_records(log, 'swift', max_record_chars=1000))
+        
+        self.assertEqual(len(records), 1)
+        self.assertLessEqual(len(records[0]), 1000)
+    
+    def test_long_line_split(self):
+        """Test that the parts of a split line join the same record."""
+        segmenter = RecordSegmenter('docker')
+        self.assertIsNone(segmenter.feed("COPY failed: "))
+        self.assertIsNone(segmenter.feed("file not found\n"))
+        
+        self.assertEqual(segmenter.close(), "COPY failed: file not found")
+    
+    def test_unsupported_language(self):
+        """Test that unknown languages are rejected."""
+        with self.assertRaises(ValueError):
+            RecordSegmenter('cobol')
+    
+    def test_whole_text_matches_lines(self):
+        """Test that splitting a whole text gives the records of its lines."""
+        for log, language in ((GRADLE_LOG, 'kotlin'), (DOCKER_LOG, 'docker')):
+            for text in (log, log.replace('\n', '\r\n'), log.rstrip('\n')):
+                for cap in (50, 64 * 1024):
+                    with self.subTest(language=language, text=text[-12:], cap=cap):
+                        self.assertEqual(list(iter_text_records(text, language, cap)),
+                                         list(iter_records(io.StringIO(text, newline=None),
+                                                           language, cap)))
+    
+    def test_prefixed_text_matches_lines(self):
+        """Test that whole-text splitting agrees with lines for prefixed and non-ASCII logs."""
+        for language in languages():
+            text = ''.join(
+                f"{prefix}{line}\n"
+                for sample in load_samples(language)
+                for prefix, line in zip(LOG_PREFIXES * 100, ["noise İ"] + sample.split('\n'))
+            )
+            with self.subTest(language=language):
+                self.assertEqual(list(iter_text_records(text, language)),
+                                 list(iter_records(io.StringIO(text), language)))
+    
+    def test_blocks_match_whole_text(self):
+        """Test that splitting blocks of a stream gives the records of the whole text."""
+        for log, language in ((GRADLE_LOG, 'kotlin'), (DOCKER_LOG, 'docker')):
+            for text in (log, log.replace('\n', '\r\n'), log.rstrip('\n')):
+                for block_chars in (130, 200, 64 * 1024):
+                    with self.subTest(language=language, text=text[-12:], block_chars=block_chars):
+                        blocks = list(read_blocks(io.StringIO(text, newline=None), block_chars))
+                        self.assertGreater(len(blocks), block_chars < len(log))
+                        self.assertEqual(list(iter_block_records(blocks, language)),
+                                         list(iter_text_records(text, language)))
+    
+    def test_line_split_across_blocks(self):
+        """Test that a line longer than a block still joins one record."""
+        text = "noise\nCOPY failed: " + "x" * 40 + "\nnoise\n"
+        blocks = list(read_blocks(io.StringIO(text), 16))
+        
+        self.assertEqual(''.join(blocks), text)
+        self.assertEqual(list(iter_block_records(blocks, 'docker')), ["COPY failed: " + "x" * 40])
+    
+    def test_count_record_starts(self):
+        """Test counting the start lines of each language in a log."""
+        self.assertEqual(count_record_starts(DOCKER_LOG, 'docker'), 2)
+        self.assertEqual(count_record_starts(DOCKER_LOG, 'swift'), 0)
+        self.assertEqual(count_record_starts("[ERROR] COPY failed: file not found\n", 'docker'), 1)
+
+
+class TestAnalyzeStream(unittest.TestCase):
+    """Test lazy analysis of log streams."""
+    
+    def test_yields_result_types(self):
+        """Test that each analyzer yields its own result type."""
+        kotlin_results = list(analyze_stream(io.StringIO(GRADLE_LOG), KotlinAnalyzer()))
+        docker_results = list(analyze_stream(io.StringIO(DOCKER_LOG), DockerAnalyzer()))
+        
+        self.assertTrue(all(isinstance(r, KotlinError) for r in kotlin_results))
+        self.assertEqual([r.error_type for r in kotlin_results], ['type_mismatch', 'null_pointer'])
+        
+        self.assertTrue(all(isinstance(r, DockerError) for r in docker_results))
+        self.assertEqual([r.error_type for r in docker_results], ['copy_failed', 'run_failed'])
+        self.assertEqual([r.instruction for r in docker_results], ['COPY', 'RUN'])
+    
+    def test_results_are_lazy(self):
+        """Test that results are yielded before the whole stream is read."""
+        consumed = []
+        
+        def lines():
+            for i in range(1000):
+                consumed.append(i)
+                yield f"ERROR 1054: Unknown column 'c{i}' in 'field list'\n"
+        
+        results = analyze_stream(lines(), SQLAnalyzer())
+        first = next(results)
+        
+        self.assertEqual(first.error_type, 'missing_column')
+        self.assertLess(len(consumed), 3)
+    
+    def test_prefixed_lines_start_records(self):
+        """Test that timestamps and level tags before an error do not hide it."""
+        log = [
+            "2024-05-01T12:00:00Z ERROR 1054 (42S22): Unknown column 'x' in 'field list'\n",
+            "Duplicate entry 'a@b.c' for key 'email'\n",
+            "[ERROR] ERROR 1045: Access denied for user 'root'@'localhost'\n",
+        ]
+        results = list(analyze_stream(log, SQLAnalyzer()))
+        
+        self.assertEqual([r.error_type for r in results],
+                         ['missing_column', 'constraint_violation', 'authentication_failed'])
+    
+    def test_prefixed_samples_not_lost(self):
+        """Test that every recognized test sample is found in a stream, with or without prefixes."""
+        for language in languages():
+            analyzer = get_analyzer(language)
+            for text in load_samples(language):
+                error_type = analyzer.analyze(text).error_type
+                if error_type == analyzer.UNKNOWN_ERROR_TYPE:
+                    continue
+                for prefix in ('',) + LOG_PREFIXES:
+                    lines = [f"{prefix}{line}\n" for line in text.split('\n')]
+                    with self.subTest(language=language, prefix=prefix, text=text):
+                        self.assertIn(error_type,
+                                      [r.error_type for r in analyze_stream(lines, analyzer)])
+    
+    def test_analyze_file(self):
+        """Test analysis of a log file on disk."""
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as f:
+            f.write("Compiling App.swift\n")
+            f.write("App.swift:12:5: error: No such module 'Alamofire'\n")
+            f.write("Fatal error: Unexpectedly found nil while unwrapping an Optional value\n")
+        
+        try:
+            results = list(analyze_file(f.name, SwiftAnalyzer()))
+        finally:
+            os.unlink(f.name)
+        
+        self.assertEqual([r.error_type for r in results], ['module_not_found', 'nil_unwrap'])
+        self.assertEqual(results[0].file_path, 'App.swift')
+        self.assertEqual(results[0].line, 12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Test cases for the multi-process parallel runner."""
+
+import os
+import tempfile
+import unittest
+from aggregation import ResultAggregate
+from parallel_runner import ParallelRunner
+from pattern_engine import result_to_dict
+from sql_analyzer import SQLAnalyzer
+from shell_analyzer import ShellAnalyzer
+
+
+SQL_TEXTS = [
+    "ERROR 1054 (42S22): Unknown column 'usernme' in 'field list'",
+    "ERROR: relation \"users\" does not exist",
+    "ERROR 1064 (42000): You have an error in your SQL syntax",
+    "something unexpected happened",
+]
+
+
+class TestParallelRunner(unittest.TestCase):
+    """Test analysis spread over worker processes."""
+    
+    @classmethod
+    def setUpClass(cls):
+        """Start one pool for all tests."""
+        cls.runner = ParallelRunner(['sql', 'shell'], workers=2, chunksize=3)
+    
+    @classmethod
+    def tearDownClass(cls):
+        """Shut the pool down."""
+        cls.runner.close()
+    
+    def test_matches_in_process_results(self):
+        """Test that results equal the plain-data form of in-process analysis."""
+        texts = SQL_TEXTS * 5
+        analyzer = SQLAnalyzer()
+        
+        self.assertEqual(
+            self.runner.analyze_many('sql', texts),
+            [result_to_dict(analyzer.analyze(text)) for text in texts]
+        )
+    
+    def test_input_order_across_chunks(self):
+        """Test that results keep input order when split over many chunks."""
+        texts = [f"ERROR 1146: Table 'db.t{i}' doesn't exist" for i in range(50)]
+        results = self.runner.analyze_many('sql', texts)
+        
+        self.assertEqual([r['message'] for r in results], texts)
+    
+    def test_empty_text(self):
+        """Test that empty texts give None like analyze() does."""
+        self.assertEqual(self.runner.analyze_many('sql', ['']), [None])
+        self.assertEqual(self.runner.analyze_many('sql', []), [])
+    
+    def test_mixed_languages(self):
+        """Test analysis of (language, text) pairs."""
+        shell_text = "bash: foo: command not found"
+        results = self.runner.analyze_mixed([('sql', SQL_TEXTS[0]), ('shell', shell_text)])
+        
+        self.assertEqual(results[0]['error_type'], 'missing_column')
+        self.assertEqual(results[1], result_to_dict(ShellAnalyzer().analyze(shell_text)))
+    
+    def test_submit(self):
+        """Test single-text futures with a given or routed language."""
+        shell_text = "bash: foo: command not found"
+        
+        self.assertEqual(self.runner.submit('sql', SQL_TEXTS[0]).result(),
+                         ('sql', result_to_dict(SQLAnalyzer().analyze(SQL_TEXTS[0]))))
+        self.assertEqual(self.runner.submit(None, shell_text).result(),
+                         ('shell', result_to_dict(ShellAnalyzer().analyze(shell_text))))
+        with self.assertRaises(ValueError):
+            self.runner.submit('docker', 'COPY failed')
+    
+    def test_submit_many(self):
+        """Test one future for a chunk of mixed and routed pairs."""
+        shell_text = "bash: foo: command not found"
+        pairs = self.runner.submit_many([('sql', SQL_TEXTS[0]), (None, shell_text)]).result()
+        
+        self.assertEqual([language for language, _ in pairs], ['sql', 'shell'])
+        self.assertEqual(pairs[1][1], result_to_dict(ShellAnalyzer().analyze(shell_text)))
+    
+    def test_log_files(self):
+        """Test analysis of whole log files in workers."""
+        with tempfile.NamedTemporaryFile('w', suffix='.log', delete=False) as f:
+            f.write(SQL_TEXTS[0] + "\nquery done\n" + SQL_TEXTS[2] + "\n")
+        
+        try:
+            results = self.runner.analyze_logs('sql', [f.name])
+        finally:
+            os.unlink(f.name)
+        
+        self.assertEqual([r['error_type'] for r in results[0]], ['missing_column', 'syntax_error'])
+    
+    def test_aggregate(self):
+        """Test that worker aggregates merge into the counts of in-process analysis."""
+        texts = SQL_TEXTS * 5
+        aggregate = self.runner.aggregate('sql', texts)
+        expected = ResultAggregate().update(SQLAnalyzer().analyze_many(texts), 'sql')
+        
+        self.assertEqual(aggregate.results, 20)
+        self.assertEqual(aggregate.to_dict(), expected.to_dict())
+    
+    def test_unknown_language(self):
+        """Test that languages without worker analyzers are rejected."""
+        with self.assertRaises(ValueError):
+            self.runner.analyze_many('kotlin', SQL_TEXTS)
+        with self.assertRaises(ValueError):
+            ParallelRunner(['cobol'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""Test cases for the on-disk pattern table cache."""
+
+import json
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+
+import pattern_engine
+from pattern_cache import CACHE_ENV, table_key
+from pattern_engine import PatternTable
+from sql_analyzer import SQLAnalyzer
+
+
+class TestPatternCache(unittest.TestCase):
+    """Test storing and reusing prepared pattern tables."""
+    
+    def setUp(self):
+        """Enable the cache in a fresh directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        environ = mock.patch.dict(os.environ, {CACHE_ENV: self.directory.name})
+        environ.start()
+        self.addCleanup(environ.stop)
+        self.patterns = SQLAnalyzer._ordered_patterns()
+    
+    def test_second_table_skips_parsing(self):
+        """Test that a cached table is built without parsing any pattern."""
+        first = PatternTable(self.patterns)
+        self.assertEqual(len(os.listdir(self.directory.name)), 1)
+        
+        with mock.patch.object(pattern_engine, 'required_literals', side_effect=AssertionError):
+            second = PatternTable(self.patterns)
+        self.assertEqual(second.literals, first.literals)
+        self.assertEqual(second.match("ERROR 1064 (42000): You have an error in your SQL syntax"),
+                         'syntax_error')
+    
+    def test_disabled_by_default(self):
+        """Test that nothing is written without the environment variable."""
+        with mock.patch.dict(os.environ, {CACHE_ENV: ''}):
+            PatternTable(self.patterns)
+        self.assertEqual(os.listdir(self.directory.name), [])
+    
+    def test_key_follows_patterns(self):
+        """Test that changing a regex or the flags changes the key."""
+        regexes = [config['pattern'] for config in self.patterns.values()]
+        key = table_key(regexes, pattern_engine.PATTERN_FLAGS)
+        
+        self.assertEqual(key, table_key(list(regexes), pattern_engine.PATTERN_FLAGS))
+        self.assertNotEqual(key, table_key(regexes[:-1] + ['x'], pattern_engine.PATTERN_FLAGS))
+        self.assertNotEqual(key, table_key(regexes, 0))
+    
+    def test_corrupt_file_ignored(self):
+        """Test that an unreadable entry is rebuilt and replaced."""
+        expected = PatternTable(self.patterns).literals
+        path = os.path.join(self.directory.name, os.listdir(self.directory.name)[0])
+        with open(path, 'wb') as f:
+            f.write(b'not json')
+        
+        self.assertEqual(PatternTable(self.patterns).literals, expected)
+        self.assertEqual(PatternTable(self.patterns).literals, expected)
+    
+    def test_unexpected_entries_ignored(self):
+        """Test that entries of another shape, key or format are misses, never executed."""
+        expected = PatternTable(self.patterns).literals
+        path = os.path.join(self.directory.name, os.listdir(self.directory.name)[0])
+        with open(path, encoding='utf-8') as f:
+            key = json.load(f)['key']
+        
+        entries = [
+            json.dumps({'key': key, 'literals': [[1, 2]] * len(expected)}).encode('utf-8'),
+            json.dumps({'key': key, 'literals': {'a': 'b'}}).encode('utf-8'),
+            json.dumps({'key': 'other', 'literals': [None] * len(expected)}).encode('utf-8'),
+            json.dumps([key, [None] * len(expected)]).encode('utf-8'),
+            pickle.dumps((key, (None,) * len(expected))),
+        ]
+        for entry in entries:
+            with self.subTest(entry=entry):
+                with open(path, 'wb') as f:
+                    f.write(entry)
+                self.assertEqual(PatternTable(self.patterns).literals, expected)
+    
+    def test_literals_restored_as_tuples(self):
+        """Test that cached literals come back as the tuples they were stored as."""
+        expected = PatternTable(self.patterns).literals
+        with mock.patch.object(pattern_engine, 'required_literals', side_effect=AssertionError):
+            cached = PatternTable(self.patterns).literals
+        
+        self.assertEqual(cached, expected)
+        self.assertIsInstance(cached, tuple)
+        self.assertTrue(all(item is None or isinstance(item, tuple) for item in cached))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,410 @@
+"""Test cases for the shared pattern engine."""
+
+import re
+import unittest
+from dataclasses import FrozenInstanceError, replace
+from unittest import mock
+import pattern_engine
+from pattern_engine import (
+    Classification, LazyResult, PatternTable, Suggestion, required_literals, result_to_dict
+)
+from config_analyzer import ConfigAnalyzer
+from docker_analyzer import DockerAnalyzer
+from sql_analyzer import SQLAnalyzer
+from shell_analyzer import ShellAnalyzer
+from kotlin_analyzer import KotlinAnalyzer
+from swift_analyzer import SwiftAnalyzer
+
+
+ANALYZER_CLASSES = [
+    ConfigAnalyzer, DockerAnalyzer, SQLAnalyzer,
+    ShellAnalyzer, KotlinAnalyzer, SwiftAnalyzer
+]
+
+
+class TestPatternTable(unittest.TestCase):
+    """Test compiled pattern table matching."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.table = PatternTable({
+            'specific': {'pattern': r"disk full"},
+            'generic': {'pattern': r"(?:error|full)"},
+        })
+    
+    def test_priority_wins_over_position(self):
+        """Test that earlier patterns win even when they match later in the text."""
+        self.assertEqual(self.table.match("error: disk full"), 'specific')
+    
+    def test_lower_priority_match(self):
+        """Test fallback to lower-priority patterns."""
+        self.assertEqual(self.table.match("unexpected error"), 'generic')
+    
+    def test_case_insensitive(self):
+        """Test that matching ignores case."""
+        self.assertEqual(self.table.match("DISK FULL"), 'specific')
+    
+    def test_no_match(self):
+        """Test that unmatched text returns None."""
+        self.assertIsNone(self.table.match("all good"))
+    
+    def test_regexes_compiled_on_first_search(self):
+        """Test that a regex is compiled once its literals first occur in a text."""
+        with mock.patch.object(pattern_engine.re, 'compile', wraps=re.compile) as compile:
+            table = PatternTable({'specific': {'pattern': r"disk full"},
+                                  'generic': {'pattern': r"(?:error|full)"}})
+            table.match("all good")
+            self.assertEqual(compile.call_count, 0)
+            
+            for _ in range(3):
+                self.assertEqual(table.match("unexpected error"), 'generic')
+            self.assertEqual(compile.call_count, 1)
+    
+    def test_non_ascii_text(self):
+        """Test that case-insensitive matches outside ASCII are not prefiltered away."""
+        table = PatternTable({'syntax': {'pattern': r"syntax error"}})
+        self.assertEqual(table.match("\u017fyntax error"), 'syntax')
+    
+    def test_match_all(self):
+        """Test that every matching pattern is found, the best-scoring match first."""
+        self.assertEqual(self.table.match_all("error: disk full"), ['specific', 'generic'])
+        self.assertEqual(self.table.match_all("unexpected error"), ['generic'])
+        self.assertEqual(self.table.match_all("all good"), [])
+        
+        table = PatternTable({'short': {'pattern': r"full"}, 'long': {'pattern': r"disk full"}})
+        self.assertEqual(table.match("disk full"), 'short')
+        self.assertEqual(table.match_all("disk full"), ['long', 'short'])
+    
+    def test_match_all_confidence_breaks_ties(self):
+        """Test that equally long matches are ranked by their best suggestion's confidence."""
+        table = PatternTable({
+            'unsure': {'pattern': r"timeout", 'suggestions': [{'title': 'a', 'confidence': 0.5}]},
+            'sure': {'pattern': r"timeout", 'suggestions': [{'title': 'b', 'confidence': 0.9}]},
+            'plain': {'pattern': r"timeout"},
+        })
+        self.assertEqual(table.match_all("timeout"), ['sure', 'unsure', 'plain'])
+        self.assertEqual(table.match_all("\u017fession timeout"), ['sure', 'unsure', 'plain'])
+
+
+class TestRequiredLiterals(unittest.TestCase):
+    """Test extraction of the literals a pattern requires."""
+    
+    def test_alternation(self):
+        """Test that each branch of an alternation contributes a literal."""
+        self.assertEqual(
+            required_literals(r"(?:syntax error|SQL syntax|parse error)"),
+            ('parse error', 'sql syntax', 'syntax error')
+        )
+    
+    def test_longest_required_run(self):
+        """Test that the most selective required literal is chosen."""
+        self.assertEqual(
+            required_literals(r"Type mismatch: inferred type is (.+) but (.+) was expected"),
+            ('type mismatch: inferred type is ',)
+        )
+    
+    def test_redundant_literals_dropped(self):
+        """Test that literals containing another literal are dropped."""
+        self.assertEqual(
+            required_literals(r"(?:constraint|unique constraint|violation)"),
+            ('constraint', 'violation')
+        )
+    
+    def test_no_required_literal(self):
+        """Test patterns that can match without any literal."""
+        self.assertIsNone(required_literals(r".+"))
+        self.assertIsNone(required_literals(r"(?:error|\d+)"))
+        self.assertIsNone(required_literals(r"x?"))
+    
+    def test_every_analyzer_pattern_has_literals(self):
+        """Test that the prefilter covers all shipped patterns."""
+        for analyzer_class in ANALYZER_CLASSES:
+            table = analyzer_class.pattern_table()
+            for error_type, literals in zip(table.error_types, table.literals):
+                with self.subTest(analyzer=analyzer_class.__name__, error_type=error_type):
+                    self.assertTrue(literals)
+
+
+class TestPatternAnalyzer(unittest.TestCase):
+    """Test the shared analyzer base class."""
+    
+    def test_table_compiled_once_per_class(self):
+        """Test that instances of one analyzer share a single pattern table."""
+        for analyzer_class in ANALYZER_CLASSES:
+            with self.subTest(analyzer=analyzer_class.__name__):
+                first, second = analyzer_class(), analyzer_class()
+                self.assertIs(first.pattern_table(), second.pattern_table())
+                self.assertIs(first.all_patterns, second.all_patterns)
+    
+    def test_tables_not_shared_between_classes(self):
+        """Test that each analyzer class builds its own table."""
+        tables = {id(cls.pattern_table()) for cls in ANALYZER_CLASSES}
+        self.assertEqual(len(tables), len(ANALYZER_CLASSES))
+    
+    def test_subclass_gets_own_table(self):
+        """Test that subclasses with different tables do not reuse the parent's."""
+        class NarrowSQLAnalyzer(SQLAnalyzer):
+            @classmethod
+            def _ordered_patterns(cls):
+                return dict(cls.ORM_PATTERNS)
+        
+        SQLAnalyzer.pattern_table()
+        self.assertEqual(NarrowSQLAnalyzer.pattern_table().error_types, ('n_plus_one',))
+        self.assertIn('syntax_error', SQLAnalyzer.pattern_table().error_types)
+    
+    def test_unknown_error_fallback(self):
+        """Test that every analyzer falls back to its own unknown error type."""
+        expected = {
+            ConfigAnalyzer: 'unknown_config_error',
+            DockerAnalyzer: 'unknown_docker_error',
+            SQLAnalyzer: 'unknown_sql_error',
+            ShellAnalyzer: 'unknown_shell_error',
+            KotlinAnalyzer: 'unknown_kotlin_error',
+            SwiftAnalyzer: 'unknown_swift_error',
+        }
+        
+        for analyzer_class, error_type in expected.items():
+            with self.subTest(analyzer=analyzer_class.__name__):
+                result = analyzer_class().analyze("zzz qqq")
+                self.assertIsInstance(result, analyzer_class.RESULT_CLASS)
+                self.assertEqual(result.error_type, error_type)
+                self.assertEqual(result.severity, 'medium')
+    
+    def test_empty_input(self):
+        """Test that empty input returns None for every analyzer."""
+        for analyzer_class in ANALYZER_CLASSES:
+            with self.subTest(analyzer=analyzer_class.__name__):
+                self.assertIsNone(analyzer_class().analyze(""))
+
+
+
+class TestImmutableResults(unittest.TestCase):
+    """Test frozen results and shared suggestion tables."""
+    
+    def test_results_are_frozen_and_slotted(self):
+        """Test that no analyzer result can be changed or given new attributes."""
+        for analyzer_class in ANALYZER_CLASSES:
+            with self.subTest(analyzer=analyzer_class.__name__):
+                result = analyzer_class().analyze("some error")
+                self.assertFalse(hasattr(result, '__dict__'))
+                with self.assertRaises(FrozenInstanceError):
+                    result.error_type = 'changed'
+    
+    def test_suggestions_shared_and_immutable(self):
+        """Test that results share one suggestion tuple that cannot be mutated."""
+        analyzer = SQLAnalyzer()
+        first = analyzer.analyze("ERROR 1054: Unknown column 'a' in 'field list'")
+        second = analyzer.analyze("ERROR 1054: Unknown column 'b' in 'field list'")
+        
+        self.assertIs(first.suggestions, second.suggestions)
+        self.assertIsInstance(first.suggestions, tuple)
+        with self.assertRaises(FrozenInstanceError):
+            first.suggestions[0].title = 'changed'
+    
+    def test_suggestion_reads_like_dict(self):
+        """Test dict-style access on suggestion records."""
+        suggestion = Suggestion(title='Fix it', code='fix()', confidence=0.9)
+        
+        self.assertEqual(suggestion['title'], 'Fix it')
+        self.assertIn('code', suggestion)
+        self.assertNotIn('code', Suggestion(title='Read the docs'))
+        self.assertEqual(Suggestion(title='Read the docs').get('code', ''), '')
+        with self.assertRaises(KeyError):
+            suggestion['missing']
+    
+    def test_result_to_dict(self):
+        """Test conversion of results to plain data."""
+        result = DockerAnalyzer().analyze("bind: address already in use")
+        data = result_to_dict(result)
+        
+        self.assertEqual(data['error_type'], 'port_already_allocated')
+        self.assertIsInstance(data['suggestions'], list)
+        self.assertIsInstance(data['suggestions'][0], dict)
+        self.assertEqual(data['suggestions'][0]['title'], result.suggestions[0].title)
+
+
+class TestClassify(unittest.TestCase):
+    """Test the classify-only fast path and lazy results."""
+    
+    TEXTS = [
+        "Step 2/3 : COPY package.json .\nCOPY failed: file not found in build context",
+        "Dockerfile:12: Unknown instruction: FORM",
+        "bind: address already in use",
+        "all good",
+    ]
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.analyzer = DockerAnalyzer()
+    
+    def test_classify_agrees_with_analyze(self):
+        """Test that classify gives analyze's error type and severity for every analyzer."""
+        for analyzer_class in ANALYZER_CLASSES:
+            analyzer = analyzer_class()
+            for text in self.TEXTS + ["ERROR 1054: Unknown column 'x'", "Fatal error: Index out of range"]:
+                with self.subTest(analyzer=analyzer_class.__name__, text=text):
+                    result = analyzer.analyze(text)
+                    self.assertEqual(
+                        analyzer.classify(text),
+                        Classification(result.error_type, result.severity)
+                    )
+    
+    def test_classify_skips_extraction(self):
+        """Test that classify never runs the context extractors."""
+        with mock.patch.object(DockerAnalyzer, '_extract_context', side_effect=AssertionError):
+            error_type, severity = self.analyzer.classify(self.TEXTS[0])
+        
+        self.assertEqual((error_type, severity), ('copy_failed', 'high'))
+        self.assertIsNone(self.analyzer.classify(""))
+    
+    def test_lazy_result_extracts_on_first_access(self):
+        """Test that location fields are extracted once, when first read."""
+        with mock.patch.object(DockerAnalyzer, '_extract_context',
+                               wraps=self.analyzer._extract_context) as extract:
+            lazy = self.analyzer.analyze_lazy(self.TEXTS[1])
+            self.assertEqual(lazy.error_type, 'invalid_instruction')
+            self.assertTrue(lazy.suggestions)
+            self.assertEqual(extract.call_count, 0)
+            
+            self.assertEqual(lazy.line, 12)
+            self.assertIsNone(lazy.instruction)
+            self.assertEqual(extract.call_count, 1)
+    
+    def test_lazy_result_resolves_to_full_result(self):
+        """Test that resolving a lazy result gives analyze's result."""
+        for text in self.TEXTS:
+            with self.subTest(text=text):
+                lazy = self.analyzer.analyze_lazy(text)
+                self.assertIsInstance(lazy, LazyResult)
+                self.assertEqual(lazy.resolve(), self.analyzer.analyze(text))
+                self.assertEqual(lazy.explanation, lazy.resolve().explanation)
+    
+    def test_lazy_result_read_only(self):
+        """Test that lazy results cannot be changed."""
+        lazy = self.analyzer.analyze_lazy(self.TEXTS[2])
+        with self.assertRaises(AttributeError):
+            lazy.message = 'changed'
+
+
+class TestFormatSuggestions(unittest.TestCase):
+    """Test memoized rendering of format_suggestions output."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.analyzer = ShellAnalyzer()
+    
+    def test_static_blocks_rendered_once(self):
+        """Test that errors of one type share the rendered blocks."""
+        first = self.analyzer.analyze("./a.sh: line 3: foo: command not found")
+        second = self.analyzer.analyze("./b.sh: line 9: bar: command not found")
+        
+        first_output = self.analyzer.format_suggestions(first)
+        second_output = self.analyzer.format_suggestions(second)
+        
+        self.assertIs(self.analyzer._format_blocks(first, 'en')[1],
+                      self.analyzer._format_blocks(second, 'en')[1])
+        self.assertIn('Script: ./a.sh (Line 3)', first_output)
+        self.assertIn('Script: ./b.sh (Line 9)', second_output)
+        self.assertEqual(len(self.analyzer._formatted), 1)
+    
+    def test_languages_rendered_separately(self):
+        """Test that en and zh output do not share blocks."""
+        result = self.analyzer.analyze("bad substitution")
+        
+        self.assertIn('Smart Suggestions', self.analyzer.format_suggestions(result))
+        self.assertIn('智能建議', self.analyzer.format_suggestions(result, 'zh'))
+        self.assertEqual(self.analyzer.format_suggestions(result, 'fr'),
+                         self.analyzer.format_suggestions(result, 'en'))
+    
+    def test_foreign_result_not_served_stale_blocks(self):
+        """Test that results with other text for a known type are rendered afresh."""
+        result = self.analyzer.analyze("bad substitution")
+        self.analyzer.format_suggestions(result)
+        
+        custom = replace(result, explanation="Custom explanation.",
+                         suggestions=(Suggestion(title='Quote it', code='"$x"', confidence=0.5),))
+        output = self.analyzer.format_suggestions(custom)
+        
+        self.assertIn("Explanation: Custom explanation.", output)
+        self.assertIn("1. Quote it (Confidence: 50%)", output)
+        self.assertNotIn(result.explanation, output)
+
+
+class TestAnalyzeAll(unittest.TestCase):
+    """Test the multi-match entry point."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.analyzer = DockerAnalyzer()
+    
+    def test_every_problem_reported(self):
+        """Test that a record with several problems gets a result for each."""
+        text = ("Dockerfile:4\nunknown flag: --chown\n"
+                "COPY failed: file not found in build context: package.json")
+        results = self.analyzer.analyze_all(text)
+        
+        self.assertEqual([r.error_type for r in results], ['invalid_instruction', 'copy_failed'])
+        self.assertIn(self.analyzer.analyze(text), results)
+        for result in results:
+            self.assertEqual((result.dockerfile_path, result.line, result.message),
+                             ('Dockerfile', 4, text))
+    
+    def test_single_match_agrees_with_analyze(self):
+        """Test that text matching one pattern gets the result analyze gives."""
+        for analyzer_class in ANALYZER_CLASSES:
+            analyzer = analyzer_class()
+            for text in ("Connection refused", "something nobody has seen before"):
+                with self.subTest(analyzer=analyzer_class.__name__, text=text):
+                    results = analyzer.analyze_all(text)
+                    if len(results) == 1:
+                        self.assertEqual(results[0], analyzer.analyze(text))
+    
+    def test_unknown_and_empty(self):
+        """Test the generic result for unmatched text and no result for empty text."""
+        results = self.analyzer.analyze_all("all layers built")
+        
+        self.assertEqual([r.error_type for r in results], ['unknown_docker_error'])
+        self.assertEqual(self.analyzer.analyze_all(""), [])
+
+
+class TestAnalyzeMany(unittest.TestCase):
+    """Test the batch analysis entry point."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.analyzer = SQLAnalyzer()
+    
+    def test_results_in_input_order(self):
+        """Test that batch results match per-call results in input order."""
+        texts = [
+            "ERROR 1054: Unknown column 'username' in 'field list'",
+            "Connection refused",
+            "",
+            "Table 'users' doesn't exist at line 3",
+            "Some random SQL error that doesn't match patterns",
+        ]
+        
+        results = self.analyzer.analyze_many(texts)
+        
+        self.assertEqual(len(results), len(texts))
+        for text, result in zip(texts, results):
+            with self.subTest(text=text):
+                self.assertEqual(result, self.analyzer.analyze(text))
+    
+    def test_repeated_texts_share_frozen_result(self):
+        """Test that repeated texts share one result that cannot be changed."""
+        text = "Duplicate entry 'john@example.com' for key 'email'"
+        first, second = self.analyzer.analyze_many([text, text])
+        
+        self.assertIs(first, second)
+        with self.assertRaises(FrozenInstanceError):
+            second.line = 99
+    
+    def test_accepts_any_iterable(self):
+        """Test that generators are accepted as input."""
+        results = self.analyzer.analyze_many(t for t in ["Connection refused"] * 3)
+        self.assertEqual([r.error_type for r in results], ['connection_refused'] * 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Test cases for the token-bucket rate limiter."""
+
+import threading
+import unittest
+from rate_limit import LocalBackend, Quota, RateLimiter
+
+
+class FakeClock:
+    """Manually advanced clock standing in for time.time."""
+    
+    def __init__(self):
+        """Start the clock at an arbitrary timestamp."""
+        self.now = 1000.0
+    
+    def __call__(self):
+        """Return the current fake time."""
+        return self.now
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test quotas, refills, headers and compaction."""
+    
+    def setUp(self):
+        """Create a limiter with small hourly quotas on a fake clock."""
+        self.clock = FakeClock()
+        self.backend = LocalBackend(shards=4)
+        self.limiter = RateLimiter(Quota(3), Quota(5), backend=self.backend, api_keys={'secret'},
+                                   clock=self.clock, compact_interval=60)
+    
+    def test_burst_then_denied(self):
+        """Test that a full quota passes and the next request is denied."""
+        decisions = [self.limiter.check('10.0.0.1') for _ in range(4)]
+        
+        self.assertEqual([d.allowed for d in decisions], [True, True, True, False])
+        self.assertEqual([d.remaining for d in decisions], [2, 1, 0, 0])
+        # One token comes back every 1200 seconds
+        self.assertEqual(decisions[-1].retry_after, 1200)
+        self.assertEqual(decisions[-1].headers()['Retry-After'], '1200')
+    
+    def test_refill(self):
+        """Test that tokens return at limit / period per second."""
+        for _ in range(3):
+            self.limiter.check('10.0.0.1')
+        self.clock.now += 1200
+        
+        self.assertTrue(self.limiter.check('10.0.0.1').allowed)
+        self.assertFalse(self.limiter.check('10.0.0.1').allowed)
+    
+    def test_headers(self):
+        """Test the documented headers and the reset time of a full bucket."""
+        decision = self.limiter.check('10.0.0.1')
+        
+        self.assertEqual(decision.headers(), {
+            'X-RateLimit-Limit': '3',
+            'X-RateLimit-Remaining': '2',
+            'X-RateLimit-Reset': str(int(self.clock.now) + 1200),
+        })
+    
+    def test_keys_and_clients_separate(self):
+        """Test that API keys get their own, larger quota."""
+        for _ in range(3):
+            self.limiter.check('10.0.0.1')
+        
+        self.assertFalse(self.limiter.check('10.0.0.1').allowed)
+        self.assertFalse(self.limiter.check('10.0.0.1').allowed)
+        decision = self.limiter.check('10.0.0.1', api_key='secret')
+        self.assertTrue(decision.allowed)
+        self.assertEqual(decision.limit, 5)
+        self.assertTrue(self.limiter.check('10.0.0.2').allowed)
+    
+    def test_known_keys(self):
+        """Test the optional API key allow list."""
+        self.assertTrue(RateLimiter().known_key('anything'))
+        self.assertTrue(self.limiter.known_key('secret'))
+        self.assertFalse(self.limiter.known_key('guess'))
+    
+    def test_rotating_keys_limited(self):
+        """Test that keys nobody configured are counted against the client at the anonymous quota."""
+        for limiter in (self.limiter, RateLimiter(Quota(3), Quota(5), clock=self.clock)):
+            with self.subTest(api_keys=limiter.api_keys):
+                decisions = [limiter.check('10.0.0.9', api_key=f'random-{n}') for n in range(4)]
+                
+                self.assertEqual([d.allowed for d in decisions], [True, True, True, False])
+                self.assertEqual(decisions[-1].limit, 3)
+                self.assertFalse(limiter.check('10.0.0.9').allowed)
+    
+    def test_compaction(self):
+        """Test that idle buckets are dropped during checks once they have refilled."""
+        for client in range(20):
+            self.limiter.check(f'10.0.0.{client}')
+        self.assertEqual(len(self.backend), 20)
+        
+        self.clock.now += 600
+        self.limiter.check('10.0.1.1')
+        self.assertEqual(len(self.backend), 21)
+        
+        self.clock.now += 1200
+        self.limiter.check('10.0.1.1')
+        # Only the bucket of the request being checked is left
+        self.assertEqual(len(self.backend), 1)
+    
+    def test_threads(self):
+        """Test that concurrent checks never hand out more than the quota."""
+        limiter = RateLimiter(Quota(500), backend=LocalBackend(shards=2), clock=self.clock)
+        allowed = []
+        
+        def worker():
+            allowed.append(sum(limiter.check('10.0.0.1').allowed for _ in range(200)))
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(sum(allowed), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""Test cases for the lazy analyzer registry."""
+
+import json
+import subprocess
+import sys
+import unittest
+import registry
+from dispatcher import Dispatcher
+from sql_analyzer import SQLAnalyzer
+
+
+def modules_after(code: str) -> list:
+    """Run code in a fresh interpreter and return the analyzer modules it imported."""
+    script = code + "\nimport json, sys\nprint(json.dumps(sorted(m for m in sys.modules if m.endswith('_analyzer'))))"
+    output = subprocess.run([sys.executable, '-c', script], check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+class TestRegistry(unittest.TestCase):
+    """Test lazy imports and shared analyzers."""
+    
+    def test_hosts_import_no_analyzer(self):
+        """Test that the server, worker pool and dispatcher modules load no analyzer."""
+        self.assertEqual(modules_after("import analysis_server, dispatcher, parallel_runner"), [])
+    
+    def test_one_language_imports_one_module(self):
+        """Test that getting one analyzer imports only its own module."""
+        self.assertEqual(modules_after("import registry; registry.get_analyzer('sql')"),
+                         ['sql_analyzer'])
+    
+    def test_shared_instance(self):
+        """Test that get_analyzer builds one analyzer per language and load_analyzer a new one."""
+        analyzer = registry.get_analyzer('sql')
+        
+        self.assertIsInstance(analyzer, SQLAnalyzer)
+        self.assertIs(registry.get_analyzer('sql'), analyzer)
+        self.assertIsNot(registry.load_analyzer('sql'), analyzer)
+        self.assertIn('sql', registry.loaded_languages())
+    
+    def test_languages(self):
+        """Test that every registered language names its analyzer's LANGUAGE."""
+        self.assertEqual(len(registry.languages()), 6)
+        for language in registry.languages():
+            with self.subTest(language=language):
+                self.assertEqual(registry.analyzer_class(language).LANGUAGE, language)
+    
+    def test_unknown_language(self):
+        """Test that unknown languages are rejected."""
+        with self.assertRaises(ValueError):
+            registry.get_analyzer('cobol')
+    
+    def test_dispatcher_uses_shared_analyzers(self):
+        """Test that a default dispatcher routes with the registry's analyzers."""
+        dispatcher = Dispatcher()
+        self.assertIs(dispatcher.analyzers['sql'], registry.get_analyzer('sql'))
+        self.assertEqual(dispatcher.route("ERROR 1054 (42S22): Unknown column 'x' in MySQL"),
+                         {'sql': 5})
+
+
+if __name__ == '__main__':
+    unittest.main()
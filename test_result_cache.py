@@ -0,0 +1,145 @@
+"""Test cases for error fingerprints and the result cache."""
+
+import unittest
+from fingerprint import fingerprint
+from result_cache import ResultCache
+from sql_analyzer import SQLAnalyzer
+from kotlin_analyzer import KotlinAnalyzer
+from docker_analyzer import DockerAnalyzer
+
+
+class FakeClock:
+    """Manually advanced clock for TTL tests."""
+    
+    def __init__(self):
+        """Start the clock at zero."""
+        self.now = 0.0
+    
+    def __call__(self):
+        """Return the current fake time."""
+        return self.now
+
+
+class TestFingerprint(unittest.TestCase):
+    """Test normalization of error text."""
+    
+    def test_numbers_and_quoted_identifiers(self):
+        """Test that codes, numbers and quoted names are masked."""
+        self.assertEqual(
+            fingerprint("ERROR 1054: Unknown column 'usernme' in 'field list'"),
+            fingerprint("ERROR 1146: Unknown column 'user_id' in 'field list'")
+        )
+    
+    def test_paths_keep_basename(self):
+        """Test that directories are masked but file names are kept."""
+        self.assertEqual(
+            fingerprint("e: /src/main/Foo.kt: (25, 35): Unresolved reference: bar"),
+            fingerprint("e: /home/ci/app/Foo.kt: (3, 1): Unresolved reference: bar")
+        )
+        self.assertNotEqual(fingerprint("/app/Foo.kt:1"), fingerprint("/app/Foo.swift:1"))
+        self.assertIn('.circleci/', fingerprint("Error in config file .circleci/config.yml"))
+    
+    def test_hex_ids(self):
+        """Test that container ids and hashes are masked."""
+        self.assertEqual(
+            fingerprint("No such container: 3f4e5a6b7c8d"),
+            fingerprint("No such container: 9a8b7c6d5e4f")
+        )
+    
+    def test_pattern_words_kept(self):
+        """Test that text the patterns match on survives normalization."""
+        self.assertIn("'EOF'", fingerprint("Expecting 'EOF', got '}'"))
+        self.assertIn("N+1", fingerprint("N+1 query problem detected"))
+
+
+class TestResultCache(unittest.TestCase):
+    """Test the bounded classification cache."""
+    
+    def test_cached_results_match_uncached(self):
+        """Test that analysis through the cache gives the same results."""
+        cached = SQLAnalyzer(cache=ResultCache())
+        plain = SQLAnalyzer()
+        texts = [
+            "ERROR 1054: Unknown column 'a' in 'field list'",
+            "ERROR 1054: Unknown column 'b' in 'field list'",
+            "syntax error at line 3",
+            "syntax error at line 7",
+            "nothing to see",
+        ]
+        
+        for text in texts + texts:
+            self.assertEqual(cached.analyze(text), plain.analyze(text))
+    
+    def test_context_reattached(self):
+        """Test that cache hits keep the file and line of their own text."""
+        analyzer = KotlinAnalyzer(cache=ResultCache())
+        first = analyzer.analyze("MainActivity.kt:45: Unresolved reference: textView")
+        second = analyzer.analyze("MainActivity.kt:99: Unresolved reference: textView")
+        
+        self.assertEqual(analyzer.cache.hits, 1)
+        self.assertEqual(second.error_type, first.error_type)
+        self.assertEqual((first.line, second.line), (45, 99))
+        self.assertIn(':99:', second.message)
+    
+    def test_counters(self):
+        """Test hit, miss and eviction counting."""
+        cache = ResultCache(maxsize=2)
+        analyzer = DockerAnalyzer(cache=cache)
+        
+        analyzer.analyze("bind: address already in use")
+        analyzer.analyze("bind: address already in use")
+        analyzer.analyze("no space left on device")
+        analyzer.analyze("pull access denied")
+        
+        self.assertEqual(cache.stats(), {
+            'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2
+        })
+    
+    def test_lru_order(self):
+        """Test that recently used entries survive eviction."""
+        cache = ResultCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+        
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+    
+    def test_ttl_expiry(self):
+        """Test that entries expire after the time-to-live."""
+        clock = FakeClock()
+        cache = ResultCache(ttl=10, clock=clock)
+        cache.put('key', 'value')
+        
+        clock.now = 9
+        self.assertEqual(cache.get('key'), 'value')
+        clock.now = 11
+        self.assertIsNone(cache.get('key'))
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(cache), 0)
+    
+    def test_shared_between_analyzers(self):
+        """Test that one cache keeps analyzers apart for the same text."""
+        cache = ResultCache()
+        text = "Permission denied"
+        
+        sql = SQLAnalyzer(cache=cache).analyze(text)
+        docker = DockerAnalyzer(cache=cache).analyze(text)
+        
+        self.assertEqual(sql.error_type, 'permission_denied')
+        self.assertEqual(docker.error_type, DockerAnalyzer().analyze(text).error_type)
+        self.assertEqual(cache.misses, 2)
+    
+    def test_unmatched_text_cached(self):
+        """Test that texts matching no pattern are cached too."""
+        analyzer = SQLAnalyzer(cache=ResultCache())
+        analyzer.analyze("mystery 1")
+        result = analyzer.analyze("mystery 2")
+        
+        self.assertEqual(analyzer.cache.hits, 1)
+        self.assertEqual(result.error_type, 'unknown_sql_error')
+
+
+if __name__ == '__main__':
+    unittest.main()
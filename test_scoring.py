@@ -0,0 +1,135 @@
+"""Test cases for match scores of analyzer results."""
+
+import re
+import unittest
+from unittest import mock
+from benchmarks.corpus import iter_corpus, load_samples
+from config_analyzer import ConfigAnalyzer
+from docker_analyzer import DockerAnalyzer
+from kotlin_analyzer import KotlinAnalyzer
+from pattern_engine import PatternTable
+from result_cache import ResultCache
+from scoring import SIGNAL_WEIGHTS, context_score, match_score, score
+from shell_analyzer import ShellAnalyzer
+from sql_analyzer import SQLAnalyzer
+from swift_analyzer import SwiftAnalyzer
+
+
+ANALYZER_CLASSES = [
+    ConfigAnalyzer, DockerAnalyzer, SQLAnalyzer,
+    ShellAnalyzer, KotlinAnalyzer, SwiftAnalyzer
+]
+
+
+class TestSignals(unittest.TestCase):
+    """Test the signals a score combines."""
+    
+    def test_weights_sum_to_one(self):
+        """Test that a score cannot exceed 1."""
+        self.assertAlmostEqual(sum(SIGNAL_WEIGHTS.values()), 1.0)
+    
+    def test_longer_match_scores_higher(self):
+        """Test that a pattern pinning down more of the message scores higher."""
+        text = "error: disk full"
+        self.assertGreater(match_score(0.5, re.search("disk full", text), text),
+                           match_score(0.5, re.search("full", text), text))
+    
+    def test_span_saturates(self):
+        """Test that matches beyond the saturation length gain nothing from their span."""
+        long, longer = "x" * 40, "x" * 80
+        self.assertAlmostEqual(match_score(0.0, re.match(long, long), long),
+                               match_score(0.0, re.match(longer, longer), longer))
+    
+    def test_early_match_scores_higher(self):
+        """Test that a match in the headline beats the same match further down."""
+        text = "connection refused\nretrying\nconnection refused"
+        first, last = re.finditer("connection refused", text)
+        self.assertGreater(match_score(0.5, first, text), match_score(0.5, last, text))
+    
+    def test_buried_match_scores_lower(self):
+        """Test that a keyword in a long unrelated line scores below one alone on its line."""
+        alone = "INFO request served\ntimeout"
+        buried = "INFO request served in 1200 ms, timeout"
+        self.assertGreater(match_score(0.5, re.search("timeout", alone), alone),
+                           match_score(0.5, re.search("timeout", buried), buried))
+    
+    def test_context_score(self):
+        """Test that context scores the share of fields found."""
+        self.assertEqual(context_score({}), 0.0)
+        self.assertEqual(context_score({'file_path': 'a.kt', 'line': None}), 0.5)
+        self.assertEqual(context_score({'file_path': 'a.kt', 'line': 3}), 1.0)
+    
+    def test_context_raises_score(self):
+        """Test that found context fields add to the score."""
+        text = "Unresolved reference: foo"
+        strength = match_score(0.9, re.search("Unresolved reference", text), text)
+        self.assertGreater(score(strength, {'file_path': 'a.kt', 'line': 3}),
+                           score(strength, {'file_path': None, 'line': None}))
+
+
+class TestResultScores(unittest.TestCase):
+    """Test the scores analyzers attach to their results."""
+    
+    def test_scores_in_range(self):
+        """Test that recognized errors score in (0, 1] and unknown ones 0."""
+        for analyzer_class in ANALYZER_CLASSES:
+            analyzer = analyzer_class()
+            for text in load_samples(analyzer.LANGUAGE):
+                with self.subTest(analyzer=analyzer_class.__name__, text=text):
+                    result = analyzer.analyze(text)
+                    if result.error_type == analyzer.UNKNOWN_ERROR_TYPE:
+                        self.assertEqual(result.score, 0.0)
+                    else:
+                        self.assertGreater(result.score, 0.0)
+                        self.assertLessEqual(result.score, 1.0)
+    
+    def test_cached_and_lazy_scores_the_same(self):
+        """Test that cached and lazy classifications score like a table scan."""
+        analyzer = SQLAnalyzer()
+        for text in load_samples('sql'):
+            with self.subTest(text=text):
+                expected = analyzer.analyze(text).score
+                cached = SQLAnalyzer(cache=ResultCache())
+                self.assertEqual(cached.analyze(text).score, expected)
+                self.assertEqual(cached.analyze(text).score, expected)
+                self.assertEqual(analyzer.analyze_lazy(text).score, expected)
+    
+    def test_cache_hits_scored_by_their_own_match(self):
+        """Test that cache hits search only the cached type's pattern and score their own text."""
+        cached = KotlinAnalyzer(cache=ResultCache())
+        plain = KotlinAnalyzer()
+        text = "src/MainActivity.kt:45: error: Unresolved reference: textView"
+        # Shares the fingerprint, but the match starts later in a longer text
+        variant = "app/src/main/java/com/example/MainActivity.kt:7: error: Unresolved reference: textView"
+        expected = cached.analyze(text)
+        
+        with mock.patch.object(PatternTable, 'find', side_effect=AssertionError):
+            self.assertEqual(cached.analyze(text), expected)
+            result = cached.analyze(variant)
+        self.assertEqual(result, plain.analyze(variant))
+        self.assertNotEqual(result.score, expected.score)
+    
+    def test_cached_scores_match_uncached(self):
+        """Test that a cache changes no score of texts it classifies alike."""
+        for analyzer_class in ANALYZER_CLASSES:
+            plain, cached = analyzer_class(), analyzer_class(cache=ResultCache())
+            for text in iter_corpus(plain.LANGUAGE, 2000):
+                expected, result = plain.analyze(text), cached.analyze(text)
+                if result.error_type == expected.error_type:
+                    with self.subTest(analyzer=analyzer_class.__name__, text=text):
+                        self.assertEqual(result.score, expected.score)
+    
+    def test_analyze_all_ranked_by_score(self):
+        """Test that multi-match results come best-scoring first."""
+        analyzer = DockerAnalyzer()
+        results = analyzer.analyze_all(
+            "Dockerfile:4\nunknown flag: --chown\n"
+            "COPY failed: file not found in build context: package.json"
+        )
+        
+        self.assertEqual(len(results), 2)
+        self.assertGreaterEqual(results[0].score, results[1].score)
+
+
+if __name__ == '__main__':
+    unittest.main()
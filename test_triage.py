@@ -0,0 +1,113 @@
+"""Test cases for bulk log triage."""
+
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from dispatcher import Dispatcher
+from triage import LogFile, ResultWriter, detect_language, expand_paths, main, read_log, triage
+
+DOCKER_LOG = """Step 1/3 : FROM node:16-alpine
+Step 2/3 : COPY package.json .
+COPY failed: file not found in build context: package.json
+Step 3/3 : RUN npm install
+The command '/bin/sh -c npm install' returned a non-zero code: 1
+"""
+
+GRADLE_LOG = """> Task :app:compileDebugKotlin
+e: /src/main/java/com/example/UserViewModel.kt: (25, 35): Type mismatch: inferred type is String? but String was expected
+E/AndroidRuntime: FATAL EXCEPTION: main
+    java.lang.NullPointerException
+        at com.example.app.MainActivity.onCreate(MainActivity.kt:45)
+BUILD FAILED in 3s
+"""
+
+
+class TestTriage(unittest.TestCase):
+    """Test finding, splitting and analyzing the records of many files."""
+    
+    def setUp(self):
+        """Write a small tree of logs."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.root = self.directory.name
+        os.makedirs(os.path.join(self.root, 'app'))
+        self.docker = self.write('docker.log', DOCKER_LOG)
+        self.gradle = self.write(os.path.join('app', 'gradle.log'), GRADLE_LOG)
+        self.write('notes.txt', 'nothing to see\n')
+    
+    def write(self, name: str, text: str) -> str:
+        path = os.path.join(self.root, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+    
+    def test_expand_paths(self):
+        """Test that directories are searched recursively and named files kept."""
+        notes = os.path.join(self.root, 'notes.txt')
+        
+        self.assertEqual(expand_paths([self.root]), sorted([self.docker, self.gradle]))
+        self.assertEqual(expand_paths([notes, self.docker, self.docker]), sorted([notes, self.docker]))
+        self.assertEqual(expand_paths([os.path.join(self.root, '*.txt')]), [notes])
+        with self.assertRaises(FileNotFoundError):
+            expand_paths([os.path.join(self.root, 'missing.log')])
+    
+    def test_detect_language(self):
+        """Test that a file's language comes from its record start lines."""
+        dispatcher = Dispatcher()
+        
+        self.assertEqual(detect_language(DOCKER_LOG, dispatcher), 'docker')
+        self.assertEqual(detect_language(GRADLE_LOG, dispatcher), 'kotlin')
+        self.assertIsNone(detect_language('nothing to see\n', dispatcher))
+    
+    def test_read_log(self):
+        """Test that a file is split into its error records, in chunks."""
+        log = LogFile(self.gradle)
+        chunks = list(read_log(log, None, Dispatcher(), chunksize=1))
+        
+        self.assertEqual(log.language, 'kotlin')
+        self.assertEqual(len(chunks), 2)
+        self.assertIn('MainActivity.kt:45', chunks[1][0])
+        self.assertEqual((log.records, log.size), (2, len(GRADLE_LOG)))
+    
+    def test_read_log_streams_blocks(self):
+        """Test that reading in small blocks gives the records of reading whole files."""
+        path = self.write('big.log', DOCKER_LOG * 50)
+        whole = [record for chunk in read_log(LogFile(path), 'docker', None) for record in chunk]
+        
+        log = LogFile(path)
+        chunks = list(read_log(log, 'docker', None, chunksize=7, block_chars=64))
+        self.assertEqual([record for chunk in chunks for record in chunk], whole)
+        self.assertEqual(len(whole), 100)
+        self.assertEqual(max(map(len, chunks)), 7)
+        self.assertEqual(log.records, 100)
+    
+    def test_jsonl_rows_in_order(self):
+        """Test that every record gets a row, in file and record order."""
+        output = io.StringIO()
+        stats = triage(expand_paths([self.root]), ResultWriter(output), workers=1, chunksize=1)
+        rows = [json.loads(line) for line in output.getvalue().splitlines()]
+        
+        self.assertEqual((stats.files, stats.records), (2, 4))
+        self.assertEqual([(row['file'], row['record']) for row in rows],
+                         [(self.gradle, 1), (self.gradle, 2), (self.docker, 1), (self.docker, 2)])
+        self.assertEqual(rows[2]['language'], 'docker')
+        self.assertEqual(rows[2]['error_type'], 'copy_failed')
+        self.assertIn('records/s', stats.summary())
+    
+    def test_csv_output(self):
+        """Test the CLI writing CSV to a file."""
+        path = os.path.join(self.root, 'out.csv')
+        self.assertEqual(main([self.docker, '--format', 'csv', '-o', path,
+                               '--workers', '1', '--quiet']), 0)
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        
+        self.assertEqual([row['record'] for row in rows], ['1', '2'])
+        self.assertEqual({row['language'] for row in rows}, {'docker'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,357 @@
+"""Bulk triage of log files: find every error record and analyze it.
+
+Takes files, glob patterns and directories. Files are streamed in blocks and
+split into error records on a thread pool; records are routed to their
+analyzer and analyzed in chunks on a ``ParallelRunner`` process pool as soon
+as each chunk fills. Results are written in input order as JSON lines or CSV,
+and a summary of throughput and where the time went is printed to stderr.
+
+Run from the repository root:
+
+    python -m triage logs/ 'build/**/*.txt' app.log [--format csv] [--output results.csv]
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Deque, Dict, Generator, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from dispatcher import Dispatcher
+from log_stream import (BLOCK_CHARS, MAX_RECORD_CHARS, RECORD_START, count_record_starts,
+                        iter_block_records, read_blocks)
+from parallel_runner import ParallelRunner
+
+# Files matched inside directories unless --pattern says otherwise
+DEFAULT_PATTERN = '*.log'
+
+# Records sent to a worker per task
+DEFAULT_CHUNKSIZE = 256
+
+# Characters of a file's head used to detect its language
+DETECT_CHARS = 64 * 1024
+
+# Chunks each reading thread may hold ahead of the workers
+CHUNKS_AHEAD = 4
+
+CSV_FIELDS = ('file', 'record', 'language', 'error_type', 'severity', 'explanation', 'message')
+
+
+@dataclass
+class LogFile:
+    """One file being triaged, with the cost of reading and splitting it so far."""
+    path: str
+    language: Optional[str] = None
+    size: int = 0
+    records: int = 0
+    read_seconds: float = 0.0
+    segment_seconds: float = 0.0
+
+
+@dataclass
+class TriageStats:
+    """Counters and time split of one triage run."""
+    files: int = 0
+    bytes: int = 0
+    records: int = 0
+    read_seconds: float = 0.0
+    segment_seconds: float = 0.0
+    match_seconds: float = 0.0
+    write_seconds: float = 0.0
+    elapsed: float = 0.0
+    
+    def summary(self) -> str:
+        """Return a human-readable report of throughput and time split."""
+        elapsed = self.elapsed or 1e-9
+        return (
+            f"{self.files} files, {self.bytes / 1e6:.1f} MB, {self.records} records "
+            f"in {self.elapsed:.2f}s: {self.records / elapsed:,.0f} records/s, "
+            f"{self.bytes / 1e6 / elapsed:.1f} MB/s\n"
+            f"time: read {self.read_seconds:.2f}s, segment {self.segment_seconds:.2f}s "
+            f"(I/O threads), match {self.match_seconds:.2f}s (worker CPU), "
+            f"write {self.write_seconds:.2f}s"
+        )
+
+
+def expand_paths(inputs: Iterable[str], pattern: str = DEFAULT_PATTERN) -> List[str]:
+    """Resolve files, globs and directories into a sorted list of distinct files.
+    
+    Directories are searched recursively for files matching ``pattern``;
+    named files are always included. Inputs that match nothing raise
+    FileNotFoundError.
+    """
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            found = glob.glob(os.path.join(glob.escape(item), '**', pattern), recursive=True)
+        elif os.path.isfile(item):
+            found = [item]
+        else:
+            found = glob.glob(item, recursive=True)
+        
+        found = [path for path in found if os.path.isfile(path)]
+        if not found and not os.path.isdir(item):
+            raise FileNotFoundError(f"No log files match: {item}")
+        paths.update(os.path.normpath(path) for path in found)
+    return sorted(paths)
+
+
+def detect_language(sample: str, dispatcher: Dispatcher) -> Optional[str]:
+    """Pick the language whose record start lines occur most often in a sample.
+    
+    Start patterns overlap (a bare ``ERROR`` line starts SQL and Docker
+    records alike), so ties go to the language the dispatcher's routing
+    signals score highest. Returns None when no line starts a record.
+    """
+    hits = {language: count_record_starts(sample, language) for language in dispatcher.analyzers}
+    best = max(hits.values())
+    if not best:
+        return None
+    tied = [language for language in hits if hits[language] == best]
+    if len(tied) == 1:
+        return tied[0]
+    scores = dispatcher.route(sample)
+    return max(tied, key=lambda language: scores.get(language, 0))
+
+
+def read_log(log: LogFile, language: Optional[str], dispatcher: Optional[Dispatcher],
+             chunksize: int = DEFAULT_CHUNKSIZE, max_record_chars: int = MAX_RECORD_CHARS,
+             block_chars: int = BLOCK_CHARS) -> Iterator[List[str]]:
+    """Stream a file's error records in chunks of up to ``chunksize`` (runs on an I/O thread).
+    
+    The file is read in blocks of ``block_chars``, so memory holds one block
+    and one chunk however large the file is. ``log`` gets the language and
+    the counters as reading goes.
+    """
+    with open(log.path, encoding='utf-8', errors='replace') as stream:
+        log.size = os.fstat(stream.fileno()).st_size
+        busy = time.perf_counter()
+        
+        def timed_blocks() -> Iterator[str]:
+            blocks = read_blocks(stream, block_chars)
+            while True:
+                start = time.perf_counter()
+                block = next(blocks, None)
+                log.read_seconds += time.perf_counter() - start
+                if block is None:
+                    return
+                yield block
+        
+        blocks = timed_blocks()
+        head = next(blocks, '')
+        log.language = language or detect_language(head[:DETECT_CHARS], dispatcher)
+        if log.language is None:
+            log.segment_seconds = time.perf_counter() - busy - log.read_seconds
+            return
+        
+        chunk = []
+        spent = 0.0
+        for record in iter_block_records(chain((head,), blocks), log.language, max_record_chars):
+            chunk.append(record)
+            if len(chunk) >= chunksize:
+                log.records += len(chunk)
+                spent += time.perf_counter() - busy
+                yield chunk
+                chunk = []
+                busy = time.perf_counter()
+        
+        log.records += len(chunk)
+        log.segment_seconds = spent + time.perf_counter() - busy - log.read_seconds
+        if chunk:
+            yield chunk
+
+
+def _pump(chunks: Generator[List[str], None, None], out: 'queue.Queue', stop: threading.Event) -> None:
+    """Move chunks into a bounded queue, then None or the error raised (runs on an I/O thread)."""
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+    
+    try:
+        for chunk in chunks:
+            if not put(chunk):
+                return
+    except Exception as e:
+        put(e)
+    else:
+        put(None)
+    finally:
+        chunks.close()
+
+
+def _drain(chunks: 'queue.Queue') -> Iterator[List[str]]:
+    """Yield the chunks a pump sends until it finishes, raising its error if any."""
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            return
+        if isinstance(chunk, Exception):
+            raise chunk
+        yield chunk
+
+
+def _read_ahead(executor: ThreadPoolExecutor, paths: List[str], window: int,
+                stop: threading.Event, *args: Any) -> Iterator[Tuple[LogFile, Iterator[List[str]]]]:
+    """Yield each file with its chunks in input order, reading up to ``window`` files at once.
+    
+    Each file's reader stops once ``CHUNKS_AHEAD`` chunks wait to be taken,
+    so read-ahead is bounded by chunks, not by file sizes.
+    """
+    remaining = iter(paths)
+    pending: Deque[Tuple[LogFile, 'queue.Queue']] = deque()
+    
+    def start_next() -> None:
+        path = next(remaining, None)
+        if path is not None:
+            log, chunks = LogFile(path), queue.Queue(CHUNKS_AHEAD)
+            executor.submit(_pump, read_log(log, *args), chunks, stop)
+            pending.append((log, chunks))
+    
+    for _ in range(window):
+        start_next()
+    while pending:
+        log, chunks = pending.popleft()
+        start_next()
+        yield log, _drain(chunks)
+
+
+class ResultWriter:
+    """Write triage rows as JSON lines or CSV."""
+    
+    def __init__(self, stream: TextIO, output_format: str = 'jsonl'):
+        """Wrap an open text stream; CSV writes its header immediately."""
+        if output_format not in ('jsonl', 'csv'):
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self.stream = stream
+        self.format = output_format
+        if output_format == 'csv':
+            self._csv = csv.DictWriter(stream, CSV_FIELDS, extrasaction='ignore')
+            self._csv.writeheader()
+    
+    def write(self, row: Dict[str, Any]) -> None:
+        """Write one result row."""
+        if self.format == 'csv':
+            self._csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+def triage(paths: List[str], writer: ResultWriter, language: Optional[str] = None,
+           io_threads: int = 4, workers: Optional[int] = None,
+           chunksize: int = DEFAULT_CHUNKSIZE) -> TriageStats:
+    """Analyze every error record of the given files and write one row per record.
+    
+    Records without a fixed ``language`` are routed one by one, so a file
+    mixing tools still gets each record analyzed by the right analyzer.
+    Memory stays bounded by the chunks read ahead (``CHUNKS_AHEAD`` per I/O
+    thread, plus one block each) and the chunks waiting for workers, never
+    by the size of a file.
+    """
+    stats = TriageStats()
+    start = time.perf_counter()
+    cpu_before = os.times()
+    # Only needed to detect the language of each file
+    dispatcher = Dispatcher() if language is None else None
+    languages = [language] if language is not None else None
+    
+    runner = ParallelRunner(languages, workers)
+    max_pending = runner.workers * 2
+    pending: Deque[Tuple[str, int, Future]] = deque()
+    stop = threading.Event()
+    
+    def write_next() -> None:
+        path, first, future = pending.popleft()
+        pairs = future.result()
+        write_start = time.perf_counter()
+        for number, (record_language, result) in enumerate(pairs, first):
+            if result is None:
+                continue
+            writer.write({'file': path, 'record': number, 'language': record_language, **result})
+        stats.write_seconds += time.perf_counter() - write_start
+    
+    try:
+        with ThreadPoolExecutor(io_threads) as io:
+            try:
+                for log, chunks in _read_ahead(io, paths, io_threads, stop, language, dispatcher,
+                                               chunksize):
+                    first = 1
+                    for chunk in chunks:
+                        pending.append((log.path, first, runner.submit_many(
+                            (language, record) for record in chunk
+                        )))
+                        first += len(chunk)
+                        if len(pending) >= max_pending:
+                            write_next()
+                    
+                    stats.files += 1
+                    stats.bytes += log.size
+                    stats.records += log.records
+                    stats.read_seconds += log.read_seconds
+                    stats.segment_seconds += log.segment_seconds
+            finally:
+                # Readers blocked on a full queue give up instead of holding the pool open
+                stop.set()
+        while pending:
+            write_next()
+    finally:
+        runner.close()
+    
+    # Workers have exited, so their CPU time now counts as our children's
+    cpu_after = os.times()
+    stats.match_seconds = ((cpu_after.children_user - cpu_before.children_user)
+                           + (cpu_after.children_system - cpu_before.children_system))
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('inputs', nargs='+', help='log files, glob patterns or directories')
+    parser.add_argument('--language', choices=sorted(RECORD_START),
+                        help='analyze every record as this language instead of routing it')
+    parser.add_argument('--pattern', default=DEFAULT_PATTERN,
+                        help=f'file pattern searched in directories (default {DEFAULT_PATTERN})')
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl', help='output format')
+    parser.add_argument('--output', '-o', help='output file (default stdout)')
+    parser.add_argument('--io-threads', type=int, default=4, help='threads reading files')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='analysis worker processes (default: CPU count)')
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNKSIZE,
+                        help='records per worker task')
+    parser.add_argument('--quiet', '-q', action='store_true', help='do not print the summary')
+    args = parser.parse_args(argv)
+    
+    try:
+        paths = expand_paths(args.inputs, args.pattern)
+    except FileNotFoundError as e:
+        parser.error(str(e))
+    
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        stats = triage(paths, ResultWriter(output, args.format), args.language,
+                       args.io_threads, args.workers, args.chunksize)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    
+    if not args.quiet:
+        print(stats.summary(), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Minimal server-side WebSocket protocol (RFC 6455) over asyncio streams."""
+
+import asyncio
+import base64
+import hashlib
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+# Key suffix fixed by RFC 6455 for the Sec-WebSocket-Accept header
+HANDSHAKE_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+# Close codes
+CLOSE_NORMAL = 1000
+CLOSE_GOING_AWAY = 1001
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_INVALID_DATA = 1007
+CLOSE_POLICY_VIOLATION = 1008
+CLOSE_TOO_BIG = 1009
+CLOSE_INTERNAL_ERROR = 1011
+
+# Largest message accepted, after reassembling fragments
+MAX_MESSAGE_BYTES = 1024 * 1024
+
+
+class WebSocketError(Exception):
+    """Protocol failure that closes the connection with a close code."""
+    
+    def __init__(self, code: int, reason: str):
+        """Initialize the error with the close code to send."""
+        super().__init__(reason)
+        self.code = code
+
+
+def accept_key(key: str) -> str:
+    """Return the Sec-WebSocket-Accept value for a client's Sec-WebSocket-Key."""
+    digest = hashlib.sha1((key + HANDSHAKE_GUID).encode('ascii')).digest()
+    return base64.b64encode(digest).decode('ascii')
+
+
+def handshake_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """Validate an upgrade request's headers and return the 101 response headers.
+    
+    ``headers`` uses lowercase names. Raises ValueError naming the first
+    problem when the request is not a valid WebSocket handshake.
+    """
+    if headers.get('upgrade', '').lower() != 'websocket':
+        raise ValueError("Upgrade: websocket header required")
+    if 'upgrade' not in headers.get('connection', '').lower():
+        raise ValueError("Connection: Upgrade header required")
+    if headers.get('sec-websocket-version') != '13':
+        raise ValueError("Sec-WebSocket-Version: 13 required")
+    
+    key = headers.get('sec-websocket-key', '')
+    try:
+        if len(base64.b64decode(key, validate=True)) != 16:
+            raise ValueError
+    except ValueError:
+        raise ValueError("Invalid Sec-WebSocket-Key")
+    
+    return {
+        'Upgrade': 'websocket',
+        'Connection': 'Upgrade',
+        'Sec-WebSocket-Accept': accept_key(key),
+    }
+
+
+def encode_frame(opcode: int, payload: bytes, fin: bool = True, mask: bool = False) -> bytes:
+    """Encode one frame; servers send unmasked frames, clients must mask."""
+    head = bytearray([(0x80 if fin else 0) | opcode])
+    length = len(payload)
+    mask_bit = 0x80 if mask else 0
+    if length < 126:
+        head.append(mask_bit | length)
+    elif length < 1 << 16:
+        head.append(mask_bit | 126)
+        head += struct.pack('!H', length)
+    else:
+        head.append(mask_bit | 127)
+        head += struct.pack('!Q', length)
+    
+    if mask:
+        key = os.urandom(4)
+        return bytes(head) + key + _apply_mask(payload, key)
+    return bytes(head) + payload
+
+
+def _apply_mask(payload: bytes, key: bytes) -> bytes:
+    """XOR a payload with a 4-byte masking key."""
+    # One big-integer XOR is much faster than a Python loop over the bytes
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    return (int.from_bytes(payload, 'big') ^ int.from_bytes(repeated, 'big')).to_bytes(len(payload), 'big')
+
+
+async def read_frame(reader: asyncio.StreamReader, max_payload: int = MAX_MESSAGE_BYTES,
+                     require_mask: bool = True) -> Tuple[bool, int, bytes]:
+    """Read one frame and return (fin, opcode, unmasked payload)."""
+    first, second = await reader.readexactly(2)
+    if first & 0x70:
+        raise WebSocketError(CLOSE_PROTOCOL_ERROR, "Reserved bits set")
+    fin, opcode = bool(first & 0x80), first & 0x0F
+    masked, length = bool(second & 0x80), second & 0x7F
+    
+    if masked != require_mask:
+        raise WebSocketError(CLOSE_PROTOCOL_ERROR, "Client frames must be masked" if require_mask
+                             else "Server frames must not be masked")
+    if length == 126:
+        length, = struct.unpack('!H', await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack('!Q', await reader.readexactly(8))
+    
+    if opcode >= OP_CLOSE and (length > 125 or not fin):
+        raise WebSocketError(CLOSE_PROTOCOL_ERROR, "Invalid control frame")
+    if length > max_payload:
+        raise WebSocketError(CLOSE_TOO_BIG, f"Frame exceeds {max_payload} bytes")
+    
+    key = await reader.readexactly(4) if masked else None
+    payload = await reader.readexactly(length)
+    return fin, opcode, _apply_mask(payload, key) if key else payload
+
+
+class WebSocket:
+    """One WebSocket connection: message reassembly, control frames and closing.
+    
+    ``receive`` answers pings and returns whole text or binary messages, so
+    callers only see data. Messages larger than ``max_message_bytes`` close
+    the connection with 1009, which bounds the memory a peer can make the
+    server hold. The same class serves as a client with ``client=True``.
+    """
+    
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                 max_message_bytes: int = MAX_MESSAGE_BYTES, client: bool = False):
+        """Wrap the streams of a connection whose handshake is done."""
+        self.reader = reader
+        self.writer = writer
+        self.max_message_bytes = max_message_bytes
+        self.client = client
+        self.close_code: Optional[int] = None
+        self._close_sent = False
+    
+    async def receive(self) -> Optional[Tuple[int, bytes]]:
+        """Return the next (OP_TEXT or OP_BINARY, data) message, or None once closed."""
+        opcode, parts, size = None, [], 0
+        while True:
+            fin, frame_opcode, payload = await read_frame(
+                self.reader, self.max_message_bytes, require_mask=not self.client
+            )
+            
+            if frame_opcode == OP_PING:
+                self.writer.write(encode_frame(OP_PONG, payload, mask=self.client))
+                continue
+            if frame_opcode == OP_PONG:
+                continue
+            if frame_opcode == OP_CLOSE:
+                self.close_code = struct.unpack('!H', payload[:2])[0] if len(payload) >= 2 else CLOSE_NORMAL
+                return None
+            
+            if frame_opcode == OP_CONTINUATION:
+                if opcode is None:
+                    raise WebSocketError(CLOSE_PROTOCOL_ERROR, "Continuation without a message")
+            elif frame_opcode in (OP_TEXT, OP_BINARY):
+                if opcode is not None:
+                    raise WebSocketError(CLOSE_PROTOCOL_ERROR, "New message inside a fragmented one")
+                opcode = frame_opcode
+            else:
+                raise WebSocketError(CLOSE_PROTOCOL_ERROR, f"Unknown opcode {frame_opcode}")
+            
+            size += len(payload)
+            if size > self.max_message_bytes:
+                raise WebSocketError(CLOSE_TOO_BIG, f"Message exceeds {self.max_message_bytes} bytes")
+            parts.append(payload)
+            if fin:
+                return opcode, b''.join(parts)
+    
+    async def send_text(self, text: str) -> None:
+        """Send a text message, waiting while the peer is slow to read."""
+        self.writer.write(encode_frame(OP_TEXT, text.encode('utf-8'), mask=self.client))
+        await self.writer.drain()
+    
+    async def send_binary(self, data: bytes) -> None:
+        """Send a binary message, waiting while the peer is slow to read."""
+        self.writer.write(encode_frame(OP_BINARY, data, mask=self.client))
+        await self.writer.drain()
+    
+    async def close(self, code: int = CLOSE_NORMAL, reason: str = '') -> None:
+        """Send a close frame once; the caller closes the transport afterwards."""
+        if self._close_sent:
+            return
+        self._close_sent = True
+        payload = struct.pack('!H', code) + reason.encode('utf-8')[:123]
+        self.writer.write(encode_frame(OP_CLOSE, payload, mask=self.client))
+        await self.writer.drain()